@@ -0,0 +1,291 @@
+import numpy as np
+
+from typing import Callable
+from heuristic import ChaseFleeHeuristic, Decision
+from flow_field import FlowField
+from world import World
+from numpy.typing import NDArray
+
+
+class AgentPool:
+
+    """
+    Struct-of-arrays storage for every actor in the world.
+
+    Positions, labels, decisions and heuristic values live in parallel
+    NumPy arrays indexed by actor ID, so a simulation tick updates every
+    agent with a handful of vectorised operations.
+    """
+
+    def __init__(self, world: World, capacity: int = 16) -> None:
+
+        self._world: World = world
+        self._heuristic: ChaseFleeHeuristic = ChaseFleeHeuristic(world)
+        self._flow_field: FlowField | None = None
+        self._count: int = 0
+        self._version: int = 0
+        self._move_listeners: list[Callable[[int, int, int], None]] = []
+
+        self._positions: NDArray[np.int32] = np.zeros((capacity, 2), dtype=np.int32)
+        self._labels: NDArray[np.object_] = np.empty(capacity, dtype=object)
+        self._is_agent: NDArray[np.bool_] = np.zeros(capacity, dtype=bool)
+        self._decisions: NDArray[np.int8] = np.full(capacity, Decision.CHASE.value, dtype=np.int8)
+        self._h_values: NDArray[np.float64] = np.zeros(capacity, dtype=np.float64)
+
+    def __len__(self) -> int:
+
+        return self._count
+
+    @property
+    def version(self) -> int:
+
+        """
+        A counter that changes whenever actors are added or moved in bulk.
+
+        Single moves through ``set_position`` leave it untouched and are
+        reported to the move listeners instead, so indexes over the pool
+        can update one entry rather than rebuild.
+        """
+
+        return self._version
+
+    @property
+    def positions(self) -> NDArray[np.int32]:
+
+        """
+        The ``(n, 2)`` row and column of every actor.
+        """
+
+        return self._positions[:self._count]
+
+    def add_move_listener(self, listener: Callable[[int, int, int], None]) -> None:
+
+        """
+        Registers a callback for single-actor moves.
+
+        Parameters
+        ----------
+        listener : Callable[[int, int, int], None]
+            Called with the actor's ID and its new row and column after
+            every ``set_position`` that changes its cell.
+        """
+
+        self._move_listeners.append(listener)
+
+    @property
+    def labels(self) -> NDArray[np.object_]:
+
+        """
+        The label of every actor.
+        """
+
+        return self._labels[:self._count]
+
+    @property
+    def is_agent(self) -> NDArray[np.bool_]:
+
+        """
+        Whether each actor is an agent driven by the heuristic.
+        """
+
+        return self._is_agent[:self._count]
+
+    @property
+    def decisions(self) -> NDArray[np.int8]:
+
+        """
+        The latest ``Decision`` value of every actor.
+        """
+
+        return self._decisions[:self._count]
+
+    @property
+    def h_values(self) -> NDArray[np.float64]:
+
+        """
+        The latest heuristic value of every actor.
+        """
+
+        return self._h_values[:self._count]
+
+    def _reserve(self, count: int) -> None:
+
+        """
+        Grows the arrays so they can hold at least ``count`` actors.
+
+        Parameters
+        ----------
+        count : int
+            The number of actors to make room for.
+        """
+
+        capacity: int = len(self._positions)
+        if count <= capacity:
+            return
+
+        # Doubles the capacity to keep repeated additions amortised O(1).
+        while capacity < count:
+            capacity *= 2
+
+        def grow(array: NDArray, fill) -> NDArray:
+            grown = np.full((capacity, *array.shape[1:]), fill, dtype=array.dtype)
+            grown[:self._count] = array[:self._count]
+            return grown
+
+        self._positions = grow(self._positions, 0)
+        self._labels = grow(self._labels, None)
+        self._is_agent = grow(self._is_agent, False)
+        self._decisions = grow(self._decisions, Decision.CHASE.value)
+        self._h_values = grow(self._h_values, 0.0)
+
+    def add(self, row: int, col: int, label: str, is_agent: bool = True) -> int:
+
+        """
+        Adds an actor to the pool.
+
+        Parameters
+        ----------
+        row : int
+            The row of the actor's cell.
+        col : int
+            The column of the actor's cell.
+        label : str
+            The actor's label.
+        is_agent : bool, optional
+            Whether the actor is driven by the heuristic.
+
+        Returns
+        -------
+        int
+            The ID of the new actor.
+        """
+
+        self._reserve(self._count + 1)
+
+        index: int = self._count
+        self._positions[index] = (row, col)
+        self._labels[index] = label
+        self._is_agent[index] = is_agent
+        self._count += 1
+        self._version += 1
+
+        return index
+
+    def set_position(self, index: int, row: int, col: int) -> None:
+
+        """
+        Moves a single actor.
+
+        Parameters
+        ----------
+        index : int
+            The ID of the actor.
+        row : int
+            The row of the actor's new cell.
+        col : int
+            The column of the actor's new cell.
+        """
+
+        if self._positions[index, 0] == row and self._positions[index, 1] == col:
+            return
+
+        self._positions[index] = (row, col)
+
+        for listener in self._move_listeners:
+            listener(index, row, col)
+
+    def set_positions(self, positions: NDArray[np.int_]) -> None:
+
+        """
+        Moves every actor at once.
+
+        Parameters
+        ----------
+        positions : NDArray[np.int_]
+            The ``(n, 2)`` new row and column of every actor.
+        """
+
+        self._positions[:self._count] = positions
+        self._version += 1
+
+    def spawn(self, count: int, label: str, rng: np.random.Generator) -> NDArray[np.int_]:
+
+        """
+        Adds agents on random free cells.
+
+        Parameters
+        ----------
+        count : int
+            The number of agents to add.
+        label : str
+            The label of every new agent.
+        rng : np.random.Generator
+            The random number generator to place agents with.
+
+        Returns
+        -------
+        NDArray[np.int_]
+            The IDs of the new agents.
+        """
+
+        if count <= 0:
+            return np.empty(0, dtype=np.int_)
+
+        # Rejection-samples cells until enough of them are free.
+        cells: list[NDArray[np.int_]] = []
+        found: int = 0
+
+        while found < count:
+            candidates = rng.integers((0, 0), (self._world.rows, self._world.cols), size=(count, 2))
+            free = candidates[self._world.are_free(candidates)]
+            cells.append(free)
+            found += len(free)
+
+        positions: NDArray[np.int_] = np.concatenate(cells)[:count]
+
+        start: int = self._count
+        self._reserve(start + count)
+        self._positions[start:start + count] = positions
+        self._labels[start:start + count] = label
+        self._is_agent[start:start + count] = True
+        self._count += count
+        self._version += 1
+
+        return np.arange(start, start + count)
+
+    def step(self, player: int, powerup_timer: float) -> None:
+
+        """
+        Advances every agent by one tick: decides whether to chase or flee
+        the player and moves one cell along the matching flow field.
+
+        Parameters
+        ----------
+        player : int
+            The ID of the player actor.
+        powerup_timer : float
+            The time remaining on the player's powerup.
+        """
+
+        agents: NDArray[np.int_] = np.flatnonzero(self.is_agent)
+        if len(agents) == 0:
+            return
+
+        player_position: NDArray[np.int32] = self._positions[player]
+        positions: NDArray[np.int32] = self._positions[agents]
+
+        # Decides for every agent at once; the power-up distance is shared.
+        player_dists: NDArray[np.int_] = np.abs(positions - player_position).sum(axis=1)
+        powerup_dist: int = self._world.get_distance_to_nearest_powerup(player_position)
+        decisions, values = self._heuristic.decide_many(player_dists, powerup_dist, powerup_timer)
+
+        self._decisions[agents] = decisions
+        self._h_values[agents] = values
+
+        # Rebuilds the shared flow fields only when the player has moved.
+        target: tuple[int, int] = (int(player_position[0]), int(player_position[1]))
+        if self._flow_field is None or self._flow_field.target != target:
+            self._flow_field = FlowField(self._world, target)
+
+        self._positions[agents] = self._flow_field.step(positions, decisions == Decision.CHASE.value)
+        self._version += 1
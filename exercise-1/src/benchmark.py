@@ -0,0 +1,49 @@
+import time
+import numpy as np
+
+from agents import AgentPool
+from world import World
+
+
+def benchmark_agents(counts: list[int], ticks: int = 50) -> None:
+
+    """
+    Measures the cost of a simulation tick as the number of agents grows.
+
+    Parameters
+    ----------
+    counts : list[int]
+        The agent counts to measure.
+    ticks : int, optional
+        The number of ticks to average over.
+    """
+
+    world: World = World()
+
+    print(f"{'Agents':>10} {'ms/tick':>10} {'agents/s':>14}")
+
+    for count in counts:
+
+        pool: AgentPool = AgentPool(world)
+        player: int = pool.add(0, 0, "PLY", is_agent=False)
+        pool.spawn(count, "AGT", np.random.default_rng(0))
+
+        start: float = time.perf_counter()
+        for _ in range(ticks):
+            pool.step(player, 5.0)
+        elapsed: float = (time.perf_counter() - start) / ticks
+
+        print(f"{count:>10} {elapsed * 1000:>10.3f} {count / elapsed:>14,.0f}")
+
+
+def main():
+
+    """
+    Entry point for the benchmarks.
+    """
+
+    benchmark_agents([100, 1_000, 10_000, 100_000])
+
+
+if __name__ == "__main__":
+    main()
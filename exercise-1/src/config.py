@@ -1,31 +1,13 @@
 import numpy as np
 
 from numpy.typing import NDArray
-from pygame import Vector2, Color
-
-
-# Display settings.
-CELL_SIZE: int      = 60
-GRID_SIZE: int      = 8
-SCREEN_WIDTH: int   = GRID_SIZE * CELL_SIZE + 300
-SCREEN_HEIGHT: int  = GRID_SIZE * CELL_SIZE
-FPS: int            = 10
-
-# Colours.
-COLOUR_EMPTY: Color        = Color(240, 240, 240)
-COLOUR_WALL: Color         = Color(40, 40, 40)
-COLOUR_POWERUP: Color      = Color(255, 215, 0)
-COLOUR_PLAYER: Color       = Color(0, 120, 255)
-COLOUR_AGENT: Color  = Color(255, 60, 60)
-COLOUR_GRID: Color         = Color(180, 180, 180)
-COLOUR_TEXT: Color         = Color(40, 40, 40)
-COLOUR_UI_BG: Color        = Color(250, 250, 250)
+
 
 # Game parameters.
 MAX_POWERUP_TIME: float    = 10
-MAX_MANHATTAN: int         = 14
 
-# World config.
+# World config. Set WORLD_MAP_PATH to a .npy file to load a map from disk.
+WORLD_MAP_PATH: str | None = None
 WORLD_MAP: NDArray[np.int_] = np.array([
     [0, 0, 0, 0, 0, 2, 0, 0],
     [0, 1, 1, 0, 0, 1, 1, 0],
@@ -37,10 +19,28 @@ WORLD_MAP: NDArray[np.int_] = np.array([
     [0, 2, 0, 0, 0, 0, 0, 0],
 ])
 
-START_PLAYER: Vector2  = Vector2(0, 0)
-START_AGENT: Vector2   = Vector2(7, 7)
+START_PLAYER: tuple[int, int]  = (0, 0)
+START_AGENT: tuple[int, int]   = (7, 7)
+
+# Agent config. Agents beyond the first spawn on random free cells.
+AGENT_COUNT: int        = 1
+AGENT_SEED: int         = 0
+STEP_INTERVAL: int      = 250
+
+# Session recording. Set RECORDING_PATH to log every heuristic evaluation.
+RECORDING_PATH: str | None  = None
+
+# Heuristic tracing. Traces are dumped to TRACE_PATH (.csv or .json) on exit.
+TRACE_HEURISTIC: bool       = False
+TRACE_CAPACITY: int         = 4096
+TRACE_PATH: str             = "heuristic_trace.csv"
+
+# Frame profiling. Set PROFILE_PATH to also write a per-frame CSV trace.
+PROFILE_FRAMES: bool        = False
+PROFILE_PATH: str | None    = None
 
 # Heuristic weights.
 WEIGHT_TIME: float          = 0.55
 WEIGHT_POWERUP_DIST: float  = 0.40
-WEIGHT_PLAYER_DIST: float   = 0.05
\ No newline at end of file
+WEIGHT_PLAYER_DIST: float   = 0.05
+HEURISTIC_BIAS: float       = -0.05
\ No newline at end of file
@@ -1,22 +1,24 @@
-import config
+import render_config
 import pygame.draw
 
-from pygame import Vector2, Color, Surface
+from pygame import Vector2, Color, Surface, Rect
+from agents import AgentPool
 from world import World
-from utilities import Utilities
+from render_utilities import RenderUtilities
 
 
 class Entity:
 
     """
-    Represents a game-world entity, such as the player or the agent.
+    Rendering and picking view over a single actor in an ``AgentPool``,
+    such as the player or an agent. The actor's state lives in the pool.
     """
 
-    def __init__(self, position: Vector2, colour: Color, label: str, world: World) -> None:
+    def __init__(self, pool: AgentPool, index: int, colour: Color, world: World) -> None:
 
-        self.position: Vector2 = position
+        self._pool: AgentPool = pool
+        self._index: int = index
 
-        self._label: str = label
         self._radius: int = 25
         self._colour: Color = colour
         self._world: World = world
@@ -24,6 +26,30 @@ class Entity:
         self.is_dragging: bool = False
         self.is_hover: bool = False
 
+    @property
+    def index(self) -> int:
+
+        """
+        The actor's ID in the pool.
+        """
+
+        return self._index
+
+    @property
+    def position(self) -> Vector2:
+
+        """
+        The actor's grid position as ``(row, col)``.
+        """
+
+        row, col = self._pool.positions[self._index].tolist()
+        return Vector2(row, col)
+
+    @position.setter
+    def position(self, position: Vector2) -> None:
+
+        self._pool.set_position(self._index, int(position[0]), int(position[1]))
+
     def contains_point(self, point: Vector2) -> bool:
 
         """
@@ -60,11 +86,32 @@ class Entity:
         """
 
         # Converts units to pixels and adds an offset to be at the centre of the cell.
-        x: int = int(self.position.y) * config.CELL_SIZE + config.CELL_SIZE // 2
-        y: int = int(self.position.x) * config.CELL_SIZE + config.CELL_SIZE // 2
+        x: int = int(self.position.y) * render_config.CELL_SIZE + render_config.CELL_SIZE // 2
+        y: int = int(self.position.x) * render_config.CELL_SIZE + render_config.CELL_SIZE // 2
 
         return Vector2(x, y)
 
+    def get_rect(self) -> Rect:
+
+        """
+        Gets the screen area covered by the entity, including its label
+        outline.
+
+        Returns
+        -------
+        Rect
+            The entity's bounding rectangle on the screen.
+        """
+
+        screen_pos: Vector2 = self._get_screen_position()
+
+        # Pads the circle's bounds to also cover the label's outline.
+        size: int = self._radius * 2 + 4
+        rect: Rect = Rect(0, 0, size, size)
+        rect.center = (int(screen_pos.x), int(screen_pos.y))
+
+        return rect
+
     def set_position_from_screen(self, screen_pos: Vector2) -> None:
 
         """
@@ -78,13 +125,13 @@ class Entity:
         """
 
         # Clamps to grid bounds.
-        row: int = max(0, min(config.GRID_SIZE - 1, int(screen_pos.y // config.CELL_SIZE)))
-        col: int = max(0, min(config.GRID_SIZE - 1, int(screen_pos.x // config.CELL_SIZE)))
+        row: int = max(0, min(self._world.rows - 1, int(screen_pos.y // render_config.CELL_SIZE)))
+        col: int = max(0, min(self._world.cols - 1, int(screen_pos.x // render_config.CELL_SIZE)))
 
         new_pos: Vector2 = Vector2(row, col)
 
-        # Only moves if the cell is free.
-        if self._world.is_free(new_pos):
+        # Only moves if the cell has changed and is free.
+        if new_pos != self.position and self._world.is_free(new_pos):
             self.position = new_pos
 
     def draw(self, surface: Surface) -> None:
@@ -99,5 +146,5 @@ class Entity:
         pygame.draw.circle(surface, self._colour, screen_pos, self._radius)
 
         # Draws the label.
-        Utilities.draw_outlined_text(surface, self._label, screen_pos)
+        RenderUtilities.draw_outlined_text(surface, self._pool.labels[self._index], screen_pos)
 
@@ -0,0 +1,187 @@
+import numpy as np
+
+from utilities import Direction
+from world import World
+from numpy.typing import NDArray
+
+
+class FlowField:
+
+    """
+    Chase and flee flow fields around a target cell, shared by every agent.
+
+    Both fields are computed once per target position and stored as the
+    index of the best move for every cell, so moving an agent is a single
+    table lookup regardless of how many agents there are.
+    """
+
+    # Candidate moves: staying put, then every direction.
+    MOVES: NDArray[np.int_] = np.array([(0, 0)] + [direction.value for direction in Direction])
+
+    # How strongly fleeing agents prefer escape routes over dead ends.
+    _FLEE_FACTOR: float = 1.2
+
+    def __init__(self, world: World, target: tuple[int, int]) -> None:
+
+        self.target: tuple[int, int] = target
+
+        self._world: World = world
+        self._free: NDArray[np.bool_] = np.asarray(world.grid) != 1
+
+        distances: NDArray[np.float32] = self._get_distances()
+        self._chase_moves: NDArray[np.int8] = self._get_moves(distances)
+        self._flee_moves: NDArray[np.int8] = self._get_moves(self._get_flee_field(distances))
+
+    def _get_distances(self) -> NDArray[np.float32]:
+
+        """
+        Calculates the walking distance from every cell to the target with
+        a breadth-first search that expands a whole wavefront at a time.
+
+        Returns
+        -------
+        NDArray[np.float32]
+            The distance to the target, ``inf`` for unreachable cells.
+        """
+
+        distances: NDArray[np.float32] = np.full(self._free.shape, np.inf, dtype=np.float32)
+
+        if not self._world.is_free(self.target):
+            return distances
+
+        distances[self.target] = 0
+        frontier: NDArray[np.int_] = np.array([self.target])
+        distance: int = 0
+
+        while len(frontier):
+
+            distance += 1
+
+            # Expands every cell in the wavefront in every direction.
+            neighbours: NDArray[np.int_] = (frontier[:, None, :] + self.MOVES[None, 1:, :]).reshape(-1, 2)
+            neighbours = neighbours[self._world.are_free(neighbours)]
+            neighbours = neighbours[np.isinf(distances[neighbours[:, 0], neighbours[:, 1]])]
+
+            # Drops cells reached from more than one side of the wavefront.
+            flat: NDArray[np.int_] = np.unique(neighbours[:, 0] * self._free.shape[1] + neighbours[:, 1])
+            frontier = np.stack(np.divmod(flat, self._free.shape[1]), axis=1)
+
+            distances[frontier[:, 0], frontier[:, 1]] = distance
+
+        return distances
+
+    def _shifted(self, field: NDArray[np.float32], move: NDArray[np.int_]) -> NDArray[np.float32]:
+
+        """
+        Gets, for every cell, the field value of the cell a move leads to.
+
+        Parameters
+        ----------
+        field : NDArray[np.float32]
+            The field to shift.
+        move : NDArray[np.int_]
+            The row and column offset of the move.
+
+        Returns
+        -------
+        NDArray[np.float32]
+            The shifted field, ``inf`` wherever the move leaves the world.
+        """
+
+        rows, cols = field.shape
+        dr, dc = int(move[0]), int(move[1])
+        padded: NDArray[np.float32] = np.pad(field, 1, constant_values=np.inf)
+
+        return padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+
+    def _get_flee_field(self, distances: NDArray[np.float32]) -> NDArray[np.float32]:
+
+        """
+        Builds the flee field by negating and scaling the chase distances,
+        then relaxing it so cells near open space are preferred over dead
+        ends that merely look far away.
+
+        Parameters
+        ----------
+        distances : NDArray[np.float32]
+            The distance from every cell to the target.
+
+        Returns
+        -------
+        NDArray[np.float32]
+            The flee field, lower values being safer.
+        """
+
+        field: NDArray[np.float32] = np.where(
+            np.isfinite(distances), -self._FLEE_FACTOR * distances, np.inf
+        ).astype(np.float32)
+
+        # Relaxes until stable; walls stay at infinity.
+        while True:
+
+            lowest: NDArray[np.float32] = field
+            for move in self.MOVES[1:]:
+                lowest = np.minimum(lowest, self._shifted(field, move) + 1)
+
+            relaxed: NDArray[np.float32] = np.where(self._free, lowest, np.inf)
+            if np.array_equal(relaxed, field):
+                return field
+
+            field = relaxed
+
+    def _get_moves(self, field: NDArray[np.float32]) -> NDArray[np.int8]:
+
+        """
+        Finds, for every cell, the move that leads downhill on a field.
+
+        Parameters
+        ----------
+        field : NDArray[np.float32]
+            The field to descend.
+
+        Returns
+        -------
+        NDArray[np.int8]
+            The index into ``MOVES`` of the best move from every cell.
+            Staying put wins ties, so agents never move needlessly.
+        """
+
+        best: NDArray[np.float32] = field.copy()
+        moves: NDArray[np.int8] = np.zeros(field.shape, dtype=np.int8)
+
+        for index, move in enumerate(self.MOVES[1:], start=1):
+
+            shifted: NDArray[np.float32] = self._shifted(field, move)
+            better: NDArray[np.bool_] = shifted < best
+
+            best[better] = shifted[better]
+            moves[better] = index
+
+        return moves
+
+    def step(self, positions: NDArray[np.int_], chase: NDArray[np.bool_]) -> NDArray[np.int_]:
+
+        """
+        Moves agents one cell along the chase or flee field.
+
+        Parameters
+        ----------
+        positions : NDArray[np.int_]
+            The ``(n, 2)`` row and column of every agent.
+        chase : NDArray[np.bool_]
+            Whether each agent is chasing (``True``) or fleeing (``False``).
+
+        Returns
+        -------
+        NDArray[np.int_]
+            The new position of every agent.
+        """
+
+        rows: NDArray[np.int_] = positions[:, 0]
+        cols: NDArray[np.int_] = positions[:, 1]
+
+        moves: NDArray[np.int8] = np.where(
+            chase, self._chase_moves[rows, cols], self._flee_moves[rows, cols]
+        )
+
+        return positions + self.MOVES[moves]
@@ -1,9 +1,12 @@
+import time
 import config
+import numpy as np
 
 from enum import Enum
+from tracing import HeuristicTracer
 from utilities import Utilities
 from world import World
-from pygame import Vector2
+from numpy.typing import NDArray
 
 
 class Features:
@@ -16,12 +19,14 @@ class Features:
         self,
         player_dist: int,
         powerup_time: float,
-        powerup_dist: int
+        powerup_dist: int,
+        max_manhattan: int
     ):
 
         self.player_dist = player_dist
         self.powerup_time = powerup_time
         self.powerup_dist = powerup_dist
+        self._max_manhattan = max_manhattan
 
         self._normalise()
 
@@ -31,9 +36,9 @@ class Features:
         Normalises the features to a range of [0, 1].
         """
 
-        self.player_dist = self.player_dist / config.MAX_MANHATTAN
+        self.player_dist = self.player_dist / self._max_manhattan
         self.powerup_time = min(self.powerup_time, config.MAX_POWERUP_TIME) / config.MAX_POWERUP_TIME
-        self.powerup_dist = self.powerup_dist / config.MAX_MANHATTAN
+        self.powerup_dist = self.powerup_dist / self._max_manhattan
 
 
 class Decision(Enum):
@@ -49,70 +54,76 @@ class ChaseFleeHeuristic:
     or flee from them.
     """
 
-    def __init__(self, world: World):
+    def __init__(self, world: World, tracer: HeuristicTracer | None = None):
 
         self._world = world
+        self._tracer = tracer if tracer is not None else HeuristicTracer()
 
-    def _calculate(
+    def _get_features(
             self,
-            position: Vector2,
-            player_position: Vector2,
+            position: tuple[int, int],
+            player_position: tuple[int, int],
             powerup_timer: float
-    ) -> float:
+    ) -> Features:
 
         """
-        Calculates the heuristic value.
+        Extracts and normalises the features.
 
         Parameters
         ----------
-        position : Vector2
+        position : tuple[int, int]
             The position of the agent.
-        player_position : Vector2
+        player_position : tuple[int, int]
             The position of the player.
         powerup_timer : float
             The time remaining on the player's powerup.
 
         Returns
         -------
-        float
-            The heuristic value.
+        Features
+            The normalised features.
         """
 
         # Extracts raw features.
         player_dist: int = Utilities.manhattan_distance(position, player_position)
         powerup_dist: int = self._world.get_distance_to_nearest_powerup(player_position)
 
-        print(player_dist, powerup_dist)
-
         # Normalises the features.
-        features: Features = Features(
+        return Features(
             player_dist,
             powerup_timer,
-            powerup_dist
+            powerup_dist,
+            self._world.max_manhattan
         )
 
+    @staticmethod
+    def _calculate(features: Features) -> float:
 
+        """
+        Calculates the heuristic value.
 
+        Parameters
+        ----------
+        features : Features
+            The normalised features.
 
-        bias: float = -0.05
-        print(f"({config.WEIGHT_POWERUP_DIST} * {features.powerup_dist:.2f}) + ({config.WEIGHT_PLAYER_DIST} * {features.player_dist:.2f}) -({config.WEIGHT_TIME} * {features.powerup_time:.2f}) + {bias}")
+        Returns
+        -------
+        float
+            The heuristic value.
+        """
 
-        # Calculates the heuristic.
-        value: float = (
+        return (
             + config.WEIGHT_POWERUP_DIST * features.powerup_dist
             + config.WEIGHT_PLAYER_DIST * features.player_dist
             - config.WEIGHT_TIME * features.powerup_time
-            + bias
+            + config.HEURISTIC_BIAS
         )
 
-        print(value)
-
-        return value
-
     def decide(
         self,
-        position: Vector2,
-        player_position: Vector2,
+        position: tuple[int, int],
+        player_position: tuple[int, int],
         powerup_timer: float
     ) -> tuple[Decision, float]:
 
@@ -121,9 +132,9 @@ class ChaseFleeHeuristic:
 
         Parameters
         ----------
-        position : Vector2
+        position : tuple[int, int]
             The position of the agent.
-        player_position : Vector2
+        player_position : tuple[int, int]
             The position of the player.
         powerup_timer : float
             The time remaining on the player's powerup.
@@ -135,9 +146,90 @@ class ChaseFleeHeuristic:
 
         """
 
-        value: float = self._calculate(position, player_position, powerup_timer)
+        # Only reads the clock when tracing is enabled.
+        tracing: bool = self._tracer.enabled
+        start: int = time.perf_counter_ns() if tracing else 0
+
+        features: Features = self._get_features(position, player_position, powerup_timer)
+        value: float = self._calculate(features)
+        decision: Decision = Decision.CHASE if value > 0.0 else Decision.FLEE
+
+        if tracing:
+            self._tracer.record(
+                features.player_dist, features.powerup_time, features.powerup_dist,
+                value, decision.name, time.perf_counter_ns() - start
+            )
+
+        return decision, value
+
+    def evaluate_many(
+        self,
+        player_dists: NDArray[np.int_],
+        powerup_dist: int | NDArray[np.int_],
+        powerup_timer: float | NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+
+        """
+        Calculates the heuristic value for many agents chasing the same player.
+
+        Parameters
+        ----------
+        player_dists : NDArray[np.int_]
+            The distance from each agent to the player.
+        powerup_dist : int | NDArray[np.int_]
+            The distance from the player to the nearest power-up, shared or
+            one per agent.
+        powerup_timer : float | NDArray[np.float64]
+            The time remaining on the player's powerup, shared or one per
+            agent.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            The heuristic value of each agent.
+        """
+
+        max_manhattan: int = self._world.max_manhattan
+
+        # Features shared by every agent collapse to a single constant.
+        shared: float | NDArray[np.float64] = (
+            + config.WEIGHT_POWERUP_DIST * (powerup_dist / max_manhattan)
+            - config.WEIGHT_TIME * (np.minimum(powerup_timer, config.MAX_POWERUP_TIME) / config.MAX_POWERUP_TIME)
+            + config.HEURISTIC_BIAS
+        )
+
+        return config.WEIGHT_PLAYER_DIST * (player_dists / max_manhattan) + shared
+
+    def decide_many(
+        self,
+        player_dists: NDArray[np.int_],
+        powerup_dist: int | NDArray[np.int_],
+        powerup_timer: float | NDArray[np.float64]
+    ) -> tuple[NDArray[np.int8], NDArray[np.float64]]:
+
+        """
+        Makes a decision for many agents chasing the same player.
+
+        Parameters
+        ----------
+        player_dists : NDArray[np.int_]
+            The distance from each agent to the player.
+        powerup_dist : int | NDArray[np.int_]
+            The distance from the player to the nearest power-up, shared or
+            one per agent.
+        powerup_timer : float | NDArray[np.float64]
+            The time remaining on the player's powerup, shared or one per
+            agent.
+
+        Returns
+        -------
+        tuple[NDArray[np.int8], NDArray[np.float64]]
+            The ``Decision`` value of each agent and its heuristic value.
+        """
+
+        values: NDArray[np.float64] = self.evaluate_many(player_dists, powerup_dist, powerup_timer)
+        decisions: NDArray[np.int8] = np.where(
+            values > 0.0, Decision.CHASE.value, Decision.FLEE.value
+        ).astype(np.int8)
 
-        if value > 0.0:
-            return Decision.CHASE, value
-        else:
-            return Decision.FLEE, value
+        return decisions, values
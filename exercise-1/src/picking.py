@@ -0,0 +1,125 @@
+import numpy as np
+
+from bisect import insort
+from agents import AgentPool
+from numpy.typing import NDArray
+
+
+class PickingIndex:
+
+    """
+    Uniform spatial hash from grid cells to the actors standing in them.
+
+    The hash is stored as a bucket-sorted array of actor IDs with per-bucket
+    offsets, so looking up a cell costs O(1) regardless of how many actors
+    there are. It is rebuilt lazily, in vectorised form, whenever the pool
+    reports a bulk change. Single moves, such as a drag, are kept in a small
+    overlay that is folded back in on the next rebuild.
+    """
+
+    # Multiplicative hashing constant (Knuth), spreads nearby cells over the table.
+    _HASH: int = 0x9E3779B1
+
+    def __init__(self, pool: AgentPool, cols: int) -> None:
+
+        self._pool: AgentPool = pool
+        self._cols: int = cols
+        self._version: int = -1
+
+        self._keys: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+        self._order: NDArray[np.int_] = np.empty(0, dtype=np.int_)
+        self._starts: NDArray[np.int_] = np.zeros(2, dtype=np.int_)
+        self._mask: int = 0
+
+        # Actors moved since the last rebuild: their current cell, and the
+        # actors that arrived in each cell.
+        self._moved: dict[int, int] = {}
+        self._arrivals: dict[int, list[int]] = {}
+
+        pool.add_move_listener(self._on_move)
+
+    def _rebuild(self) -> None:
+
+        """
+        Rebuilds the hash from the pool's current positions.
+        """
+
+        positions: NDArray[np.int32] = self._pool.positions
+
+        # Keeps the table at least twice as large as the number of actors.
+        size: int = 1 << max(4, (2 * len(positions)).bit_length())
+
+        keys: NDArray[np.int64] = positions[:, 0].astype(np.int64) * self._cols + positions[:, 1]
+        buckets: NDArray[np.int64] = (keys * self._HASH) & (size - 1)
+
+        # A stable sort keeps lower IDs first within a bucket.
+        self._order = np.argsort(buckets, kind="stable")
+        self._starts = np.concatenate(([0], np.cumsum(np.bincount(buckets, minlength=size))))
+        self._keys = keys
+        self._mask = size - 1
+        self._version = self._pool.version
+
+        self._moved.clear()
+        self._arrivals.clear()
+
+    def _on_move(self, index: int, row: int, col: int) -> None:
+
+        """
+        Moves a single actor between cells without rebuilding the hash.
+
+        Parameters
+        ----------
+        index : int
+            The ID of the actor.
+        row : int
+            The row of the actor's new cell.
+        col : int
+            The column of the actor's new cell.
+        """
+
+        # A stale index is rebuilt from the pool on the next query anyway.
+        if self._version != self._pool.version or index >= len(self._keys):
+            return
+
+        old_key: int | None = self._moved.pop(index, None)
+        if old_key is not None:
+            self._arrivals[old_key].remove(index)
+
+        key: int = row * self._cols + col
+
+        # Back in its hashed cell, the actor needs no overlay entry.
+        if key != self._keys[index]:
+            self._moved[index] = key
+            insort(self._arrivals.setdefault(key, []), index)
+
+    def query(self, row: int, col: int) -> list[int]:
+
+        """
+        Gets the actors standing in a cell.
+
+        Parameters
+        ----------
+        row : int
+            The row of the cell.
+        col : int
+            The column of the cell.
+
+        Returns
+        -------
+        list[int]
+            The IDs of the actors in the cell, lowest first.
+        """
+
+        if self._version != self._pool.version:
+            self._rebuild()
+
+        key: int = row * self._cols + col
+        bucket: int = (key * self._HASH) & self._mask
+
+        candidates: NDArray[np.int_] = self._order[self._starts[bucket]:self._starts[bucket + 1]]
+        found: list[int] = [
+            int(index) for index in candidates if self._keys[index] == key and index not in self._moved
+        ]
+
+        arrivals: list[int] | None = self._arrivals.get(key)
+        return sorted(found + arrivals) if arrivals else found
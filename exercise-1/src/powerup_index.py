@@ -0,0 +1,119 @@
+import numpy as np
+
+from itertools import count
+from numpy.typing import NDArray
+
+
+class PowerupIndex:
+
+    """
+    Uniform grid-bucket spatial index for nearest power-up queries.
+
+    Power-ups are grouped into square buckets of ``bucket_size`` cells.
+    A query searches rings of buckets outwards from the query position and
+    stops as soon as no bucket in the next ring can hold a closer power-up,
+    so its cost depends on the local power-up density rather than on the
+    total number of power-ups.
+    """
+
+    def __init__(self, positions: NDArray[np.int_], bucket_size: int = 16) -> None:
+
+        self._bucket_size: int = bucket_size
+        self._buckets: dict[tuple[int, int], NDArray[np.int_]] = {}
+
+        if len(positions) == 0:
+            return
+
+        # Sorts the positions by bucket so each bucket is a contiguous slice.
+        keys: NDArray[np.int_] = positions // bucket_size
+        order: NDArray[np.int_] = np.lexsort((keys[:, 1], keys[:, 0]))
+        positions = positions[order]
+        keys = keys[order]
+
+        # Splits the sorted positions wherever the bucket changes.
+        splits: NDArray[np.int_] = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+        starts: list[int] = [0, *splits.tolist()]
+
+        for start, bucket in zip(starts, np.split(positions, splits)):
+            self._buckets[(int(keys[start, 0]), int(keys[start, 1]))] = bucket
+
+    def _ring(self, bucket_row: int, bucket_col: int, ring: int) -> list[NDArray[np.int_]]:
+
+        """
+        Gets the non-empty buckets at a given Chebyshev distance (in buckets)
+        from a bucket.
+
+        Parameters
+        ----------
+        bucket_row : int
+            The row of the centre bucket.
+        bucket_col : int
+            The column of the centre bucket.
+        ring : int
+            The distance of the ring, in buckets.
+
+        Returns
+        -------
+        list[NDArray[np.int_]]
+            The power-up positions in each non-empty bucket of the ring.
+        """
+
+        if ring == 0:
+            bucket = self._buckets.get((bucket_row, bucket_col))
+            return [] if bucket is None else [bucket]
+
+        buckets: list[NDArray[np.int_]] = []
+
+        for dr in range(-ring, ring + 1):
+
+            # Full rows at the top and bottom of the ring, edges otherwise.
+            cols = range(-ring, ring + 1) if abs(dr) == ring else (-ring, ring)
+
+            for dc in cols:
+                bucket = self._buckets.get((bucket_row + dr, bucket_col + dc))
+                if bucket is not None:
+                    buckets.append(bucket)
+
+        return buckets
+
+    def nearest_distance(self, row: int, col: int) -> int | None:
+
+        """
+        Finds the Manhattan distance from a cell to the nearest power-up.
+
+        Parameters
+        ----------
+        row : int
+            The row of the cell.
+        col : int
+            The column of the cell.
+
+        Returns
+        -------
+        int | None
+            The distance to the nearest power-up, or ``None`` if there are
+            no power-ups.
+        """
+
+        if not self._buckets:
+            return None
+
+        bucket_row: int = row // self._bucket_size
+        bucket_col: int = col // self._bucket_size
+        query: NDArray[np.int_] = np.array([row, col])
+        best: int | None = None
+
+        # Terminates once a power-up is found and the rings move past it.
+        for ring in count():
+
+            # Any cell in this ring is at least this far away.
+            lower_bound: int = max(0, (ring - 1) * self._bucket_size + 1)
+            if best is not None and best <= lower_bound:
+                break
+
+            for bucket in self._ring(bucket_row, bucket_col, ring):
+                distance: int = int(np.abs(bucket - query).sum(axis=1).min())
+                if best is None or distance < best:
+                    best = distance
+
+        return best
@@ -0,0 +1,225 @@
+import csv
+import time
+import numpy as np
+
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
+from types import TracebackType
+from typing import ContextManager, TextIO
+
+
+class _StageTimer:
+
+    """
+    Context manager that adds its elapsed time to a profiler stage, less
+    the time of any stages timed inside it.
+    """
+
+    def __init__(self, profiler: "FrameProfiler", stage: str) -> None:
+
+        self._profiler: FrameProfiler = profiler
+        self._stage: str = stage
+        self._start: int = 0
+
+    def __enter__(self) -> None:
+
+        self._profiler._nested.append(0)
+        self._start = time.perf_counter_ns()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None
+    ) -> None:
+
+        elapsed: int = time.perf_counter_ns() - self._start
+        nested: list[int] = self._profiler._nested
+
+        # Only counts its own time, so the stages add up to the frame.
+        self._profiler.add(self._stage, elapsed - nested.pop())
+
+        if nested:
+            nested[-1] += elapsed
+
+
+class FrameProfiler:
+
+    """
+    Rolling per-stage frame timings for the simulator.
+
+    Stage times are accumulated while a frame is processed and pushed into
+    fixed-size windows when the frame ends, and can optionally be streamed
+    to a CSV trace, one row per frame. A stage timed inside another is only
+    counted in the inner one.
+    """
+
+    def __init__(
+        self,
+        stages: list[str],
+        enabled: bool = False,
+        window: int = 120,
+        csv_path: str | Path | None = None
+    ) -> None:
+
+        self.enabled: bool = enabled
+
+        self._stages: list[str] = stages
+        self._current: dict[str, int] = dict.fromkeys(stages, 0)
+        self._history: dict[str, deque[int]] = {stage: deque(maxlen=window) for stage in stages}
+        self._frame_times: deque[int] = deque(maxlen=window)
+        self._frame_ends: deque[int] = deque(maxlen=window)
+        self._frame_start: int = 0
+        self._frames: int = 0
+        self._null: ContextManager[None] = nullcontext()
+
+        # The time of the stages nested in each open timer, innermost last.
+        self._nested: list[int] = []
+
+        self._file: TextIO | None = None
+        if enabled and csv_path is not None:
+            self._file = open(csv_path, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["frame", "end_ns", "frame_ns", *(f"{stage}_ns" for stage in stages)])
+
+    @property
+    def frames(self) -> int:
+
+        """
+        The number of frames profiled so far.
+        """
+
+        return self._frames
+
+    def begin_frame(self) -> None:
+
+        """
+        Marks the start of the work for a frame.
+        """
+
+        if self.enabled:
+            self._frame_start = time.perf_counter_ns()
+
+    def measure(self, stage: str) -> ContextManager[None]:
+
+        """
+        Times a block of code as part of a stage.
+
+        Parameters
+        ----------
+        stage : str
+            The stage to add the block's time to.
+
+        Returns
+        -------
+        ContextManager[None]
+            A timer, or a shared no-op context if profiling is disabled.
+        """
+
+        return _StageTimer(self, stage) if self.enabled else self._null
+
+    def add(self, stage: str, duration_ns: int) -> None:
+
+        """
+        Adds time to a stage of the current frame.
+
+        Parameters
+        ----------
+        stage : str
+            The stage to add the time to.
+        duration_ns : int
+            The time to add, in nanoseconds.
+        """
+
+        self._current[stage] += duration_ns
+
+    def end_frame(self) -> None:
+
+        """
+        Closes the current frame, pushing its timings into the rolling
+        windows and the CSV trace.
+        """
+
+        if not self.enabled:
+            return
+
+        # Discards work done outside a frame, such as the very first draw.
+        if self._frame_start == 0:
+            self._current = dict.fromkeys(self._stages, 0)
+            return
+
+        end: int = time.perf_counter_ns()
+        frame_ns: int = end - self._frame_start
+
+        self._frame_times.append(frame_ns)
+        self._frame_ends.append(end)
+
+        for stage in self._stages:
+            self._history[stage].append(self._current[stage])
+
+        if self._file is not None:
+            self._writer.writerow([self._frames, end, frame_ns, *(self._current[stage] for stage in self._stages)])
+
+        self._current = dict.fromkeys(self._stages, 0)
+        self._frame_start = 0
+        self._frames += 1
+
+    def stage_averages_ms(self) -> dict[str, float]:
+
+        """
+        Gets the rolling average time of every stage.
+
+        Returns
+        -------
+        dict[str, float]
+            The average time per frame of each stage, in milliseconds.
+        """
+
+        return {
+            stage: (sum(history) / len(history) / 1e6 if history else 0.0)
+            for stage, history in self._history.items()
+        }
+
+    def fps(self) -> float:
+
+        """
+        Gets the rolling frame rate, including any time spent idle.
+
+        Returns
+        -------
+        float
+            The number of frames per second over the window.
+        """
+
+        if len(self._frame_ends) < 2:
+            return 0.0
+
+        span: int = self._frame_ends[-1] - self._frame_ends[0]
+        return (len(self._frame_ends) - 1) * 1e9 / span if span > 0 else 0.0
+
+    def p99_frame_ms(self) -> float:
+
+        """
+        Gets the 99th-percentile frame time over the window.
+
+        Returns
+        -------
+        float
+            The 99th-percentile time spent working on a frame, in milliseconds.
+        """
+
+        if not self._frame_times:
+            return 0.0
+
+        return float(np.percentile(self._frame_times, 99)) / 1e6
+
+    def close(self) -> None:
+
+        """
+        Flushes and closes the CSV trace.
+        """
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,145 @@
+import struct
+import numpy as np
+
+from enum import IntEnum
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO
+from numpy.typing import NDArray
+
+
+class SessionEvent(IntEnum):
+
+    """
+    The input that caused a recorded heuristic evaluation.
+    """
+
+    INITIAL = 0
+    DRAG = 1
+    POWERUP = 2
+    TIMER = 3
+    RESET = 4
+    STEP = 5
+
+
+# File header: magic, format version, world rows and world columns.
+_MAGIC: bytes = b"CFSR"
+_VERSION: int = 1
+_HEADER: struct.Struct = struct.Struct("<4sHii")
+
+# Fixed-width record: event, agent cell, player cell, timer, decision and H value.
+_RECORD: struct.Struct = struct.Struct("<BiiiidBd")
+
+RECORD_DTYPE: np.dtype = np.dtype([
+    ("event", "u1"),
+    ("agent_row", "<i4"),
+    ("agent_col", "<i4"),
+    ("player_row", "<i4"),
+    ("player_col", "<i4"),
+    ("powerup_timer", "<f8"),
+    ("decision", "u1"),
+    ("h_value", "<f8"),
+])
+
+
+class SessionRecorder:
+
+    """
+    Writes a compact binary log of every heuristic evaluation in a session.
+
+    Records are fixed-width and written through a large buffer, so logging
+    costs a single ``struct.pack`` per evaluation.
+    """
+
+    def __init__(self, path: str | Path, rows: int, cols: int, buffer_size: int = 1 << 16) -> None:
+
+        self._file: BinaryIO = open(path, "wb", buffering=buffer_size)
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, rows, cols))
+
+    def record(
+        self,
+        event: SessionEvent,
+        position: tuple[int, int],
+        player_position: tuple[int, int],
+        powerup_timer: float,
+        decision: int,
+        h_value: float
+    ) -> None:
+
+        """
+        Appends a heuristic evaluation to the log.
+
+        Parameters
+        ----------
+        event : SessionEvent
+            The input that caused the evaluation.
+        position : tuple[int, int]
+            The position of the agent.
+        player_position : tuple[int, int]
+            The position of the player.
+        powerup_timer : float
+            The time remaining on the player's powerup.
+        decision : int
+            The ``Decision`` value that was taken.
+        h_value : float
+            The heuristic value.
+        """
+
+        self._file.write(_RECORD.pack(
+            event,
+            int(position[0]), int(position[1]),
+            int(player_position[0]), int(player_position[1]),
+            powerup_timer,
+            decision,
+            h_value,
+        ))
+
+    def close(self) -> None:
+
+        """
+        Flushes the buffer and closes the log.
+        """
+
+        self._file.close()
+
+    def __enter__(self) -> "SessionRecorder":
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None
+    ) -> None:
+
+        self.close()
+
+
+def read_session(path: str | Path) -> tuple[tuple[int, int], NDArray]:
+
+    """
+    Reads a session log.
+
+    Parameters
+    ----------
+    path : str | Path
+        The path to the session log.
+
+    Returns
+    -------
+    tuple[tuple[int, int], NDArray]
+        The world's rows and columns, and a structured array with one
+        ``RECORD_DTYPE`` entry per evaluation.
+    """
+
+    with open(path, "rb") as file:
+
+        magic, version, rows, cols = _HEADER.unpack(file.read(_HEADER.size))
+
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a version {_VERSION} session log.")
+
+        records: NDArray = np.fromfile(file, dtype=RECORD_DTYPE)
+
+    return (rows, cols), records
@@ -0,0 +1,17 @@
+from pygame import Color
+
+
+# Display settings.
+CELL_SIZE: int      = 60
+UI_WIDTH: int       = 300
+FPS: int            = 10
+
+# Colours.
+COLOUR_EMPTY: Color        = Color(240, 240, 240)
+COLOUR_WALL: Color         = Color(40, 40, 40)
+COLOUR_POWERUP: Color      = Color(255, 215, 0)
+COLOUR_PLAYER: Color       = Color(0, 120, 255)
+COLOUR_AGENT: Color  = Color(255, 60, 60)
+COLOUR_GRID: Color         = Color(180, 180, 180)
+COLOUR_TEXT: Color         = Color(40, 40, 40)
+COLOUR_UI_BG: Color        = Color(250, 250, 250)
@@ -0,0 +1,82 @@
+import sys
+import time
+import config
+import numpy as np
+
+from heuristic import ChaseFleeHeuristic
+from recording import read_session
+from world import World
+from numpy.typing import NDArray
+
+
+def replay(path: str, world: World) -> tuple[int, int, float]:
+
+    """
+    Feeds a recorded session back through the heuristic headlessly and
+    checks that every decision matches the recorded one.
+
+    Parameters
+    ----------
+    path : str
+        The path to the session log.
+    world : World
+        The world the session was recorded in.
+
+    Returns
+    -------
+    tuple[int, int, float]
+        The number of records, the number of mismatching decisions and the
+        time spent evaluating, in seconds.
+    """
+
+    shape, records = read_session(path)
+
+    if shape != (world.rows, world.cols):
+        raise ValueError(f"Session was recorded on a {shape} world, not {(world.rows, world.cols)}.")
+
+    heuristic: ChaseFleeHeuristic = ChaseFleeHeuristic(world)
+    start: float = time.perf_counter()
+
+    # Only looks up the power-up distance once per distinct player cell.
+    players: NDArray[np.int_] = np.stack((records["player_row"], records["player_col"]), axis=1)
+    cells, inverse = np.unique(players, axis=0, return_inverse=True)
+    powerup_dists: NDArray[np.int_] = np.array(
+        [world.get_distance_to_nearest_powerup(cell) for cell in cells], dtype=np.int_
+    )[inverse.reshape(-1)]
+
+    # Evaluates every record at once.
+    player_dists: NDArray[np.int_] = (
+        np.abs(records["agent_row"] - records["player_row"])
+        + np.abs(records["agent_col"] - records["player_col"])
+    )
+    decisions, values = heuristic.decide_many(player_dists, powerup_dists, records["powerup_timer"])
+
+    elapsed: float = time.perf_counter() - start
+
+    # Flags records whose decision differs, or whose value drifted.
+    mismatches: NDArray[np.bool_] = (decisions != records["decision"]) | ~np.isclose(values, records["h_value"])
+
+    return len(records), int(mismatches.sum()), elapsed
+
+
+def main() -> None:
+
+    """
+    Entry point for the replay runner.
+    """
+
+    if len(sys.argv) != 2:
+        print("Usage: python src/replay.py <session log>")
+        sys.exit(2)
+
+    count, mismatches, elapsed = replay(sys.argv[1], World(config.WORLD_MAP_PATH))
+    rate: float = count / elapsed if elapsed > 0 else float("inf")
+
+    print(f"Replayed {count} records in {elapsed * 1000:.2f} ms ({rate:,.0f} records/s).")
+    print(f"Mismatching decisions: {mismatches}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,22 @@
 import sys
 import pygame
 import config
+import render_config
+import numpy as np
 
-from pygame import Surface, Vector2
+from pygame import Surface, Vector2, Rect
 from pygame.time import Clock
 from heuristic import Decision, ChaseFleeHeuristic
 from utilities import Utilities
+from render_utilities import RenderUtilities
 from world import World
+from world_renderer import WorldRenderer
 from entity import Entity
+from agents import AgentPool
+from picking import PickingIndex
+from recording import SessionEvent, SessionRecorder
+from tracing import HeuristicTracer
+from profiler import FrameProfiler
 
 
 class Simulator:
@@ -18,47 +27,142 @@ class Simulator:
 
     def __init__(self) -> None:
 
+        # Creates the world.
+        self._world: World = World(config.WORLD_MAP_PATH)
+        self._world_renderer: WorldRenderer = WorldRenderer(self._world)
+        self._grid_width: int = self._world.cols * render_config.CELL_SIZE
+        self._grid_height: int = self._world.rows * render_config.CELL_SIZE
+
         # Initiates the Pygame process.
         pygame.init()
         pygame.display.set_caption("Chase/Flee Heuristic Simulator")
-        self._screen: Surface = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        self._screen: Surface = pygame.display.set_mode((self._grid_width + render_config.UI_WIDTH, self._grid_height))
         self._clock: Clock = Clock()
 
-        # Creates the world.
-        self._world: World = World()
+        # Creates the actor storage.
+        self._pool: AgentPool = AgentPool(self._world)
 
         # Creates the player.
-        self._player: Entity = Entity(config.START_PLAYER, config.COLOUR_PLAYER, "PLY", self._world)
+        player: int = self._pool.add(*config.START_PLAYER, "PLY", is_agent=False)
+        self._player: Entity = Entity(self._pool, player, render_config.COLOUR_PLAYER, self._world)
         self._has_powerup: bool = False
         self._powerup_timer: float = 0
 
-        # Creates the agent.
-        self._agent: Entity = Entity(config.START_AGENT, config.COLOUR_AGENT, "AGT", self._world)
-        self._heuristic: ChaseFleeHeuristic = ChaseFleeHeuristic(self._world)
+        # Creates the agents; the first one is shown in the UI panel.
+        agent: int = self._pool.add(*config.START_AGENT, "AGT")
+        extra: list[int] = self._pool.spawn(config.AGENT_COUNT - 1, "AGT", np.random.default_rng(config.AGENT_SEED)).tolist()
+        self._agents: list[Entity] = [
+            Entity(self._pool, index, render_config.COLOUR_AGENT, self._world) for index in [agent, *extra]
+        ]
+        self._agent: Entity = self._agents[0]
+
+        # Indexes every actor by cell for picking, in pool order.
+        self._entities: list[Entity] = [self._player, *self._agents]
+        self._picking: PickingIndex = PickingIndex(self._pool, self._world.cols)
+        self._start_positions = self._pool.positions.copy()
+        self._is_stepping: bool = False
+        self._step_event: int = pygame.event.custom_type()
+
+        self._tracer: HeuristicTracer = HeuristicTracer(config.TRACE_CAPACITY, config.TRACE_HEURISTIC)
+        self._heuristic: ChaseFleeHeuristic = ChaseFleeHeuristic(self._world, self._tracer)
         self._h_value: float = 0.0
         self._decision: Decision = Decision.CHASE
+        self._heuristic_inputs: tuple | None = None
 
         # UI state.
         self._dragging: bool = False
         self._running: bool = True
         self._dragging_entity: Entity | None = None
+        self._hovered: Entity | None = None
+
+        # Rendering state.
+        self._ui_rect: Rect = Rect(self._grid_width, 0, render_config.UI_WIDTH, self._grid_height)
+        self._entity_rects: dict[Entity, Rect] = {}
+        self._drawn_ui_state: tuple | None = None
+        self._needs_full_redraw: bool = True
+        self._profiler: FrameProfiler = FrameProfiler(
+            ["input", "heuristic", "world", "entities", "ui_text", "display"],
+            config.PROFILE_FRAMES, csv_path=config.PROFILE_PATH
+        )
+
+        # Records every heuristic evaluation if a recording path is set.
+        self._recorder: SessionRecorder | None = None
+        if config.RECORDING_PATH is not None:
+            self._recorder = SessionRecorder(config.RECORDING_PATH, self._world.rows, self._world.cols)
 
         # Calculates the heuristic initially.
-        self._calculate_heuristic()
+        self._calculate_heuristic(SessionEvent.INITIAL)
+
+    def _calculate_heuristic(self, event: SessionEvent) -> None:
 
-    def _calculate_heuristic(self) -> None:
+        """
+        Recalculates the heuristic, skipping the evaluation if none of its
+        inputs (agent cell, player cell, power-up timer) have changed.
 
-        self._decision, self._h_value = self._heuristic.decide(
-            self._agent.position, self._player.position, self._powerup_timer
+        Parameters
+        ----------
+        event : SessionEvent
+            The input that triggered the recalculation, for the session log.
+        """
+
+        inputs: tuple = (
+            int(self._agent.position.x), int(self._agent.position.y),
+            int(self._player.position.x), int(self._player.position.y),
+            self._powerup_timer,
         )
 
+        if inputs == self._heuristic_inputs:
+            return
+
+        self._heuristic_inputs = inputs
+
+        with self._profiler.measure("heuristic"):
+            self._decision, self._h_value = self._heuristic.decide(
+                self._agent.position, self._player.position, self._powerup_timer
+            )
+
+        if self._recorder is not None:
+            self._recorder.record(
+                event, self._agent.position, self._player.position,
+                self._powerup_timer, self._decision.value, self._h_value
+            )
+
     def _handle_input(self) -> None:
 
         """
-        Handles user input.
+        Handles user input. Blocks until at least one event arrives and
+        coalesces all mouse motion in the queue into a single update.
         """
 
-        for event in pygame.event.get():
+        # Sleeps until something happens, then drains the rest of the queue.
+        events: list[pygame.event.Event] = [pygame.event.wait()]
+        events.extend(pygame.event.get())
+
+        # The frame's work starts once the wait is over.
+        self._profiler.begin_frame()
+
+        with self._profiler.measure("input"):
+            self._process_events(events)
+
+    def _process_events(self, events: list[pygame.event.Event]) -> None:
+
+        """
+        Processes a batch of events.
+
+        Parameters
+        ----------
+        events : list[pygame.event.Event]
+            The events to process, in the order they arrived.
+        """
+
+        motion_pos: Vector2 | None = None
+
+        for event in events:
+
+            # Applies pending motion before button events so drags stay in order.
+            if motion_pos is not None and event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                self._handle_motion(motion_pos)
+                motion_pos = None
 
             # Quits the simulator with the X.
             if event.type == pygame.QUIT:
@@ -76,28 +180,39 @@ class Simulator:
 
                     self._has_powerup = not self._has_powerup
                     self._powerup_timer = config.MAX_POWERUP_TIME if self._has_powerup else 0
-                    self._calculate_heuristic()
+                    self._calculate_heuristic(SessionEvent.POWERUP)
 
                 # Increases power-up time.
                 elif event.key == pygame.K_UP and self._has_powerup:
 
                     self._powerup_timer = min(config.MAX_POWERUP_TIME, self._powerup_timer + 0.25)
-                    self._calculate_heuristic()
+                    self._calculate_heuristic(SessionEvent.TIMER)
 
                 # Decreases power-up time.
                 elif event.key == pygame.K_DOWN and self._has_powerup:
 
                     self._powerup_timer = max(0.0, self._powerup_timer - 0.25)
-                    self._calculate_heuristic()
+                    self._calculate_heuristic(SessionEvent.TIMER)
+
+                # Starts or stops stepping the agents.
+                elif event.key == pygame.K_p:
+
+                    self._is_stepping = not self._is_stepping
+                    pygame.time.set_timer(self._step_event, config.STEP_INTERVAL if self._is_stepping else 0)
 
                 # Resets the simulator.
                 elif event.key == pygame.K_r:
 
-                    self._player.position = config.START_PLAYER
-                    self._agent.position = config.START_AGENT
+                    self._pool.set_positions(self._start_positions)
                     self._has_powerup = False
                     self._powerup_timer = config.MAX_POWERUP_TIME
-                    self._calculate_heuristic()
+                    self._calculate_heuristic(SessionEvent.RESET)
+
+            # Moves every agent by one tick.
+            elif event.type == self._step_event:
+
+                self._pool.step(self._player.index, self._powerup_timer)
+                self._calculate_heuristic(SessionEvent.STEP)
 
             # Handles mouse down events.
             elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -105,15 +220,11 @@ class Simulator:
                 # Start drag.
                 if event.button == 1:
 
-                    mouse_pos: Vector2 = Vector2(pygame.mouse.get_pos())
-
-                    if self._player.contains_point(mouse_pos):
-                        self._dragging_entity = self._player
-                        self._player.dragging = True
+                    entity: Entity | None = self._pick(Vector2(event.pos))
 
-                    elif self._agent.contains_point(mouse_pos):
-                        self._dragging_entity = self._agent
-                        self._agent.dragging = True
+                    if entity is not None:
+                        self._dragging_entity = entity
+                        entity.dragging = True
 
             # Handles mouse up events.
             elif event.type == pygame.MOUSEBUTTONUP:
@@ -123,19 +234,71 @@ class Simulator:
                     self._dragging_entity.dragging = False
                     self._dragging_entity = None
 
-            # Handles mouse movement.
+            # Defers mouse movement so only the latest position is handled.
             elif event.type == pygame.MOUSEMOTION:
+                motion_pos = Vector2(event.pos)
+
+        if motion_pos is not None:
+            self._handle_motion(motion_pos)
+
+    def _pick(self, point: Vector2) -> Entity | None:
+
+        """
+        Finds the entity under a point on the screen.
+
+        Parameters
+        ----------
+        point : Vector2
+            The point on the screen.
+
+        Returns
+        -------
+        Entity | None
+            The lowest-ID entity under the point, or ``None`` if there is
+            none.
+        """
+
+        # Only the entities in the cell under the point can contain it.
+        row: int = int(point.y) // render_config.CELL_SIZE
+        col: int = int(point.x) // render_config.CELL_SIZE
+
+        if not (0 <= row < self._world.rows and 0 <= col < self._world.cols):
+            return None
+
+        for index in self._picking.query(row, col):
+            if self._entities[index].contains_point(point):
+                return self._entities[index]
+
+        return None
 
-                mouse_pos: Vector2 = Vector2(pygame.mouse.get_pos())
+    def _handle_motion(self, mouse_pos: Vector2) -> None:
 
-                # Updates hover states.
-                self._player.hover = self._player.contains_point(mouse_pos)
-                self._agent.hover = self._agent.contains_point(mouse_pos)
+        """
+        Handles mouse movement.
+
+        Parameters
+        ----------
+        mouse_pos : Vector2
+            The latest mouse position on the screen.
+        """
+
+        # Updates hover states, touching only the entities that changed.
+        hovered: Entity | None = self._pick(mouse_pos)
+
+        if hovered is not self._hovered:
+
+            if self._hovered is not None:
+                self._hovered.hover = False
+
+            if hovered is not None:
+                hovered.hover = True
 
-                # Handles dragging.
-                if self._dragging_entity:
-                    self._dragging_entity.set_position_from_screen(mouse_pos)
-                    self._calculate_heuristic()
+            self._hovered = hovered
+
+        # Handles dragging, only recalculating when the entity changes cell.
+        if self._dragging_entity:
+            self._dragging_entity.set_position_from_screen(mouse_pos)
+            self._calculate_heuristic(SessionEvent.DRAG)
 
     def draw_ui(self):
 
@@ -143,25 +306,25 @@ class Simulator:
         Draws the UI panel.
         """
 
-        ui_x = config.GRID_SIZE * config.CELL_SIZE + 150
+        ui_x = self._grid_width + 150
         ui_y = 55
 
         # Background.
-        pygame.draw.rect(self._screen, config.COLOUR_UI_BG,
-                         (config.GRID_SIZE * config.CELL_SIZE, 0,
-                          200, config.SCREEN_HEIGHT))
+        pygame.draw.rect(self._screen, render_config.COLOUR_UI_BG,
+                         (self._grid_width, 0,
+                          200, self._grid_height))
 
         # Agent decision.
-        Utilities.draw_outlined_text(self._screen, f"Decision: {str(self._decision).split(".")[1]}", Vector2(ui_x, ui_y))
+        RenderUtilities.draw_outlined_text(self._screen, f"Decision: {str(self._decision).split(".")[1]}", Vector2(ui_x, ui_y))
         ui_y += 25
 
         # Heuristic value.
-        Utilities.draw_outlined_text(self._screen, f"H = {self._h_value:+.4f}", Vector2(ui_x, ui_y))
+        RenderUtilities.draw_outlined_text(self._screen, f"H = {self._h_value:+.4f}", Vector2(ui_x, ui_y))
         ui_y += 45
 
         # Power-up status.
         power_status = "ON" if self._has_powerup else "OFF"
-        Utilities.draw_outlined_text(self._screen, f"Power-up: {power_status}", Vector2(ui_x, ui_y))
+        RenderUtilities.draw_outlined_text(self._screen, f"Power-up: {power_status}", Vector2(ui_x, ui_y))
         ui_y += 45
 
         features = [
@@ -171,39 +334,197 @@ class Simulator:
         ]
 
         for feature in features:
-            Utilities.draw_outlined_text(self._screen, feature, Vector2(ui_x, ui_y))
+            RenderUtilities.draw_outlined_text(self._screen, feature, Vector2(ui_x, ui_y))
             ui_y += 25
 
         ui_y += 55
 
+        # Shows the profiler overlay in place of the controls when profiling.
+        if self._profiler.enabled:
+            self._draw_profiler(ui_x, ui_y)
+            return
+
+        # Shows the latest trace entry in place of the controls when tracing.
+        if self._tracer.enabled:
+            self._draw_trace(ui_x, ui_y)
+            return
+
         # Controls.
-        Utilities.draw_outlined_text(self._screen, "====== Controls ======", Vector2(ui_x, ui_y))
+        RenderUtilities.draw_outlined_text(self._screen, "====== Controls ======", Vector2(ui_x, ui_y))
         ui_y += 35
 
         controls = [
             "Drag: Move entities",
             "Space: Toggle power-up",
             "Up/Down: Adjust time",
+            "P: Play/Pause agents",
             "R: Reset",
             "ESC: Quit"
         ]
 
         for control in controls:
-            Utilities.draw_outlined_text(self._screen, control, Vector2(ui_x, ui_y))
+            RenderUtilities.draw_outlined_text(self._screen, control, Vector2(ui_x, ui_y))
             ui_y += 22
 
-    def _draw(self):
+    def _draw_profiler(self, ui_x: int, ui_y: int) -> None:
+
+        """
+        Draws the rolling frame timings in the UI panel.
+
+        Parameters
+        ----------
+        ui_x : int
+            The horizontal centre of the panel.
+        ui_y : int
+            The height to start drawing at.
         """
-        Draws the world, entities, and UI.
+
+        RenderUtilities.draw_outlined_text(self._screen, "====== Profiler ======", Vector2(ui_x, ui_y))
+        ui_y += 35
+
+        lines: list[str] = [
+            f"FPS: {self._profiler.fps():.1f}",
+            f"p99 frame: {self._profiler.p99_frame_ms():.2f}ms",
+            *(f"{stage}: {average:.2f}ms" for stage, average in self._profiler.stage_averages_ms().items()),
+        ]
+
+        for line in lines:
+            RenderUtilities.draw_outlined_text(self._screen, line, Vector2(ui_x, ui_y))
+            ui_y += 17
+
+    def _draw_trace(self, ui_x: int, ui_y: int) -> None:
+
         """
+        Draws the latest traced heuristic evaluation in the UI panel.
+
+        Parameters
+        ----------
+        ui_x : int
+            The horizontal centre of the panel.
+        ui_y : int
+            The height to start drawing at.
+        """
+
+        RenderUtilities.draw_outlined_text(self._screen, "======= Trace =======", Vector2(ui_x, ui_y))
+        ui_y += 35
+
+        for entry in self._tracer.latest():
+
+            lines: list[str] = [
+                f"Call #{entry.call}: {entry.latency_ns / 1000:.1f}us",
+                f"Player: {entry.player_dist:.3f}",
+                f"Time: {entry.powerup_time:.3f}",
+                f"Powerup: {entry.powerup_dist:.3f}",
+                f"H = {entry.h_value:+.4f} ({entry.decision})",
+            ]
+
+            for line in lines:
+                RenderUtilities.draw_outlined_text(self._screen, line, Vector2(ui_x, ui_y))
+                ui_y += 17
+
+    def _get_ui_state(self) -> tuple:
+
+        """
+        Gets a snapshot of every value shown in the UI panel.
+
+        Returns
+        -------
+        tuple
+            The values the UI panel currently depends on.
+        """
+
+        return (
+            self._decision,
+            self._h_value,
+            self._has_powerup,
+            self._powerup_timer,
+            tuple(self._agent.position),
+            tuple(self._player.position),
+            self._tracer.calls,
+            self._profiler.frames,
+        )
+
+    def _draw_full(self) -> None:
+
+        """
+        Draws the whole screen and flips the display.
+        """
+
         self._screen.fill((255, 255, 255))
 
-        self._world.draw(self._screen)
-        self._player.draw(self._screen)
-        self._agent.draw(self._screen)
-        self.draw_ui()
+        with self._profiler.measure("world"):
+            self._world_renderer.draw(self._screen)
+
+        with self._profiler.measure("entities"):
+            self._player.draw(self._screen)
+            for agent in self._agents:
+                agent.draw(self._screen)
+
+        with self._profiler.measure("ui_text"):
+            self.draw_ui()
 
-        pygame.display.flip()
+        with self._profiler.measure("display"):
+            pygame.display.flip()
+
+    def _draw(self):
+
+        """
+        Draws the world, entities, and UI, pushing only the areas that
+        changed since the last frame to the display.
+        """
+
+        entities: list[Entity] = [self._player, *self._agents]
+        ui_state: tuple = self._get_ui_state()
+
+        # Redraws everything on the first frame or after the map changes.
+        if self._needs_full_redraw or not self._world_renderer.is_layer_valid:
+
+            self._draw_full()
+            self._entity_rects = {entity: entity.get_rect() for entity in entities}
+            self._drawn_ui_state = ui_state
+            self._needs_full_redraw = False
+            self._profiler.end_frame()
+            return
+
+        # Collects the old and new areas of every entity that moved.
+        dirty_rects: list[Rect] = []
+
+        for entity in entities:
+
+            rect: Rect = entity.get_rect()
+            previous: Rect = self._entity_rects[entity]
+
+            if rect != previous:
+                dirty_rects.extend((previous, rect))
+                self._entity_rects[entity] = rect
+
+        # Restores the world underneath and redraws the affected entities.
+        if dirty_rects:
+
+            with self._profiler.measure("world"):
+                for rect in dirty_rects:
+                    self._world_renderer.draw(self._screen, rect)
+
+            with self._profiler.measure("entities"):
+                for entity in entities:
+                    if self._entity_rects[entity].collidelist(dirty_rects) != -1:
+                        entity.draw(self._screen)
+
+        # Redraws the UI panel only if something it shows has changed.
+        if ui_state != self._drawn_ui_state:
+
+            with self._profiler.measure("ui_text"):
+                self._screen.fill((255, 255, 255), self._ui_rect)
+                self.draw_ui()
+
+            dirty_rects.append(self._ui_rect)
+            self._drawn_ui_state = ui_state
+
+        if dirty_rects:
+            with self._profiler.measure("display"):
+                pygame.display.update(dirty_rects)
+
+        self._profiler.end_frame()
 
     def run(self):
 
@@ -213,9 +534,20 @@ class Simulator:
 
         while self._running:
 
-            self._clock.tick(config.FPS)
-            self._handle_input()
+            # Draws first so the initial frame shows before waiting on input.
             self._draw()
 
+            # Caps the frame rate; input handling sleeps while idle.
+            self._clock.tick(render_config.FPS)
+            self._handle_input()
+
+        if self._recorder is not None:
+            self._recorder.close()
+
+        if self._tracer.enabled:
+            self._tracer.dump(config.TRACE_PATH)
+
+        self._profiler.close()
+
         pygame.quit()
         sys.exit()
\ No newline at end of file
@@ -0,0 +1,138 @@
+import csv
+import json
+
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import NamedTuple
+
+
+class TraceEntry(NamedTuple):
+
+    """
+    A single traced heuristic evaluation.
+    """
+
+    call: int
+    player_dist: float
+    powerup_time: float
+    powerup_dist: float
+    h_value: float
+    decision: str
+    latency_ns: int
+
+
+class HeuristicTracer:
+
+    """
+    Off-by-default tracer for heuristic evaluations.
+
+    When enabled, every evaluation is appended to an in-memory ring buffer
+    holding the latest ``capacity`` entries. When disabled, the heuristic
+    only pays for checking ``enabled``.
+    """
+
+    def __init__(self, capacity: int = 4096, enabled: bool = False) -> None:
+
+        self.enabled: bool = enabled
+
+        self._entries: deque[TraceEntry] = deque(maxlen=capacity)
+        self._calls: int = 0
+
+    def __len__(self) -> int:
+
+        return len(self._entries)
+
+    @property
+    def calls(self) -> int:
+
+        """
+        The number of evaluations traced since the tracer was created.
+        """
+
+        return self._calls
+
+    def record(
+        self,
+        player_dist: float,
+        powerup_time: float,
+        powerup_dist: float,
+        h_value: float,
+        decision: str,
+        latency_ns: int
+    ) -> None:
+
+        """
+        Appends an evaluation to the ring buffer, evicting the oldest entry
+        once the buffer is full.
+
+        Parameters
+        ----------
+        player_dist : float
+            The normalised distance to the player.
+        powerup_time : float
+            The normalised time left on the power-up.
+        powerup_dist : float
+            The normalised distance from the player to the nearest power-up.
+        h_value : float
+            The heuristic value.
+        decision : str
+            The name of the decision taken.
+        latency_ns : int
+            How long the evaluation took, in nanoseconds.
+        """
+
+        self._entries.append(TraceEntry(
+            self._calls, player_dist, powerup_time, powerup_dist, h_value, decision, latency_ns
+        ))
+        self._calls += 1
+
+    def latest(self, count: int = 1) -> list[TraceEntry]:
+
+        """
+        Gets the most recent entries, oldest first.
+
+        Parameters
+        ----------
+        count : int, optional
+            The maximum number of entries to return.
+
+        Returns
+        -------
+        list[TraceEntry]
+            The most recent entries.
+        """
+
+        return list(islice(reversed(self._entries), count))[::-1]
+
+    def clear(self) -> None:
+
+        """
+        Empties the ring buffer.
+        """
+
+        self._entries.clear()
+
+    def dump(self, path: str | Path) -> None:
+
+        """
+        Writes the ring buffer to disk as JSON if ``path`` ends in
+        ``.json``, or as CSV otherwise.
+
+        Parameters
+        ----------
+        path : str | Path
+            The file to write to.
+        """
+
+        path = Path(path)
+
+        with open(path, "w", newline="") as file:
+
+            if path.suffix == ".json":
+                json.dump([entry._asdict() for entry in self._entries], file, indent=2)
+                return
+
+            writer = csv.writer(file)
+            writer.writerow(TraceEntry._fields)
+            writer.writerows(self._entries)
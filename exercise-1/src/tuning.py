@@ -0,0 +1,495 @@
+import argparse
+import csv
+import os
+import time
+import config
+import numpy as np
+
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from recording import read_session
+from heuristic import Decision
+from world import World
+from numpy.typing import NDArray
+
+
+# Weight vector layout: (WEIGHT_TIME, WEIGHT_POWERUP_DIST, WEIGHT_PLAYER_DIST, bias).
+WEIGHT_NAMES: tuple[str, ...] = ("weight_time", "weight_powerup_dist", "weight_player_dist", "bias")
+
+# The four hand-worked scenarios from the README: (player_dist, powerup_dist, powerup_time, chase).
+README_SCENARIOS: list[tuple[int, int, float, bool]] = [
+    (14, 4, 0.0, True),
+    (6, 4, 5.0, False),
+    (6, 4, 1.5, True),
+    (5, 1, 0.0, False),
+]
+
+# Per-process copy of the dataset, set once by the pool initialiser.
+_features: NDArray[np.float64] | None = None
+_labels: NDArray[np.bool_] | None = None
+
+
+def normalise_features(
+    player_dists: NDArray[np.int_],
+    powerup_dists: NDArray[np.int_],
+    powerup_times: NDArray[np.float64],
+    max_manhattan: int
+) -> NDArray[np.float64]:
+
+    """
+    Normalises raw scenario features the same way ``Features`` does.
+
+    Parameters
+    ----------
+    player_dists : NDArray[np.int_]
+        The distance from the agent to the player in each scenario.
+    powerup_dists : NDArray[np.int_]
+        The distance from the player to the nearest power-up in each scenario.
+    powerup_times : NDArray[np.float64]
+        The time remaining on the player's powerup in each scenario.
+    max_manhattan : int
+        The largest Manhattan distance in the world.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        An ``(n, 3)`` array of ``(T, D_powerup, D_player)`` rows.
+    """
+
+    return np.stack((
+        np.minimum(powerup_times, config.MAX_POWERUP_TIME) / config.MAX_POWERUP_TIME,
+        powerup_dists / max_manhattan,
+        player_dists / max_manhattan,
+    ), axis=1).astype(np.float64)
+
+
+def load_readme_scenarios() -> tuple[NDArray[np.float64], NDArray[np.bool_]]:
+
+    """
+    Loads the README scenarios, assuming the default 8x8 world.
+
+    Returns
+    -------
+    tuple[NDArray[np.float64], NDArray[np.bool_]]
+        The normalised features and whether the agent should chase.
+    """
+
+    player_dists, powerup_dists, powerup_times, labels = (np.array(column) for column in zip(*README_SCENARIOS))
+    return normalise_features(player_dists, powerup_dists, powerup_times, 14), labels.astype(bool)
+
+
+def load_csv_scenarios(path: str | Path, max_manhattan: int) -> tuple[NDArray[np.float64], NDArray[np.bool_]]:
+
+    """
+    Loads labelled scenarios from a CSV file with the columns
+    ``player_dist``, ``powerup_dist``, ``powerup_time`` and ``decision``
+    (``CHASE`` or ``FLEE``).
+
+    Parameters
+    ----------
+    path : str | Path
+        The path to the CSV file.
+    max_manhattan : int
+        The largest Manhattan distance in the world the scenarios come from.
+
+    Returns
+    -------
+    tuple[NDArray[np.float64], NDArray[np.bool_]]
+        The normalised features and whether the agent should chase.
+    """
+
+    table = np.genfromtxt(path, delimiter=",", names=True, dtype=None, encoding="utf-8")
+    labels: NDArray[np.bool_] = np.char.upper(table["decision"].astype(str)) == Decision.CHASE.name
+
+    features: NDArray[np.float64] = normalise_features(
+        table["player_dist"], table["powerup_dist"], table["powerup_time"], max_manhattan
+    )
+
+    return features, labels
+
+
+def load_session_scenarios(path: str | Path, world: World) -> tuple[NDArray[np.float64], NDArray[np.bool_]]:
+
+    """
+    Loads scenarios from a recorded session, labelled with the decisions
+    that were taken during the session.
+
+    Parameters
+    ----------
+    path : str | Path
+        The path to the session log.
+    world : World
+        The world the session was recorded in.
+
+    Returns
+    -------
+    tuple[NDArray[np.float64], NDArray[np.bool_]]
+        The normalised features and whether the agent should chase.
+    """
+
+    _, records = read_session(path)
+
+    # Only looks up the power-up distance once per distinct player cell.
+    players: NDArray[np.int_] = np.stack((records["player_row"], records["player_col"]), axis=1)
+    cells, inverse = np.unique(players, axis=0, return_inverse=True)
+    powerup_dists: NDArray[np.int_] = np.array(
+        [world.get_distance_to_nearest_powerup(cell) for cell in cells], dtype=np.int_
+    )[inverse.reshape(-1)]
+
+    player_dists: NDArray[np.int_] = (
+        np.abs(records["agent_row"] - records["player_row"])
+        + np.abs(records["agent_col"] - records["player_col"])
+    )
+
+    features: NDArray[np.float64] = normalise_features(
+        player_dists, powerup_dists, records["powerup_timer"], world.max_manhattan
+    )
+
+    return features, records["decision"] == Decision.CHASE.value
+
+
+def evaluate_weights(
+    weights: NDArray[np.float64],
+    features: NDArray[np.float64],
+    labels: NDArray[np.bool_]
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+
+    """
+    Scores many weight vectors against every scenario at once.
+
+    Parameters
+    ----------
+    weights : NDArray[np.float64]
+        An ``(m, 4)`` array of weight vectors, laid out as ``WEIGHT_NAMES``.
+    features : NDArray[np.float64]
+        The ``(n, 3)`` normalised scenario features.
+    labels : NDArray[np.bool_]
+        Whether the agent should chase in each scenario.
+
+    Returns
+    -------
+    tuple[NDArray[np.float64], NDArray[np.float64]]
+        The accuracy of every weight vector, and its margin: the smallest
+        signed heuristic value over all scenarios, positive only when every
+        scenario is decided correctly.
+    """
+
+    # H = -w_t * T + w_pd * D_powerup + w_pl * D_player + b, as an (m, n) matrix.
+    coefficients: NDArray[np.float64] = weights[:, :3] * np.array([-1.0, 1.0, 1.0])
+    values: NDArray[np.float64] = coefficients @ features.T + weights[:, 3:4]
+
+    signed: NDArray[np.float64] = np.where(labels, values, -values)
+    accuracy: NDArray[np.float64] = (signed > 0.0).mean(axis=1)
+
+    return accuracy, signed.min(axis=1)
+
+
+def _init_worker(features: NDArray[np.float64], labels: NDArray[np.bool_]) -> None:
+
+    """
+    Stores the dataset in a worker process so it is only sent once.
+    """
+
+    global _features, _labels
+    _features, _labels = features, labels
+
+
+def _evaluate_batch(weights: NDArray[np.float64], top_k: int) -> NDArray[np.float64]:
+
+    """
+    Scores a batch of weight vectors in a worker process.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        The batch's ``top_k`` rows as ``(*weights, accuracy, margin)``.
+    """
+
+    accuracy, margin = evaluate_weights(weights, _features, _labels)
+
+    order: NDArray[np.int_] = np.lexsort((-margin, -accuracy))[:top_k]
+    return np.column_stack((weights[order], accuracy[order], margin[order]))
+
+
+def grid_weights(
+    axes: list[NDArray[np.float64]],
+    batch_size: int
+) -> Iterator[NDArray[np.float64]]:
+
+    """
+    Generates the Cartesian product of per-weight value ranges in batches,
+    without ever materialising the whole grid.
+
+    Parameters
+    ----------
+    axes : list[NDArray[np.float64]]
+        The values to try for each weight, laid out as ``WEIGHT_NAMES``.
+    batch_size : int
+        The number of weight vectors per batch.
+    """
+
+    shape: tuple[int, ...] = tuple(len(axis) for axis in axes)
+    total: int = int(np.prod(shape))
+
+    for start in range(0, total, batch_size):
+        indices = np.unravel_index(np.arange(start, min(start + batch_size, total)), shape)
+        yield np.column_stack([axis[index] for axis, index in zip(axes, indices)])
+
+
+def random_weights(
+    count: int,
+    low: NDArray[np.float64],
+    high: NDArray[np.float64],
+    batch_size: int,
+    rng: np.random.Generator
+) -> Iterator[NDArray[np.float64]]:
+
+    """
+    Generates uniformly random weight vectors in batches.
+
+    Parameters
+    ----------
+    count : int
+        The total number of weight vectors.
+    low : NDArray[np.float64]
+        The lower bound of each weight.
+    high : NDArray[np.float64]
+        The upper bound of each weight.
+    batch_size : int
+        The number of weight vectors per batch.
+    rng : np.random.Generator
+        The random number generator to sample with.
+    """
+
+    for start in range(0, count, batch_size):
+        yield rng.uniform(low, high, size=(min(batch_size, count - start), len(low)))
+
+
+class WeightTuner:
+
+    """
+    Evaluates weight vectors against a scenario dataset across a process
+    pool, streaming the best configurations of every batch to a CSV file.
+    """
+
+    def __init__(
+        self,
+        features: NDArray[np.float64],
+        labels: NDArray[np.bool_],
+        output: str | Path,
+        workers: int | None = None,
+        top_k: int = 10
+    ) -> None:
+
+        self._top_k: int = top_k
+        self._best: NDArray[np.float64] = np.empty((0, len(WEIGHT_NAMES) + 2))
+        self._evaluated: int = 0
+
+        self._pool: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(features, labels)
+        )
+        self._max_pending: int = 2 * (workers or os.cpu_count() or 1)
+
+        self._file = open(output, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([*WEIGHT_NAMES, "accuracy", "margin"])
+
+    @property
+    def best(self) -> NDArray[np.float64]:
+
+        """
+        The best rows seen so far as ``(*weights, accuracy, margin)``.
+        """
+
+        return self._best
+
+    @property
+    def evaluated(self) -> int:
+
+        """
+        The number of weight vectors evaluated so far.
+        """
+
+        return self._evaluated
+
+    def _collect(self, future: Future) -> NDArray[np.float64]:
+
+        """
+        Merges a finished batch into the running top-k and streams it to disk.
+        """
+
+        rows: NDArray[np.float64] = future.result()
+
+        self._writer.writerows(rows.tolist())
+        self._file.flush()
+
+        merged: NDArray[np.float64] = np.concatenate((self._best, rows))
+        self._best = merged[np.lexsort((-merged[:, -1], -merged[:, -2]))][:self._top_k]
+
+        return rows
+
+    def run(self, batches: Iterator[NDArray[np.float64]]) -> NDArray[np.float64]:
+
+        """
+        Evaluates every batch, keeping a bounded number of batches in flight.
+
+        Parameters
+        ----------
+        batches : Iterator[NDArray[np.float64]]
+            The batches of weight vectors to evaluate.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            The top rows of every batch, in completion order.
+        """
+
+        pending: set[Future] = set()
+        results: list[NDArray[np.float64]] = []
+
+        for batch in batches:
+
+            # Waits for a free slot so huge searches never queue every batch.
+            if len(pending) >= self._max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(self._collect(future) for future in done)
+
+            pending.add(self._pool.submit(_evaluate_batch, batch, self._top_k))
+            self._evaluated += len(batch)
+
+        for future in pending:
+            results.append(self._collect(future))
+
+        return np.concatenate(results) if results else np.empty((0, len(WEIGHT_NAMES) + 2))
+
+    def cross_entropy(
+        self,
+        mean: NDArray[np.float64],
+        std: NDArray[np.float64],
+        iterations: int,
+        samples: int,
+        batch_size: int,
+        rng: np.random.Generator,
+        elite_fraction: float = 0.1
+    ) -> NDArray[np.float64]:
+
+        """
+        Runs a cross-entropy search, a simplified CMA-style method that
+        refits a diagonal Gaussian to the best samples of each generation.
+
+        Parameters
+        ----------
+        mean : NDArray[np.float64]
+            The initial mean of every weight.
+        std : NDArray[np.float64]
+            The initial standard deviation of every weight.
+        iterations : int
+            The number of generations.
+        samples : int
+            The number of weight vectors per generation.
+        batch_size : int
+            The number of weight vectors per batch.
+        rng : np.random.Generator
+            The random number generator to sample with.
+        elite_fraction : float, optional
+            The fraction of each generation the distribution is refitted to.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            The final mean of the distribution.
+        """
+
+        for _ in range(iterations):
+
+            population: NDArray[np.float64] = rng.normal(mean, std, size=(samples, len(mean)))
+            batches = (population[start:start + batch_size] for start in range(0, samples, batch_size))
+
+            # Refits to the elite among the top rows returned by each batch.
+            rows: NDArray[np.float64] = self.run(batches)
+            rows = rows[np.lexsort((-rows[:, -1], -rows[:, -2]))]
+            elite: NDArray[np.float64] = rows[:max(2, int(len(rows) * elite_fraction)), :len(mean)]
+
+            mean = elite.mean(axis=0)
+            std = elite.std(axis=0) + 1e-6
+
+        return mean
+
+    def close(self) -> None:
+
+        """
+        Shuts down the process pool and closes the output file.
+        """
+
+        self._pool.shutdown()
+        self._file.close()
+
+
+def main() -> None:
+
+    """
+    Entry point for the weight tuner.
+    """
+
+    parser = argparse.ArgumentParser(description="Tunes the chase/flee heuristic weights.")
+    parser.add_argument("--csv", help="CSV file of labelled scenarios.")
+    parser.add_argument("--session", help="Recorded session to use as labelled scenarios.")
+    parser.add_argument("--search", choices=("grid", "random", "cem"), default="grid")
+    parser.add_argument("--steps", type=int, default=41, help="Grid values per weight.")
+    parser.add_argument("--samples", type=int, default=1_000_000, help="Random or per-generation samples.")
+    parser.add_argument("--iterations", type=int, default=10, help="Cross-entropy generations.")
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="tuning_results.csv")
+    args = parser.parse_args()
+
+    world: World = World(config.WORLD_MAP_PATH)
+
+    if args.csv:
+        features, labels = load_csv_scenarios(args.csv, world.max_manhattan)
+    elif args.session:
+        features, labels = load_session_scenarios(args.session, world)
+    else:
+        features, labels = load_readme_scenarios()
+
+    # Weights range over [0, 1]; the bias ranges over [-0.5, 0.5].
+    low: NDArray[np.float64] = np.array([0.0, 0.0, 0.0, -0.5])
+    high: NDArray[np.float64] = np.array([1.0, 1.0, 1.0, 0.5])
+    rng: np.random.Generator = np.random.default_rng(args.seed)
+
+    tuner: WeightTuner = WeightTuner(features, labels, args.output, args.workers, args.top_k)
+    start: float = time.perf_counter()
+
+    try:
+
+        if args.search == "grid":
+            axes = [np.linspace(lo, hi, args.steps) for lo, hi in zip(low, high)]
+            tuner.run(grid_weights(axes, args.batch_size))
+
+        elif args.search == "random":
+            tuner.run(random_weights(args.samples, low, high, args.batch_size, rng))
+
+        else:
+            current = np.array([config.WEIGHT_TIME, config.WEIGHT_POWERUP_DIST,
+                                config.WEIGHT_PLAYER_DIST, config.HEURISTIC_BIAS])
+            tuner.cross_entropy(current, (high - low) / 4, args.iterations, args.samples, args.batch_size, rng)
+
+    finally:
+        tuner.close()
+
+    elapsed: float = time.perf_counter() - start
+    evaluations: int = tuner.evaluated * len(labels)
+
+    print(f"Evaluated {tuner.evaluated:,} weight vectors x {len(labels)} scenarios "
+          f"in {elapsed:.2f}s ({evaluations / elapsed:,.0f} evaluations/s).")
+
+    print(" ".join(f"{name:>20}" for name in (*WEIGHT_NAMES, "accuracy", "margin")))
+    for row in tuner.best:
+        print(" ".join(f"{value:>20.4f}" for value in row))
+
+
+if __name__ == "__main__":
+    main()
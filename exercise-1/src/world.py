@@ -1,9 +1,8 @@
 import config
 import numpy as np
-import pygame.draw
 
-from utilities import Utilities, Direction, Color
-from pygame import Vector2, Surface
+from pathlib import Path
+from powerup_index import PowerupIndex
 from numpy.typing import NDArray
 
 
@@ -13,30 +12,105 @@ class World:
     Represents the game world.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, map_path: str | Path | None = None) -> None:
 
-        self._grid: NDArray[np.int_] = config.WORLD_MAP.copy()
-        self._powerups: list[Vector2] = self._get_powerup_positions()
+        self._grid: NDArray[np.int_] = self._load_grid(map_path)
+        self._powerups: NDArray[np.int_] = self._get_powerup_positions()
+        self._powerup_index: PowerupIndex = PowerupIndex(self._powerups)
 
-    def _get_powerup_positions(self) -> list[Vector2]:
+    @staticmethod
+    def _load_grid(map_path: str | Path | None) -> NDArray[np.int_]:
+
+        """
+        Loads the world grid.
+
+        Parameters
+        ----------
+        map_path : str | Path | None
+            Path to a ``.npy`` map file. Uses ``config.WORLD_MAP`` if ``None``.
+
+        Returns
+        -------
+        NDArray[np.int_]
+            The world grid.
+
+        Notes
+        -----
+        Map files are memory-mapped read-only, so only the cells that are
+        actually accessed get read from disk.
+        """
+
+        if map_path is None:
+            return config.WORLD_MAP.copy()
+
+        grid: NDArray[np.int_] = np.load(map_path, mmap_mode="r")
+
+        if grid.ndim != 2:
+            raise ValueError(f"Map must be a 2D grid, got shape {grid.shape}.")
+
+        return grid
+
+    @property
+    def rows(self) -> int:
+
+        """
+        The number of rows in the world grid.
+        """
+
+        return self._grid.shape[0]
+
+    @property
+    def cols(self) -> int:
+
+        """
+        The number of columns in the world grid.
+        """
+
+        return self._grid.shape[1]
+
+    @property
+    def max_manhattan(self) -> int:
+
+        """
+        The largest Manhattan distance between two cells of the world grid.
+        """
+
+        return (self.rows - 1) + (self.cols - 1)
+
+    @property
+    def grid(self) -> NDArray[np.int_]:
+
+        """
+        A read-only view of the world grid.
+        """
+
+        view: NDArray[np.int_] = self._grid.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def powerups(self) -> NDArray[np.int_]:
+
+        """
+        The ``(n, 2)`` row and column of every power-up.
+        """
+
+        return self._powerups
+
+    def _get_powerup_positions(self) -> NDArray[np.int_]:
 
         """
         Returns the positions of all power-ups.
 
         Returns
         -------
-        list[Vector2]
-            A list with the positions of all power-ups.
+        NDArray[np.int_]
+            An ``(n, 2)`` array with the row and column of every power-up.
         """
 
-        powerups = []
-        for i in range(self._grid.shape[0]):
-            for j in range(self._grid.shape[1]):
-                if self._grid[i, j] == 2:
-                    powerups.append(Vector2(i, j))
-        return powerups
+        return np.argwhere(self._grid == 2)
 
-    def get_distance_to_nearest_powerup(self, position: Vector2) -> int:
+    def get_distance_to_nearest_powerup(self, position: tuple[int, int]) -> int:
 
         """
         Finds the distance between the provided position and the power-up
@@ -44,7 +118,7 @@ class World:
 
         Arguments
         ---------
-        position : Vector2
+        position : tuple[int, int]
             The position to calculate the distance from.
 
         Returns
@@ -53,28 +127,22 @@ class World:
             The distance between the provided position and the nearest power-up.
         """
 
+        distance: int | None = self._powerup_index.nearest_distance(int(position[0]), int(position[1]))
+
         # Returns the max distance if there are no power-ups left.
-        if not self._powerups:
-            return config.MAX_MANHATTAN
+        if distance is None:
+            return self.max_manhattan
 
-        # Calculates all the distances.
-        distances = [
-            Utilities.manhattan_distance(position, powerup)
-            for powerup in self._powerups
-        ]
+        return distance
 
-        # Returns the smallest distance.
-        return min(distances)
-
-    @staticmethod
-    def _is_valid_position(position: Vector2) -> bool:
+    def _is_valid_position(self, position: tuple[int, int]) -> bool:
 
         """
         Checks if a position is within the world bounds.
 
         Parameters
         ----------
-        position : Vector2
+        position : tuple[int, int]
             The position to check.
 
         Returns
@@ -84,19 +152,19 @@ class World:
             ``False`` otherwise.
         """
 
-        row: int = int(position.x)
-        col: int = int(position.y)
+        row: int = int(position[0])
+        col: int = int(position[1])
 
-        return 0 <= row < config.GRID_SIZE and 0 <= col < config.GRID_SIZE
+        return 0 <= row < self.rows and 0 <= col < self.cols
 
-    def is_free(self, position: Vector2) -> bool:
+    def is_free(self, position: tuple[int, int]) -> bool:
 
         """
         Checks whether a position is valid and not a wall.
 
         Parameters
         ----------
-        position : Vector2
+        position : tuple[int, int]
             The position to check.
 
         Returns
@@ -105,44 +173,37 @@ class World:
             ``True`` if the position is free, ``False`` otherwise.
         """
 
-        row: int = int(position.x)
-        col: int = int(position.y)
+        row: int = int(position[0])
+        col: int = int(position[1])
 
         if not self._is_valid_position(position):
             return False
 
         return self._grid[row, col] != 1
 
-    def draw(self, surface: Surface) -> None:
+    def are_free(self, positions: NDArray[np.int_]) -> NDArray[np.bool_]:
 
         """
-        Draws the world grid.
+        Checks whether many positions are valid and not walls.
 
         Parameters
         ----------
-        surface : Surface
-            The Pygame surface to draw the world grid on.
-        """
-
-        # Draws the grid itself.
-        for row in range(config.GRID_SIZE):
+        positions : NDArray[np.int_]
+            An array of positions whose last axis holds the row and column.
 
-            for col in range(config.GRID_SIZE):
-
-                x: int = col * config.CELL_SIZE
-                y: int = row * config.CELL_SIZE
-
-                # Decides on which colour to use.
-                colour: Color = config.COLOUR_EMPTY
-                if self._grid[row, col] == 1:
-                    colour = config.COLOUR_WALL
+        Returns
+        -------
+        NDArray[np.bool_]
+            ``True`` for every position that is free, ``False`` otherwise.
+        """
 
-                pygame.draw.rect(surface, colour, (x, y, config.CELL_SIZE, config.CELL_SIZE))
-                pygame.draw.rect(surface, config.COLOUR_GRID, (x, y, config.CELL_SIZE, config.CELL_SIZE), 1)
+        rows: NDArray[np.int_] = positions[..., 0]
+        cols: NDArray[np.int_] = positions[..., 1]
+        in_bounds: NDArray[np.bool_] = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
 
-        # Draws the power-ups.
-        for row, col in self._powerups:
+        # Clamps out-of-bounds positions so the grid lookup stays valid.
+        tiles: NDArray[np.int_] = self._grid[
+            np.clip(rows, 0, self.rows - 1), np.clip(cols, 0, self.cols - 1)
+        ]
 
-            x: int = col * config.CELL_SIZE + config.CELL_SIZE // 2
-            y: int = row * config.CELL_SIZE + config.CELL_SIZE // 2
-            pygame.draw.circle(surface, config.COLOUR_POWERUP, (x, y), config.CELL_SIZE // 4)
\ No newline at end of file
+        return in_bounds & (tiles != 1)
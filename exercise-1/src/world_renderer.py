@@ -0,0 +1,101 @@
+import render_config
+import numpy as np
+import pygame.draw
+
+from pygame import Surface, Rect, Color
+from world import World
+from numpy.typing import NDArray
+
+
+class WorldRenderer:
+
+    """
+    Draws a world, caching its static grid in a pre-rendered layer.
+    """
+
+    def __init__(self, world: World) -> None:
+
+        self._world: World = world
+
+        # Pre-rendered static layer, built lazily on the first draw.
+        self._layer: Surface | None = None
+
+    @property
+    def is_layer_valid(self) -> bool:
+
+        """
+        Whether the pre-rendered world layer is up to date.
+        """
+
+        return self._layer is not None
+
+    def invalidate_layer(self) -> None:
+
+        """
+        Discards the pre-rendered world layer. Must be called whenever
+        the map changes so that the next draw renders it again.
+        """
+
+        self._layer = None
+
+    def _render_layer(self) -> Surface:
+
+        """
+        Renders the static world grid and power-ups to an off-screen surface.
+
+        Returns
+        -------
+        Surface
+            The rendered world layer.
+        """
+
+        cell_size: int = render_config.CELL_SIZE
+        grid: NDArray[np.int_] = self._world.grid
+        layer: Surface = Surface((self._world.cols * cell_size, self._world.rows * cell_size)).convert()
+
+        # Draws the grid itself.
+        for row in range(self._world.rows):
+
+            for col in range(self._world.cols):
+
+                x: int = col * cell_size
+                y: int = row * cell_size
+
+                # Decides on which colour to use.
+                colour: Color = render_config.COLOUR_EMPTY
+                if grid[row, col] == 1:
+                    colour = render_config.COLOUR_WALL
+
+                pygame.draw.rect(layer, colour, (x, y, cell_size, cell_size))
+                pygame.draw.rect(layer, render_config.COLOUR_GRID, (x, y, cell_size, cell_size), 1)
+
+        # Draws the power-ups.
+        for row, col in self._world.powerups:
+
+            x: int = int(col) * cell_size + cell_size // 2
+            y: int = int(row) * cell_size + cell_size // 2
+            pygame.draw.circle(layer, render_config.COLOUR_POWERUP, (x, y), cell_size // 4)
+
+        return layer
+
+    def draw(self, surface: Surface, area: Rect | None = None) -> None:
+
+        """
+        Draws the world grid from the pre-rendered layer.
+
+        Parameters
+        ----------
+        surface : Surface
+            The Pygame surface to draw the world grid on.
+        area : Rect | None, optional
+            The screen area to restore. Draws the whole grid if ``None``.
+        """
+
+        # Renders the layer only when the map has changed.
+        if self._layer is None:
+            self._layer = self._render_layer()
+
+        if area is None:
+            surface.blit(self._layer, (0, 0))
+        else:
+            surface.blit(self._layer, area.topleft, area)
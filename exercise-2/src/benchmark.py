@@ -0,0 +1,450 @@
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pathlib import Path
+
+from world import World
+from generators import COSTS, random_world, keyed_grid
+from simulator import Simulator
+from search_mode import SearchMode
+from frontier import HeapFrontier
+from route_service import RouteQuery, RouteService
+from incremental_planner import IncrementalPlanner
+from distance_oracle import DistanceOracle
+from tree_sink import TreeSink
+
+
+def scan_neighbours(world: World, position: str, keys: int) -> list[str]:
+    """
+    Gets the neighbours of a node by scanning every connection, as the
+    simulator did before the world indexed its adjacency.
+
+    Parameters
+    ----------
+    world : World
+        The world to search.
+    position : str
+        The position to get neighbours for.
+    keys : int
+        The keys the explorer has picked up.
+
+    Returns
+    -------
+    list[str]
+        The neighbour nodes, in alphabetical order.
+    """
+
+    neighbours: list[str] = []
+
+    for a, b, *_ in world.connections:
+
+        if position in (a, b):
+
+            neighbour: str = b if a == position else a
+
+            # Checks if the edge is locked (bidirectional) by a missing key.
+            for lock in ((position, neighbour), (neighbour, position)):
+                if lock in world.locked_connections and not keys >> world.keys.index(world.locked_connections[lock]) & 1:
+                    break
+            else:
+                neighbours.append(neighbour)
+
+    return sorted(neighbours)
+
+
+def benchmark_neighbours(node_count: int, edge_count: int, samples: int = 20) -> None:
+    """
+    Times node expansion with and without the adjacency index.
+
+    Parameters
+    ----------
+    node_count : int
+        The number of nodes in the world.
+    edge_count : int
+        The number of connections in the world.
+    samples : int, optional
+        The number of expansions timed with the linear scan.
+    """
+
+    start: float = time.perf_counter()
+    world: World = random_world(node_count, edge_count)
+    build_time: float = time.perf_counter() - start
+
+    simulator: Simulator = Simulator(world)
+    rng: random.Random = random.Random(1)
+    positions: list[str] = [rng.choice(world.nodes) for _ in range(samples)]
+
+    # The linear scan is slow, so only a few expansions are timed.
+    start = time.perf_counter()
+    for position in positions:
+        scanned: list[str] = scan_neighbours(world, position, 0)
+    scan_time: float = (time.perf_counter() - start) / samples
+
+    # Checks that both agree before timing the index properly.
+    for position in positions:
+        for keys in (0, 1):
+            indexed: list[int] = simulator._get_neighbours(world.ids[position], keys)
+            assert [world.nodes[neighbour] for neighbour in indexed] == scan_neighbours(world, position, keys)
+
+    repeats: int = 100_000
+    start = time.perf_counter()
+    for i in range(repeats):
+        simulator._get_neighbours(world.ids[positions[i % samples]], 0)
+    indexed_time: float = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    path, cost, _ = simulator._build_tree()
+    search_time: float = time.perf_counter() - start
+
+    print(
+        f"{node_count:>8} nodes {edge_count:>8} edges | "
+        f"build {build_time * 1000:8.1f} ms | "
+        f"scan {scan_time * 1e6:10.1f} us/expansion | "
+        f"indexed {indexed_time * 1e6:6.3f} us/expansion | "
+        f"x{scan_time / indexed_time:,.0f} | "
+        f"UCS {search_time * 1000:8.1f} ms (cost {cost})"
+    )
+
+
+def benchmark_modes(node_count: int, edge_count: int, key_count: int) -> None:
+    """
+    Times every search mode on the same world, comparing the states each
+    expands against uniform cost search.
+
+    Parameters
+    ----------
+    node_count : int
+        The number of nodes in the world.
+    edge_count : int
+        The number of connections in the world.
+    key_count : int
+        The number of keys in the world.
+    """
+
+    simulator: Simulator = Simulator(random_world(node_count, edge_count, key_count))
+    ucs_expanded: int = 0
+
+    for mode in SearchMode:
+
+        # Builds any heuristic first, so only the search itself is timed.
+        simulator._build_tree(mode)
+
+        start: float = time.perf_counter()
+        path, cost, tree_info = simulator._build_tree(mode)
+        search_time: float = time.perf_counter() - start
+
+        if mode is SearchMode.UCS:
+            ucs_expanded = tree_info["expanded"]
+
+        print(
+            f"{node_count:>8} nodes {edge_count:>8} edges {key_count:>2} keys | "
+            f"{mode.value:<13} | cost {cost:>6.4g} | "
+            f"expanded {tree_info['expanded']:>8} ({tree_info['expanded'] / ucs_expanded:6.1%} of UCS) | "
+            f"{search_time * 1000:8.1f} ms"
+        )
+
+
+def benchmark_memory(side: int, key_count: int, cache_sizes: tuple[int, ...] = (100_000, 1_000)) -> None:
+    """
+    Compares the peak memory and the expansions of uniform cost search and
+    of memory-bounded IDA* with each transposition cache size, on a keyed
+    grid where the heuristic can't see the whole key chain.
+
+    Parameters
+    ----------
+    side : int
+        The number of nodes along each side of the grid.
+    key_count : int
+        The number of keys in the chain.
+    cache_sizes : tuple[int, ...], optional
+        The transposition cache sizes to run IDA* with. Without a cache,
+        IDA* retries every one of a grid's many equal paths.
+    """
+
+    simulator: Simulator = Simulator(keyed_grid(side, key_count))
+
+    # Builds the heuristic first, so only the search itself is measured.
+    simulator._build_tree(SearchMode.IDA_STAR, sink=TreeSink(), cache_size=cache_sizes[0])
+    ucs_expanded: int = 0
+
+    for mode, cache_size in [(SearchMode.UCS, 0), *((SearchMode.IDA_STAR, size) for size in cache_sizes)]:
+
+        tracemalloc.start()
+        start: float = time.perf_counter()
+        _, cost, tree_info = simulator._build_tree(mode, sink=TreeSink(), cache_size=cache_size)
+        search_time: float = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        if mode is SearchMode.UCS:
+            ucs_expanded = tree_info["expanded"]
+
+        print(
+            f"{side:>3}x{side:<3} grid {key_count:>2} keys | {mode.value:<8} cache {cache_size:>7} | "
+            f"cost {cost:>4} | expanded {tree_info['expanded']:>8} (x{tree_info['expanded'] / ucs_expanded:6.1f} UCS, "
+            f"{tree_info.get('iterations', 1):>3} iterations) | peak {peak / 2 ** 20:6.2f} MiB | "
+            f"{search_time * 1000:8.1f} ms"
+        )
+
+
+def benchmark_frontiers(node_count: int, edge_count: int) -> None:
+    """
+    Times uniform cost search with the frontier picked for each kind of
+    connection costs, against a binary heap.
+
+    Parameters
+    ----------
+    node_count : int
+        The number of nodes in the world.
+    edge_count : int
+        The number of connections in the world.
+    """
+
+    for costs in COSTS:
+
+        simulator: Simulator = Simulator(random_world(node_count, edge_count, 0, costs))
+        frontier: str = type(simulator._make_frontier(SearchMode.UCS)).__name__
+
+        start: float = time.perf_counter()
+        _, cost, tree_info = simulator._build_tree()
+        picked_time: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, heap_cost, _ = simulator._build_tree(frontier=HeapFrontier())
+        heap_time: float = time.perf_counter() - start
+
+        assert abs(cost - heap_cost) < 1e-9
+
+        print(
+            f"{node_count:>8} nodes {edge_count:>8} edges | {costs:<8} | cost {cost:>6.4g} | "
+            f"expanded {tree_info['expanded']:>8} | {frontier:<15} {picked_time * 1000:8.1f} ms | "
+            f"HeapFrontier {heap_time * 1000:8.1f} ms"
+        )
+
+
+def benchmark_routes(node_count: int, edge_count: int, query_count: int = 2_000) -> None:
+    """
+    Times the route service on random queries, with a cold cache and then
+    a hot one, solving misses in this process and in the worker pool.
+
+    Parameters
+    ----------
+    node_count : int
+        The number of nodes in the world.
+    edge_count : int
+        The number of connections in the world.
+    query_count : int, optional
+        The number of distinct queries.
+    """
+
+    world: World = random_world(node_count, edge_count, 4)
+    rng: random.Random = random.Random(2)
+    queries: list[RouteQuery] = [
+        RouteQuery(*rng.sample(world.nodes, 2), rng.getrandbits(len(world.keys))) for _ in range(query_count)
+    ]
+
+    for workers in (0, os.cpu_count() or 1):
+
+        with RouteService(world, cache_size=query_count, workers=workers) as service:
+
+            start: float = time.perf_counter()
+            cold: list = service.query_many(queries)
+            cold_time: float = time.perf_counter() - start
+
+            start = time.perf_counter()
+            hot: list = service.query_many(queries)
+            hot_time: float = time.perf_counter() - start
+
+        assert cold == hot
+
+        print(
+            f"{node_count:>8} nodes {edge_count:>8} edges | {workers:>2} workers | "
+            f"cold {query_count / cold_time:>10,.0f} queries/s | "
+            f"hot {query_count / hot_time:>12,.0f} queries/s"
+        )
+
+
+def benchmark_replanning(node_count: int, edge_count: int, edits: int = 20) -> None:
+    """
+    Times incremental replanning after single edits, against searching the
+    edited world from scratch, checking that both find the same cost.
+
+    Parameters
+    ----------
+    node_count : int
+        The number of nodes in the world.
+    edge_count : int
+        The number of connections in the world.
+    edits : int, optional
+        The number of edits, cycling through removing a connection of the
+        current route, and adding, locking and unlocking a random one.
+    """
+
+    world: World = random_world(node_count, edge_count, 2, "small")
+    rng: random.Random = random.Random(3)
+
+    # The benchmark's own copy of the world, rebuilt after every edit.
+    connections: dict[tuple[str, str], float] = {}
+    for a, b, cost in world.connections:
+        pair: tuple[str, str] = World.normalise(a, b)
+        connections[pair] = min(cost, connections.get(pair, cost))
+    locks: dict[tuple[str, str], str] = {World.normalise(a, b): key for (a, b), key in world.locked_connections.items()}
+
+    planner: IncrementalPlanner = IncrementalPlanner(world)
+
+    start: float = time.perf_counter()
+    path, cost, expanded = planner.plan()
+    initial_time: float = time.perf_counter() - start
+
+    replan_time: float = 0
+    replan_expanded: int = 0
+    search_time: float = 0
+    search_expanded: int = 0
+
+    for edit in range(edits):
+
+        pair = rng.choice(list(connections))
+
+        # Cuts the current route, so the planner has to repair it.
+        if edit % 4 == 0 and path is not None and len(path) > 1:
+            step: int = rng.randrange(len(path) - 1)
+            pair = World.normalise(world.nodes[path[step].node], world.nodes[path[step + 1].node])
+            del connections[pair]
+            locks.pop(pair, None)
+            planner.remove_connection(*pair)
+        elif edit % 4 == 1:
+            pair = World.normalise(*rng.sample(world.nodes, 2))
+            connections[pair] = rng.randint(1, 9)
+            planner.add_connection(*pair, connections[pair])
+        elif edit % 4 == 2:
+            locks[pair] = rng.choice(world.keys)
+            planner.lock(*pair, locks[pair])
+        else:
+            locks.pop(pair, None)
+            planner.unlock(*pair)
+
+        start = time.perf_counter()
+        path, cost, expanded = planner.plan()
+        replan_time += time.perf_counter() - start
+        replan_expanded += expanded
+
+        simulator: Simulator = Simulator(World(
+            nodes=world.nodes,
+            connections=[(a, b, edge_cost) for (a, b), edge_cost in connections.items()],
+            locked_connections=locks,
+            keys=world.keys,
+        ))
+
+        start = time.perf_counter()
+        _, search_cost, tree_info = simulator._build_tree(sink=TreeSink())
+        search_time += time.perf_counter() - start
+        search_expanded += tree_info["expanded"]
+
+        assert abs(cost - search_cost) < 1e-9
+
+    print(
+        f"{node_count:>8} nodes {edge_count:>8} edges | initial plan {initial_time * 1000:8.1f} ms | "
+        f"replan {replan_time / edits * 1000:8.2f} ms ({replan_expanded / edits:>8.0f} expanded) | "
+        f"UCS {search_time / edits * 1000:8.2f} ms ({search_expanded / edits:>8.0f} expanded)"
+    )
+
+
+def benchmark_oracle(node_count: int, edge_count: int, key_count: int = 2, query_count: int = 200) -> None:
+    """
+    Times building, saving and memory-mapping a distance oracle, and its
+    route lookups against uniform cost search, checking both agree.
+
+    Parameters
+    ----------
+    node_count : int
+        The number of nodes in the world.
+    edge_count : int
+        The number of connections in the world.
+    key_count : int, optional
+        The number of keys in the world.
+    query_count : int, optional
+        The number of random queries.
+    """
+
+    world: World = random_world(node_count, edge_count, key_count)
+    simulator: Simulator = Simulator(world)
+    rng: random.Random = random.Random(4)
+    queries: list[RouteQuery] = [
+        RouteQuery(*rng.sample(world.nodes, 2), rng.getrandbits(key_count)) for _ in range(query_count)
+    ]
+
+    start: float = time.perf_counter()
+    oracle: DistanceOracle = DistanceOracle.build(world)
+    build_time: float = time.perf_counter() - start
+    table_size: int = oracle.nbytes
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        path: Path = Path(directory) / "oracle.npy"
+        oracle.save(path)
+
+        start = time.perf_counter()
+        oracle = DistanceOracle.load(path, world)
+        load_time: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        routes: list[tuple] = [oracle.route(query.start, query.goal, query.keys) for query in queries]
+        lookup_time: float = time.perf_counter() - start
+
+        del oracle
+
+    start = time.perf_counter()
+    searches: list[tuple] = [
+        simulator._build_tree(sink=TreeSink(), start=query.start, goal=query.goal, keys=query.keys)
+        for query in queries
+    ]
+    search_time: float = time.perf_counter() - start
+
+    assert [cost for _, cost in routes] == [cost for _, cost, _ in searches]
+
+    print(
+        f"{node_count:>8} nodes {edge_count:>8} edges {key_count:>2} keys | build {build_time:7.2f} s | "
+        f"table {table_size / 2 ** 20:8.1f} MiB | load {load_time * 1000:5.2f} ms | "
+        f"lookup {lookup_time / query_count * 1e6:7.1f} us/query | UCS {search_time / query_count * 1e6:9.1f} us/query"
+    )
+
+
+def main() -> None:
+    """
+    Entry point for the benchmark.
+    """
+
+    edge_counts: list[int] = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000, 200_000]
+
+    for edge_count in edge_counts:
+        benchmark_neighbours(max(16, edge_count // 4), edge_count)
+
+    for edge_count in edge_counts:
+        benchmark_modes(max(16, edge_count // 4), edge_count, 4)
+
+    for side in (10, 20):
+        benchmark_memory(side, 4)
+
+    for edge_count in edge_counts:
+        benchmark_frontiers(max(16, edge_count // 4), edge_count)
+
+    for edge_count in edge_counts:
+        benchmark_replanning(max(16, edge_count // 4), edge_count)
+
+    # The table has a row per state and a column per node, so it grows
+    # with the square of the world.
+    for edge_count in edge_counts:
+        if edge_count <= 10_000:
+            benchmark_oracle(max(16, edge_count // 4), edge_count)
+
+    # Cold queries cost a whole search each, so larger worlds get fewer.
+    for edge_count in edge_counts:
+        benchmark_routes(max(16, edge_count // 4), edge_count, max(20, 2_000_000 // edge_count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from world import World
+from generators import random_world, grid_world, scale_free_world, corridor_world, keyed_grid
+from simulator import Simulator, IDA_CACHE_SIZE
+from search_mode import SearchMode
+from frontier import PeakFrontier
+from tree_sink import TreeSink
+
+
+# The modes run on every dungeon; IDA* is only run where it finishes.
+DEFAULT_MODES: tuple[SearchMode, ...] = (
+    SearchMode.UCS, SearchMode.A_STAR, SearchMode.A_STAR_KEYS, SearchMode.BIDIRECTIONAL
+)
+
+# A dungeon of the suite: its name, generator, arguments and the modes to run.
+Case = tuple[str, Callable[..., World], dict[str, Any], tuple[SearchMode, ...]]
+
+SUITE: list[Case] = [
+    ("grid-200x200", grid_world, {"width": 200, "height": 200, "key_count": 2}, DEFAULT_MODES),
+    ("grid-200x200-small", grid_world, {"width": 200, "height": 200, "key_count": 2, "costs": "small"}, DEFAULT_MODES),
+    ("random-50k", random_world, {"node_count": 50_000, "edge_count": 200_000, "key_count": 4}, DEFAULT_MODES),
+    ("scale-free-50k", scale_free_world, {"node_count": 50_000, "degree": 2, "key_count": 4}, DEFAULT_MODES),
+    ("corridor-100k", corridor_world, {"length": 100_000, "key_count": 8}, DEFAULT_MODES),
+    ("keyed-grid-20", keyed_grid, {"side": 20, "key_count": 4}, (*DEFAULT_MODES, SearchMode.IDA_STAR)),
+]
+
+
+def run_case(simulator: Simulator, mode: SearchMode) -> dict[str, Any]:
+    """
+    Measures one search mode on one world.
+
+    Parameters
+    ----------
+    simulator : Simulator
+        The simulator over the world.
+    mode : SearchMode
+        The algorithm to search with.
+
+    Returns
+    -------
+    dict[str, Any]
+        The cost found, the states expanded, the wall time, expansions per
+        second, the peak frontier size (``None`` for modes without a
+        frontier) and the peak memory allocated by the search.
+
+    Notes
+    -----
+    The search is timed on its own, then run again with the frontier and
+    memory instrumented, so neither slows the timed run. Any heuristic is
+    built beforehand and not timed.
+    """
+
+    world: World = simulator._world
+    if mode not in (SearchMode.UCS, SearchMode.BIDIRECTIONAL):
+        simulator._get_heuristic(mode, world.ids["G"])
+
+    start: float = time.perf_counter()
+    _, cost, tree_info = simulator._build_tree(mode, sink=TreeSink(), cache_size=IDA_CACHE_SIZE)
+    wall_time: float = time.perf_counter() - start
+
+    frontier: PeakFrontier | None = None
+    if mode not in (SearchMode.BIDIRECTIONAL, SearchMode.IDA_STAR):
+        frontier = PeakFrontier(simulator._make_frontier(mode))
+
+    tracemalloc.start()
+    simulator._build_tree(mode, frontier=frontier, sink=TreeSink(), cache_size=IDA_CACHE_SIZE)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "cost": cost,
+        "expanded": tree_info["expanded"],
+        "wall_time": wall_time,
+        "expansions_per_second": tree_info["expanded"] / wall_time if wall_time else None,
+        "peak_frontier": frontier.peak if frontier is not None else None,
+        "peak_memory": peak_memory,
+    }
+
+
+def run_suite(cases: list[Case]) -> list[dict[str, Any]]:
+    """
+    Runs every mode of every case, printing each result as it finishes.
+
+    Parameters
+    ----------
+    cases : list[Case]
+        The dungeons to run, as in ``SUITE``.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        One record per case and mode, with the dungeon's size and the
+        measurements of ``run_case``.
+    """
+
+    results: list[dict[str, Any]] = []
+
+    for name, generator, arguments, modes in cases:
+
+        world: World = generator(**arguments)
+        simulator: Simulator = Simulator(world)
+
+        for mode in modes:
+
+            # Bidirectional search only supports uniform costs.
+            if mode is SearchMode.BIDIRECTIONAL and world.min_cost != world.max_cost:
+                continue
+
+            result: dict[str, Any] = {
+                "case": name,
+                "generator": generator.__name__,
+                "arguments": arguments,
+                "nodes": len(world.nodes),
+                "connections": len(world.connections),
+                "keys": len(world.keys),
+                "mode": mode.value,
+                **run_case(simulator, mode),
+            }
+            results.append(result)
+
+            print(
+                f"{name:<20} {mode.value:<13} | cost {result['cost']:>8.6g} | expanded {result['expanded']:>9,} | "
+                f"{result['wall_time'] * 1000:9.1f} ms | {result['expansions_per_second'] or 0:>10,.0f} exp/s | "
+                f"frontier {result['peak_frontier'] if result['peak_frontier'] is not None else '-':>8} | "
+                f"peak {result['peak_memory'] / 2 ** 20:8.2f} MiB"
+            )
+
+    return results
+
+
+def compare(old_path: str | Path, new_path: str | Path) -> None:
+    """
+    Prints the wall time speed-up of every case and mode between two
+    result files.
+
+    Parameters
+    ----------
+    old_path : str | Path
+        The results of the baseline version.
+    new_path : str | Path
+        The results of the version compared against it.
+    """
+
+    old: dict[tuple[str, str], dict[str, Any]] = {
+        (result["case"], result["mode"]): result for result in json.loads(Path(old_path).read_text())["results"]
+    }
+
+    for result in json.loads(Path(new_path).read_text())["results"]:
+
+        baseline: dict[str, Any] | None = old.get((result["case"], result["mode"]))
+        if baseline is None:
+            continue
+
+        print(
+            f"{result['case']:<20} {result['mode']:<13} | "
+            f"{baseline['wall_time'] * 1000:9.1f} ms -> {result['wall_time'] * 1000:9.1f} ms "
+            f"(x{baseline['wall_time'] / result['wall_time']:5.2f}) | "
+            f"expanded {baseline['expanded']:>9,} -> {result['expanded']:>9,}"
+        )
+
+
+def main() -> None:
+    """
+    Entry point for the benchmark suite.
+    """
+
+    if len(sys.argv) == 4 and sys.argv[1] == "compare":
+        compare(sys.argv[2], sys.argv[3])
+        return
+
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python src/benchmark_suite.py <output.json> [label]")
+        print("       python src/benchmark_suite.py compare <old.json> <new.json>")
+        sys.exit(2)
+
+    results: list[dict[str, Any]] = run_suite(SUITE)
+
+    Path(sys.argv[1]).write_text(json.dumps({
+        "label": sys.argv[2] if len(sys.argv) == 3 else "",
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
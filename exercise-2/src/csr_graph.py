@@ -0,0 +1,482 @@
+import sys
+import time
+import numpy as np
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from numpy.typing import NDArray
+
+
+# Whether each byte value is whitespace to ``bytes.split``.
+_WHITESPACE: NDArray[np.bool_] = np.zeros(256, dtype=np.bool_)
+_WHITESPACE[list(b" \t\n\r\x0b\x0c")] = True
+
+
+class _Ids:
+    """
+    Name to ID lookup over a sorted array of encoded node names.
+    """
+
+    def __init__(self, names: NDArray[np.bytes_]) -> None:
+
+        self._names: NDArray[np.bytes_] = names
+
+    def __getitem__(self, name: str) -> int:
+
+        if name not in self:
+            raise KeyError(name)
+
+        return int(np.searchsorted(self._names, name.encode()))
+
+    def __contains__(self, name: str) -> bool:
+
+        encoded: bytes = name.encode()
+        index: int = int(np.searchsorted(self._names, encoded))
+        return index < len(self._names) and self._names[index] == encoded
+
+
+class _Nodes:
+    """
+    ID to name lookup over an array of encoded node names, decoding only the
+    names that are asked for.
+    """
+
+    def __init__(self, names: NDArray[np.bytes_]) -> None:
+
+        self._names: NDArray[np.bytes_] = names
+
+    def __getitem__(self, node: int) -> str:
+
+        return self._names[node].decode()
+
+    def __len__(self) -> int:
+
+        return len(self._names)
+
+
+class _KeyBits(dict):
+    """
+    Key mask of every node, storing only the nodes that hold keys.
+    """
+
+    def __missing__(self, node: int) -> int:
+
+        return 0
+
+
+class _Adjacency:
+    """
+    Adjacency view over CSR arrays, yielding the same ``(neighbour, key
+    mask needed, cost)`` triples as ``World.adjacency``.
+    """
+
+    def __init__(
+        self,
+        offsets: NDArray[np.int64],
+        targets: NDArray[np.int32],
+        locks: NDArray[np.int64],
+        costs: NDArray[np.number]
+    ) -> None:
+
+        self._offsets: NDArray[np.int64] = offsets
+        self._targets: NDArray[np.int32] = targets
+        self._locks: NDArray[np.int64] = locks
+        self._costs: NDArray[np.number] = costs
+
+    def __getitem__(self, node: int) -> list[tuple[int, int, float]]:
+
+        start, end = self._offsets[node:node + 2].tolist()
+        return list(zip(
+            self._targets[start:end].tolist(), self._locks[start:end].tolist(), self._costs[start:end].tolist()
+        ))
+
+    def __len__(self) -> int:
+
+        return len(self._offsets) - 1
+
+
+@dataclass(frozen=True)
+class CsrGraph:
+    """
+    A world stored as a compressed sparse row graph, for dungeons too large
+    for ``World``'s Python lists.
+
+    Node names are interned to their index in sorted order, so sorting
+    neighbours by ID also sorts them alphabetically. It offers the same
+    ``nodes``, ``keys``, ``ids``, ``key_bits`` and ``adjacency`` interface
+    as ``World``, so the simulator searches it unchanged.
+
+    Attributes
+    ----------
+    names : NDArray[np.bytes_]
+        The sorted, UTF-8 encoded node names; node ``i`` is ``names[i]``.
+    offsets : NDArray[np.int64]
+        Node ``i``'s connections are ``offsets[i]:offsets[i + 1]``.
+    targets : NDArray[np.int32]
+        The neighbour of every connection, in both directions.
+    locks : NDArray[np.int64]
+        The key mask needed by every connection.
+    costs : NDArray[np.number]
+        The cost of every connection, as integers if they are all whole.
+    keys : list[str]
+        The nodes which contain a key. Key ``i`` is bit ``i``.
+    """
+
+    names: NDArray[np.bytes_]
+    offsets: NDArray[np.int64]
+    targets: NDArray[np.int32]
+    locks: NDArray[np.int64]
+    costs: NDArray[np.number]
+    keys: list[str]
+
+    ids: _Ids = field(init=False, repr=False, compare=False)
+    key_bits: _KeyBits = field(init=False, repr=False, compare=False)
+    adjacency: _Adjacency = field(init=False, repr=False, compare=False)
+    min_cost: float = field(init=False, repr=False, compare=False)
+    max_cost: float = field(init=False, repr=False, compare=False)
+    integer_costs: bool = field(init=False, repr=False, compare=False)
+    binary_costs: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+
+        ids: _Ids = _Ids(self.names)
+
+        key_bits: _KeyBits = _KeyBits()
+        for bit, key in enumerate(self.keys):
+            key_bits[ids[key]] = key_bits[ids[key]] | (1 << bit)
+
+        # The dataclass is frozen, so the derived fields are set directly.
+        object.__setattr__(self, "ids", ids)
+        object.__setattr__(self, "key_bits", key_bits)
+        object.__setattr__(self, "adjacency", _Adjacency(self.offsets, self.targets, self.locks, self.costs))
+
+        # Summarises the costs, so the search can pick a suitable frontier.
+        max_cost: float = self.costs.max().item() if len(self.costs) else 1
+        object.__setattr__(self, "min_cost", self.costs.min().item() if len(self.costs) else 1)
+        object.__setattr__(self, "max_cost", max_cost)
+        object.__setattr__(self, "integer_costs", self.costs.dtype.kind in "iu")
+        object.__setattr__(self, "binary_costs", bool(np.all((self.costs == 0) | (self.costs == max_cost))))
+
+    @property
+    def nodes(self) -> _Nodes:
+        """
+        The node names, in ID order.
+        """
+
+        return _Nodes(self.names)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The memory used by the graph's arrays, in bytes.
+        """
+
+        return self.names.nbytes + self.offsets.nbytes + self.targets.nbytes + self.locks.nbytes + self.costs.nbytes
+
+    @staticmethod
+    def _line_lengths(text: bytes) -> NDArray[np.int64]:
+        """
+        Counts the tokens on every non-blank line of a block of text, in
+        vectorised form.
+
+        Parameters
+        ----------
+        text : bytes
+            The text, whose tokens are separated by whitespace.
+
+        Returns
+        -------
+        NDArray[np.int64]
+            The number of tokens on each line holding any, in order.
+        """
+
+        data: NDArray[np.uint8] = np.frombuffer(text, dtype=np.uint8)
+        space: NDArray[np.bool_] = _WHITESPACE[data]
+
+        # A token starts wherever a non-space follows a space or the start.
+        starts: NDArray[np.bool_] = ~space
+        starts[1:] &= space[:-1]
+
+        lines: NDArray[np.int64] = np.cumsum(data == ord("\n"))
+        lengths: NDArray[np.int64] = np.bincount(lines[starts])
+
+        return lengths[lengths > 0]
+
+    @staticmethod
+    def _read_chunks(path: str | Path, chunk_size: int) -> Iterator[NDArray[np.bytes_]]:
+        """
+        Streams the tokens of an edge-list file, a whole number of lines at a
+        time.
+
+        Parameters
+        ----------
+        path : str | Path
+            The edge-list file.
+        chunk_size : int
+            The approximate number of bytes read at a time.
+
+        Returns
+        -------
+        Iterator[NDArray[np.bytes_]]
+            The ``(lines, columns)`` tokens of each chunk. A chunk has three
+            columns if none of its lines gives a cost, and four otherwise,
+            with a cost of 1 filled in for the lines that omit it.
+        """
+
+        with open(path, "rb") as file:
+
+            remainder: bytes = b""
+
+            while True:
+
+                block: bytes = file.read(chunk_size)
+                text: bytes = remainder + block
+
+                # Holds back the last partial line until the next block.
+                cut: int = text.rfind(b"\n") + 1 if block else len(text)
+                text, remainder = text[:cut], text[cut:]
+
+                # Only pays for splitting lines if there are comments.
+                if b"#" in text:
+                    text = b"\n".join(line for line in text.splitlines() if not line.lstrip().startswith(b"#"))
+
+                # Bytes sort far faster than NumPy's 4-byte unicode strings.
+                tokens: NDArray[np.bytes_] = np.array(text.split())
+
+                if len(tokens):
+
+                    lengths: NDArray[np.int64] = CsrGraph._line_lengths(text)
+
+                    if not np.all((lengths == 3) | (lengths == 4)):
+                        raise ValueError(f"Every line of {path} needs either three or four columns.")
+
+                    if np.all(lengths == lengths[0]):
+                        yield tokens.reshape(-1, int(lengths[0]))
+
+                    # Mixes lines with and without costs, so pads the costs.
+                    else:
+                        first: NDArray[np.int64] = np.cumsum(lengths) - lengths
+                        padded: NDArray[np.bytes_] = np.full((len(lengths), 4), b"1", dtype=tokens.dtype)
+                        padded[:, :3] = tokens[first[:, None] + np.arange(3)]
+                        costed: NDArray[np.bool_] = lengths == 4
+                        padded[costed, 3] = tokens[first[costed] + 3]
+                        yield padded
+
+                if not block:
+                    return
+
+    @staticmethod
+    def _intern(tokens: NDArray[np.bytes_]) -> tuple[NDArray[np.bytes_], NDArray[np.int64]]:
+        """
+        Finds the distinct names in an array, like ``np.unique``, but
+        sorting them as big-endian 64-bit words instead of as strings,
+        which is several times faster.
+
+        Parameters
+        ----------
+        tokens : NDArray[np.bytes_]
+            The names to intern.
+
+        Returns
+        -------
+        tuple[NDArray[np.bytes_], NDArray[np.int64]]
+            The sorted distinct names, and the index of each token's name.
+        """
+
+        # Null padding sorts first, so word order matches byte string order.
+        words: int = -(-tokens.itemsize // 8)
+        padded: NDArray[np.bytes_] = tokens.astype(f"S{words * 8}")
+        keys: NDArray[np.uint64] = padded.view(">u8").reshape(-1, words)
+
+        order: NDArray[np.int_] = np.argsort(keys[:, 0]) if words == 1 else np.lexsort(keys.T[::-1])
+        ordered: NDArray[np.uint64] = keys[order]
+
+        # Marks where each new name starts in sorted order.
+        starts: NDArray[np.bool_] = np.ones(len(ordered), dtype=np.bool_)
+        starts[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+
+        inverse: NDArray[np.int64] = np.empty(len(tokens), dtype=np.int64)
+        inverse[order] = np.cumsum(starts) - 1
+
+        return padded[order[starts]], inverse
+
+    @classmethod
+    def from_edge_list(cls, path: str | Path, chunk_size: int = 1 << 24) -> "CsrGraph":
+        """
+        Loads an edge-list file.
+
+        Every line holds a connection as ``<node> <node> <key> [<cost>]``,
+        where ``<key>`` is the node holding the key that opens it, or ``-``
+        if it isn't locked. The cost is 1 if omitted. Lines starting with
+        ``#`` are skipped.
+
+        Parameters
+        ----------
+        path : str | Path
+            The edge-list file.
+        chunk_size : int, optional
+            The approximate number of bytes parsed at a time.
+
+        Returns
+        -------
+        CsrGraph
+            The loaded graph.
+        """
+
+        # Interns each chunk's names on its own, keeping only compact IDs.
+        chunk_names: list[NDArray[np.bytes_]] = []
+        chunk_ids: list[NDArray[np.int32]] = []
+        chunk_costs: list[NDArray[np.float64] | None] = []
+
+        for tokens in cls._read_chunks(path, chunk_size):
+
+            names, inverse = cls._intern(tokens[:, :3].ravel())
+            chunk_names.append(names)
+            chunk_ids.append(inverse.reshape(-1, 3).astype(np.int32))
+
+            chunk_costs.append(tokens[:, 3].astype(np.float64) if tokens.shape[1] == 4 else None)
+
+        if not chunk_names:
+            raise ValueError(f"{path} holds no connections.")
+
+        # Merges the chunk dictionaries, remapping every chunk to global IDs.
+        width: int = max(names.itemsize for names in chunk_names)
+        all_names, remap = cls._intern(np.concatenate([names.astype(f"S{width}") for names in chunk_names]))
+        remaps: list[NDArray[np.int64]] = np.split(remap, np.cumsum([len(names) for names in chunk_names])[:-1])
+        edges: NDArray[np.int32] = np.concatenate([
+            remap.astype(np.int32)[ids] for remap, ids in zip(remaps, chunk_ids)
+        ])
+
+        # The unlock marker isn't a node, so it is dropped from the names.
+        marker: int = int(np.searchsorted(all_names, b"-"))
+        has_marker: bool = marker < len(all_names) and all_names[marker] == b"-"
+        if has_marker:
+            all_names = np.delete(all_names, marker)
+            locked: NDArray[np.bool_] = edges[:, 2] != marker
+            edges[:, :3] -= (edges[:, :3] > marker)
+        else:
+            locked = np.ones(len(edges), dtype=np.bool_)
+
+        # Numbers the keys in name order.
+        key_ids: NDArray[np.int32] = np.unique(edges[locked, 2])
+        if len(key_ids) > 63:
+            raise ValueError(f"At most 63 keys are supported, not {len(key_ids)}.")
+
+        edge_locks: NDArray[np.int64] = np.zeros(len(edges), dtype=np.int64)
+        edge_locks[locked] = np.left_shift(1, np.searchsorted(key_ids, edges[locked, 2])).astype(np.int64)
+
+        # Keeps whole-number costs as integers, so sums stay exact.
+        # Chunks without costs only cost 1 each, even next to chunks with them.
+        edge_costs: NDArray[np.number] = np.ones(len(edges), dtype=np.int64)
+        if any(costs is not None for costs in chunk_costs):
+            edge_costs = np.concatenate([
+                costs if costs is not None else np.ones(len(ids), dtype=np.float64)
+                for costs, ids in zip(chunk_costs, chunk_ids)
+            ])
+        if np.any(edge_costs < 0):
+            raise ValueError(f"{path} holds a connection with a negative cost.")
+        if edge_costs.dtype.kind == "f" and np.all(edge_costs == np.round(edge_costs)):
+            edge_costs = edge_costs.astype(np.int64)
+
+        # Stores every connection in both directions, sorted by node and then
+        # by neighbour.
+        sources: NDArray[np.int32] = np.concatenate((edges[:, 0], edges[:, 1]))
+        targets: NDArray[np.int32] = np.concatenate((edges[:, 1], edges[:, 0]))
+        locks: NDArray[np.int64] = np.concatenate((edge_locks, edge_locks))
+        costs: NDArray[np.number] = np.concatenate((edge_costs, edge_costs))
+        order: NDArray[np.int_] = np.argsort(sources.astype(np.int64) * len(all_names) + targets)
+
+        offsets: NDArray[np.int64] = np.zeros(len(all_names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(all_names)), out=offsets[1:])
+
+        return cls(
+            names=all_names,
+            offsets=offsets,
+            targets=targets[order],
+            locks=locks[order],
+            costs=costs[order],
+            keys=[key.decode() for key in all_names[key_ids].tolist()],
+        )
+
+    def distances(self, source: int, blocked: int = 0) -> NDArray[np.int64]:
+        """
+        Gets the number of connections from a node to every other node,
+        treating every door as open.
+
+        Parameters
+        ----------
+        source : int
+            The ID of the node to measure from.
+        blocked : int, optional
+            A key mask; connections needing any of these keys are skipped.
+
+        Returns
+        -------
+        NDArray[np.int64]
+            The distance to every node, ``-1`` if it cannot be reached.
+        """
+
+        distances: NDArray[np.int64] = np.full(len(self.names), -1, dtype=np.int64)
+        distances[source] = 0
+        layer: NDArray[np.int_] = np.array([source])
+        depth: int = 0
+
+        # Expands one breadth-first layer at a time, gathering every
+        # connection of the layer at once.
+        while len(layer):
+
+            starts: NDArray[np.int64] = self.offsets[layer]
+            counts: NDArray[np.int64] = self.offsets[layer + 1] - starts
+            edges: NDArray[np.int64] = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+            if blocked:
+                edges = edges[(self.locks[edges] & blocked) == 0]
+
+            neighbours: NDArray[np.int32] = self.targets[edges]
+            layer = np.unique(neighbours[distances[neighbours] < 0])
+
+            depth += 1
+            distances[layer] = depth
+
+        return distances
+
+
+def main() -> None:
+    """
+    Loads an edge-list file, reporting the load time and memory used, and
+    searches it from S to G.
+    """
+
+    # Imported here, as the simulator itself imports this module.
+    from simulator import Simulator, IDA_CACHE_SIZE
+    from search_mode import SearchMode
+    from tree_sink import TreeSink
+
+    if len(sys.argv) not in (2, 3, 4):
+        print("Usage: python src/csr_graph.py <edge list> [search mode] [IDA* cache size]")
+        sys.exit(2)
+
+    start: float = time.perf_counter()
+    graph: CsrGraph = CsrGraph.from_edge_list(sys.argv[1])
+    load_time: float = time.perf_counter() - start
+
+    print(
+        f"Loaded {len(graph.names):,} nodes, {len(graph.targets) // 2:,} connections and "
+        f"{len(graph.keys)} keys in {load_time:.2f} s ({graph.nbytes / 2 ** 20:,.1f} MiB)."
+    )
+
+    mode: SearchMode = SearchMode(sys.argv[2]) if len(sys.argv) >= 3 else SearchMode.UCS
+    cache_size: int = int(sys.argv[3]) if len(sys.argv) == 4 else IDA_CACHE_SIZE
+    simulator: Simulator = Simulator(graph)
+
+    # Discards the search tree, which could outgrow the graph itself.
+    start = time.perf_counter()
+    path, cost, tree_info = simulator._build_tree(mode, sink=TreeSink(), cache_size=cache_size)
+    search_time: float = time.perf_counter() - start
+
+    print(f"{mode.value}: cost {cost}, {tree_info['expanded']:,} states expanded in {search_time:.2f} s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import numpy as np
+
+from collections.abc import Sequence
+
+from world import World
+from csr_graph import CsrGraph
+
+
+class DistanceHeuristic:
+    """
+    Admissible estimate of the cost from a state to the goal, built from
+    breadth-first distances with every door open.
+
+    If ``key_aware`` is set, the nodes that can only reach the goal through
+    a key's doors are found once per key, and a state in one of them
+    missing that key is also bounded by the distance to the key plus the
+    distance from the key to the goal. Distances count connections, so they
+    are scaled by the cheapest connection's cost.
+
+    The heuristic only depends on the goal, so one serves every start.
+    """
+
+    def __init__(self, world: World | CsrGraph, goal: int, key_aware: bool = False) -> None:
+
+        self._unit: float = world.min_cost
+        self._goal_distances: Sequence[int] = world.distances(goal)
+        self._detours: list[tuple[int, Sequence[int], Sequence[int], int]] = []
+
+        if key_aware:
+
+            reachable: int = np.count_nonzero(np.asarray(self._goal_distances) >= 0)
+
+            for bit, key in enumerate(world.keys):
+
+                # The key is needed from any node that reaches the goal only
+                # through its doors; keys no node needs are skipped.
+                without_key: Sequence[int] = world.distances(goal, blocked=1 << bit)
+                if np.count_nonzero(np.asarray(without_key) >= 0) == reachable:
+                    continue
+
+                key_node: int = world.ids[key]
+                self._detours.append((
+                    1 << bit, without_key, world.distances(key_node), self._goal_distances[key_node]
+                ))
+
+    def estimate(self, node: int, keys: int) -> float:
+        """
+        Estimates the cost from a state to the goal.
+
+        Parameters
+        ----------
+        node : int
+            The ID of the state's node.
+        keys : int
+            The keys held in the state.
+
+        Returns
+        -------
+        float
+            A lower bound on the cost to the goal, ``-1`` if the goal can't
+            be reached from the node at all.
+        """
+
+        estimate: int = self._goal_distances[node]
+
+        if estimate < 0:
+            return -1
+
+        for bit, without_key, key_distances, key_to_goal in self._detours:
+
+            if keys & bit or without_key[node] >= 0:
+                continue
+
+            # The goal is unreachable if the missing key is.
+            if key_distances[node] < 0 or key_to_goal < 0:
+                return -1
+
+            estimate = max(estimate, key_distances[node] + key_to_goal)
+
+        return estimate * self._unit
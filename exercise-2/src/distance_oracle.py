@@ -0,0 +1,227 @@
+import numpy as np
+
+from pathlib import Path
+from numpy.typing import NDArray
+
+from world import World
+from csr_graph import CsrGraph
+from state import State
+
+
+# The most keys a table is built for, as it has a row for every key mask.
+MAX_ORACLE_KEYS: int = 8
+
+
+class DistanceOracle:
+    """
+    Precomputed distance and next-hop table over every ``(node, keys)``
+    state and goal node of a world, so routes are looked up rather than
+    searched.
+
+    Row ``node << len(keys) | keys`` holds, for every goal node, the number
+    of connections from that state to the goal and the neighbour to move
+    to first, both ``-1`` if the goal can't be reached. A route is then
+    followed one lookup per connection. The table is saved as a single
+    ``.npy`` file and memory-mapped when loaded, so only the rows a query
+    touches are read from disk.
+    """
+
+    def __init__(self, world: World | CsrGraph, table: NDArray) -> None:
+
+        self._world: World | CsrGraph = world
+        self._table: NDArray = table
+        self._key_count: int = len(world.keys)
+
+        if table.shape != (len(world.nodes) << self._key_count, len(world.nodes)):
+            raise ValueError("The table was not built for this world.")
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The size of the table, in bytes.
+        """
+
+        return self._table.nbytes
+
+    @staticmethod
+    def _gather(offsets: NDArray[np.int64], values: NDArray[np.int64], rows: NDArray[np.int64]) -> NDArray[np.int64]:
+        """
+        Concatenates the CSR rows of a batch of states.
+
+        Parameters
+        ----------
+        offsets : NDArray[np.int64]
+            Where every state's row starts in ``values``.
+        values : NDArray[np.int64]
+            Every row, one after the other.
+        rows : NDArray[np.int64]
+            The states whose rows are gathered.
+
+        Returns
+        -------
+        NDArray[np.int64]
+            The values of every row, in order.
+        """
+
+        starts: NDArray[np.int64] = offsets[rows]
+        counts: NDArray[np.int64] = offsets[rows + 1] - starts
+        return values[np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())]
+
+    @classmethod
+    def build(cls, world: World | CsrGraph) -> "DistanceOracle":
+        """
+        Builds the table with a breadth-first search backwards from every
+        goal node, over the states of every key mask at once.
+
+        Parameters
+        ----------
+        world : World | CsrGraph
+            The world to build the table for.
+
+        Returns
+        -------
+        DistanceOracle
+            The oracle over the new table.
+
+        Raises
+        ------
+        ValueError
+            If the connections don't all cost the same, or the world has
+            more than ``MAX_ORACLE_KEYS`` keys.
+        """
+
+        if world.min_cost != world.max_cost:
+            raise ValueError("The distance oracle needs every connection to cost the same.")
+
+        key_count: int = len(world.keys)
+        if key_count > MAX_ORACLE_KEYS:
+            raise ValueError(f"The distance oracle supports up to {MAX_ORACLE_KEYS} keys.")
+
+        node_count: int = len(world.nodes)
+        state_count: int = node_count << key_count
+        key_bits: NDArray[np.int64] = np.array([world.key_bits[node] for node in range(node_count)], dtype=np.int64)
+
+        # Lists every directed connection, in each node's neighbour order.
+        if isinstance(world, CsrGraph):
+            sources: NDArray[np.int64] = np.repeat(np.arange(node_count), np.diff(world.offsets))
+            targets: NDArray[np.int64] = world.targets.astype(np.int64)
+            locks: NDArray[np.int64] = world.locks.astype(np.int64)
+        else:
+            connections: list[tuple[int, int, int]] = [
+                (node, neighbour, lock) for node in range(node_count) for neighbour, lock, _ in world.adjacency[node]
+            ]
+            sources, targets, locks = np.array(connections, dtype=np.int64).reshape(-1, 3).T
+
+        # Expands them into every move between states the locks allow,
+        # following ``Simulator._get_neighbours``.
+        masks: NDArray[np.int64] = np.arange(1 << key_count, dtype=np.int64)
+        edges, keys = np.nonzero((locks[:, None] & ~masks[None, :]) == 0)
+        move_sources: NDArray[np.int64] = sources[edges] << key_count | keys
+        move_targets: NDArray[np.int64] = targets[edges] << key_count | (keys | key_bits[targets[edges]])
+
+        order: NDArray[np.int64] = np.argsort(move_sources, kind="stable")
+        move_sources, move_targets = move_sources[order], move_targets[order]
+
+        # Indexes the moves by the state they lead to, for the backward search.
+        order = np.argsort(move_targets, kind="stable")
+        predecessors: NDArray[np.int64] = move_sources[order]
+        offsets: NDArray[np.int64] = np.concatenate(([0], np.cumsum(np.bincount(move_targets, minlength=state_count))))
+
+        distance_type: type = np.int16 if state_count < np.iinfo(np.int16).max else np.int32
+        next_type: type = np.int16 if node_count < np.iinfo(np.int16).max else np.int32
+        table: NDArray = np.empty((state_count, node_count), dtype=[("distance", distance_type), ("next", next_type)])
+
+        for goal in range(node_count):
+
+            # Every state at the goal is done, whatever keys it holds.
+            distances: NDArray[np.int64] = np.full(state_count, -1, dtype=np.int64)
+            layer: NDArray[np.int64] = np.arange(goal << key_count, (goal + 1) << key_count)
+            distances[layer] = 0
+            depth: int = 0
+
+            while len(layer):
+                previous: NDArray[np.int64] = cls._gather(offsets, predecessors, layer)
+                layer = np.unique(previous[distances[previous] < 0])
+                depth += 1
+                distances[layer] = depth
+
+            # The first move one step closer to the goal is the next hop.
+            closer: NDArray[np.bool_] = (distances[move_targets] == distances[move_sources] - 1) & (distances[move_sources] > 0)
+            states, first = np.unique(move_sources[closer], return_index=True)
+
+            next_hops: NDArray[np.int64] = np.full(state_count, -1, dtype=np.int64)
+            next_hops[states] = move_targets[closer][first] >> key_count
+
+            table["distance"][:, goal] = distances
+            table["next"][:, goal] = next_hops
+
+        return cls(world, table)
+
+    def save(self, path: str | Path) -> None:
+        """
+        Saves the table to an ``.npy`` file.
+
+        Parameters
+        ----------
+        path : str | Path
+            The path to save the table to.
+        """
+
+        np.save(path, self._table)
+
+    @classmethod
+    def load(cls, path: str | Path, world: World | CsrGraph) -> "DistanceOracle":
+        """
+        Memory-maps a table saved by ``save``.
+
+        Parameters
+        ----------
+        path : str | Path
+            The path to the table.
+        world : World | CsrGraph
+            The world the table was built for.
+
+        Returns
+        -------
+        DistanceOracle
+            The oracle over the mapped table.
+        """
+
+        return cls(world, np.load(path, mmap_mode="r"))
+
+    def route(self, start: str, goal: str, keys: int = 0) -> tuple[list[State] | None, float]:
+        """
+        Follows the next hops from a state to a goal.
+
+        Parameters
+        ----------
+        start : str
+            The node the explorer starts in.
+        goal : str
+            The node the explorer must reach.
+        keys : int, optional
+            The keys the explorer starts with, besides any in ``start``.
+
+        Returns
+        -------
+        tuple[list[State] | None, float]
+            The path to the goal (list of states) or None if no path found,
+            and its total cost.
+        """
+
+        world: World | CsrGraph = self._world
+        goal_node: int = world.ids[goal]
+        state: State = State(world.ids[start], keys | world.key_bits[world.ids[start]])
+
+        distance, _ = self._table[state.node << self._key_count | state.keys, goal_node].tolist()
+        if distance < 0:
+            return None, -1
+
+        path: list[State] = [state]
+
+        while state.node != goal_node:
+            _, next_hop = self._table[state.node << self._key_count | state.keys, goal_node].tolist()
+            state = State(next_hop, state.keys | world.key_bits[next_hop])
+            path.append(state)
+
+        return path, distance * world.min_cost
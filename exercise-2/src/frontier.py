@@ -0,0 +1,185 @@
+import heapq
+
+from collections import deque
+from itertools import count
+from typing import Protocol
+
+from state import State
+
+
+class Frontier(Protocol):
+    """
+    The queue of states waiting to be expanded, ordered by priority.
+
+    States may be pushed again when a cheaper path to them is found, so
+    the search skips any popped entry whose cost is out of date.
+    """
+
+    def push(self, priority: float, cost: float, state: State) -> None:
+        """
+        Adds a state to the frontier.
+
+        Parameters
+        ----------
+        priority : float
+            The state's position in the expansion order.
+        cost : float
+            The cost of the path to the state.
+        state : State
+            The state to add.
+        """
+
+        ...
+
+    def pop(self) -> tuple[float, State]:
+        """
+        Removes the state with the lowest priority.
+
+        Returns
+        -------
+        tuple[float, State]
+            The cost of the path to the state, and the state.
+        """
+
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+
+class HeapFrontier(Frontier):
+    """
+    Binary heap frontier, for any non-negative costs and for A*.
+    """
+
+    def __init__(self) -> None:
+
+        # Entries are (priority, tie-break, cost, state); the counter keeps
+        # ties in insertion order without comparing states.
+        self._heap: list[tuple[float, int, float, State]] = []
+        self._counter = count()
+
+    def push(self, priority: float, cost: float, state: State) -> None:
+
+        heapq.heappush(self._heap, (priority, next(self._counter), cost, state))
+
+    def pop(self) -> tuple[float, State]:
+
+        _, _, cost, state = heapq.heappop(self._heap)
+        return cost, state
+
+    def __len__(self) -> int:
+
+        return len(self._heap)
+
+
+class FifoFrontier(Frontier):
+    """
+    First-in first-out frontier, i.e. breadth-first search, for worlds where
+    every connection costs the same. Costs then never decrease along the
+    queue, so it pops in priority order without comparing anything.
+    """
+
+    def __init__(self) -> None:
+
+        self._queue: deque[tuple[float, State]] = deque()
+
+    def push(self, priority: float, cost: float, state: State) -> None:
+
+        self._queue.append((cost, state))
+
+    def pop(self) -> tuple[float, State]:
+
+        return self._queue.popleft()
+
+    def __len__(self) -> int:
+
+        return len(self._queue)
+
+
+class ZeroOneFrontier(Frontier):
+    """
+    Double-ended frontier for 0-1 BFS, for worlds where every connection
+    costs either 0 or the same positive amount. States reached for free go
+    to the front, so the queue stays ordered by priority.
+    """
+
+    def __init__(self) -> None:
+
+        self._queue: deque[tuple[float, State]] = deque()
+        self._current: float = 0
+
+    def push(self, priority: float, cost: float, state: State) -> None:
+
+        if priority <= self._current:
+            self._queue.appendleft((cost, state))
+        else:
+            self._queue.append((cost, state))
+
+    def pop(self) -> tuple[float, State]:
+
+        cost, state = self._queue.popleft()
+        self._current = cost
+        return cost, state
+
+    def __len__(self) -> int:
+
+        return len(self._queue)
+
+
+class BucketFrontier(Frontier):
+    """
+    Circular bucket queue (Dial's algorithm), for small whole-number costs.
+    Every pending priority lies within ``max_cost`` of the current one, so
+    ``max_cost + 1`` buckets, reused in a cycle, hold the whole frontier.
+    """
+
+    def __init__(self, max_cost: int) -> None:
+
+        self._buckets: list[deque[tuple[float, State]]] = [deque() for _ in range(max_cost + 1)]
+        self._current: int = 0
+        self._size: int = 0
+
+    def push(self, priority: float, cost: float, state: State) -> None:
+
+        self._buckets[int(priority) % len(self._buckets)].append((cost, state))
+        self._size += 1
+
+    def pop(self) -> tuple[float, State]:
+
+        # Moves on to the next bucket holding anything.
+        bucket: deque[tuple[float, State]] = self._buckets[self._current % len(self._buckets)]
+        while not bucket:
+            self._current += 1
+            bucket = self._buckets[self._current % len(self._buckets)]
+
+        self._size -= 1
+        return bucket.popleft()
+
+    def __len__(self) -> int:
+
+        return self._size
+
+
+class PeakFrontier(Frontier):
+    """
+    Wraps another frontier, recording the most states it ever held.
+    """
+
+    def __init__(self, frontier: Frontier) -> None:
+
+        self._frontier: Frontier = frontier
+        self.peak: int = 0
+
+    def push(self, priority: float, cost: float, state: State) -> None:
+
+        self._frontier.push(priority, cost, state)
+        self.peak = max(self.peak, len(self._frontier))
+
+    def pop(self) -> tuple[float, State]:
+
+        return self._frontier.pop()
+
+    def __len__(self) -> int:
+
+        return len(self._frontier)
@@ -0,0 +1,297 @@
+import random
+
+from collections.abc import Callable
+
+from world import World
+
+
+# Connection cost generators, one for each kind of frontier.
+COSTS: dict[str, Callable[[random.Random], float]] = {
+    "uniform": lambda rng: 1,
+    "zero-one": lambda rng: rng.choice((0, 1)),
+    "small": lambda rng: rng.randint(1, 9),
+    "float": lambda rng: rng.uniform(1, 9),
+}
+
+
+def _lock_world(
+    rng: random.Random,
+    nodes: list[str],
+    connections: list[tuple[str, str, float]],
+    key_candidates: list[str],
+    key_count: int,
+    lock_fraction: float
+) -> World:
+    """
+    Places the keys in random nodes and locks an evenly spread share of the
+    connections, each with a random key.
+
+    Parameters
+    ----------
+    rng : random.Random
+        The random generator.
+    nodes : list[str]
+        The nodes of the world.
+    connections : list[tuple[str, str, float]]
+        The connections of the world, with their costs.
+    key_candidates : list[str]
+        The nodes a key may be placed in.
+    key_count : int
+        The number of keys.
+    lock_fraction : float
+        The share of connections locked.
+
+    Returns
+    -------
+    World
+        The world.
+    """
+
+    keys: list[str] = rng.sample(key_candidates, key_count)
+    step: int = max(1, round(1 / lock_fraction)) if lock_fraction else 0
+
+    return World(
+        nodes=nodes,
+        connections=connections,
+        locked_connections={(a, b): rng.choice(keys) for a, b, _ in connections[::step]} if keys and step else {},
+        keys=keys,
+    )
+
+
+def random_world(
+    node_count: int,
+    edge_count: int,
+    key_count: int = 1,
+    costs: str = "uniform",
+    seed: int = 0,
+    lock_fraction: float = 0.01
+) -> World:
+    """
+    Creates a random sparse world.
+
+    Parameters
+    ----------
+    node_count : int
+        The number of nodes, including ``S`` and ``G``.
+    edge_count : int
+        The number of connections.
+    key_count : int, optional
+        The number of keys.
+    costs : str, optional
+        The kind of connection costs, one of ``COSTS``.
+    seed : int, optional
+        The seed of the random generator.
+    lock_fraction : float, optional
+        The share of connections locked.
+
+    Returns
+    -------
+    World
+        A world whose connections are picked uniformly at random, with an
+        evenly spread share locked by random keys and the keys in random
+        nodes.
+    """
+
+    rng: random.Random = random.Random(seed)
+    nodes: list[str] = ["S", "G", *(f"N{i}" for i in range(node_count - 2))]
+
+    connections: list[tuple[str, str, float]] = []
+    while len(connections) < edge_count:
+        a, b = rng.sample(nodes, 2)
+        connections.append((a, b, COSTS[costs](rng)))
+
+    return _lock_world(rng, nodes, connections, nodes, key_count, lock_fraction)
+
+
+def grid_world(
+    width: int,
+    height: int,
+    key_count: int = 1,
+    costs: str = "uniform",
+    seed: int = 0,
+    lock_fraction: float = 0.01
+) -> World:
+    """
+    Creates a rectangular grid world.
+
+    Parameters
+    ----------
+    width : int
+        The number of nodes along each row.
+    height : int
+        The number of nodes along each column.
+    key_count : int, optional
+        The number of keys.
+    costs : str, optional
+        The kind of connection costs, one of ``COSTS``.
+    seed : int, optional
+        The seed of the random generator.
+    lock_fraction : float, optional
+        The share of connections locked.
+
+    Returns
+    -------
+    World
+        A grid connecting every node to its four neighbours, with ``S`` and
+        ``G`` in opposite corners.
+    """
+
+    rng: random.Random = random.Random(seed)
+
+    names: dict[tuple[int, int], str] = {(x, y): f"N{x}_{y}" for x in range(width) for y in range(height)}
+    names[0, 0], names[width - 1, height - 1] = "S", "G"
+
+    nodes: list[str] = list(names.values())
+    connections: list[tuple[str, str, float]] = [
+        (names[x, y], names[x + dx, y + dy], COSTS[costs](rng))
+        for x in range(width) for y in range(height) for dx, dy in ((1, 0), (0, 1))
+        if x + dx < width and y + dy < height
+    ]
+
+    return _lock_world(rng, nodes, connections, nodes[1:-1], key_count, lock_fraction)
+
+
+def scale_free_world(
+    node_count: int,
+    degree: int = 2,
+    key_count: int = 1,
+    costs: str = "uniform",
+    seed: int = 0,
+    lock_fraction: float = 0.01
+) -> World:
+    """
+    Creates a scale-free world by preferential attachment (Barabási-Albert),
+    so a few hub nodes have most of the connections.
+
+    Parameters
+    ----------
+    node_count : int
+        The number of nodes, including ``S`` and ``G``.
+    degree : int, optional
+        The number of connections every new node makes.
+    key_count : int, optional
+        The number of keys.
+    costs : str, optional
+        The kind of connection costs, one of ``COSTS``.
+    seed : int, optional
+        The seed of the random generator.
+    lock_fraction : float, optional
+        The share of connections locked.
+
+    Returns
+    -------
+    World
+        A world where ``S`` is the oldest hub and ``G`` the newest node.
+    """
+
+    rng: random.Random = random.Random(seed)
+    nodes: list[str] = ["S", *(f"N{i}" for i in range(node_count - 2)), "G"]
+
+    # Starts from a fully connected core.
+    connections: list[tuple[str, str, float]] = [
+        (nodes[a], nodes[b], COSTS[costs](rng)) for a in range(degree + 1) for b in range(a)
+    ]
+
+    # Every connection's ends, so picking from it favours well-connected nodes.
+    ends: list[str] = [node for a, b, _ in connections for node in (a, b)]
+
+    for node in nodes[degree + 1:]:
+
+        targets: set[str] = set()
+        while len(targets) < degree:
+            targets.add(rng.choice(ends))
+
+        for target in sorted(targets):
+            connections.append((node, target, COSTS[costs](rng)))
+            ends += (node, target)
+
+    return _lock_world(rng, nodes, connections, nodes[1:-1], key_count, lock_fraction)
+
+
+def corridor_world(length: int, key_count: int = 1, costs: str = "uniform", seed: int = 0) -> World:
+    """
+    Creates a long corridor from ``S`` to ``G``, split by locked doors
+    whose keys lie in side rooms before them.
+
+    Parameters
+    ----------
+    length : int
+        The number of corridor nodes, including ``S`` and ``G``.
+    key_count : int, optional
+        The number of doors, and keys.
+    costs : str, optional
+        The kind of connection costs, one of ``COSTS``.
+    seed : int, optional
+        The seed of the random generator.
+
+    Returns
+    -------
+    World
+        A corridor with evenly spaced doors, where the key to door ``i``
+        hangs off a random corridor node before it, so routes are deep and
+        the explorer has to double back for every key.
+    """
+
+    rng: random.Random = random.Random(seed)
+    corridor: list[str] = ["S", *(f"C{i}" for i in range(length - 2)), "G"]
+    keys: list[str] = [f"K{i}" for i in range(key_count)]
+
+    connections: list[tuple[str, str, float]] = [
+        (a, b, COSTS[costs](rng)) for a, b in zip(corridor, corridor[1:])
+    ]
+    locked_connections: dict[tuple[str, str], str] = {}
+
+    for i, key in enumerate(keys):
+        door: int = (i + 1) * (length - 1) // (key_count + 1)
+        locked_connections[corridor[door], corridor[door + 1]] = key
+        connections.append((corridor[rng.randint(0, door)], key, COSTS[costs](rng)))
+
+    return World(nodes=corridor + keys, connections=connections, locked_connections=locked_connections, keys=keys)
+
+
+def keyed_grid(side: int, key_count: int, seed: int = 0) -> World:
+    """
+    Creates a square grid world whose goal is behind a chain of keys.
+
+    Parameters
+    ----------
+    side : int
+        The number of nodes along each side, with ``S`` and ``G`` in
+        opposite corners.
+    key_count : int
+        The number of keys in the chain.
+    seed : int, optional
+        The seed of the random generator placing the keys.
+
+    Returns
+    -------
+    World
+        A grid where the goal needs key 0, and each key ``i`` sits in a
+        node whose connections need key ``i + 1``.
+    """
+
+    rng: random.Random = random.Random(seed)
+
+    names: dict[tuple[int, int], str] = {(x, y): f"N{x}_{y}" for x in range(side) for y in range(side)}
+    names[0, 0], names[side - 1, side - 1] = "S", "G"
+
+    nodes: list[str] = list(names.values())
+    connections: list[tuple[str, str]] = [
+        (names[x, y], names[x + dx, y + dy])
+        for x in range(side) for y in range(side) for dx, dy in ((1, 0), (0, 1))
+        if x + dx < side and y + dy < side
+    ]
+
+    keys: list[str] = rng.sample(nodes[1:-1], key_count)
+    locked_connections: dict[tuple[str, str], str] = {}
+
+    for a, b in connections:
+
+        if "G" in (a, b):
+            locked_connections[(a, b)] = keys[0]
+
+        for i in range(1, key_count):
+            if keys[i - 1] in (a, b):
+                locked_connections.setdefault((a, b), keys[i])
+
+    return World(nodes=nodes, connections=connections, locked_connections=locked_connections, keys=keys)
@@ -0,0 +1,481 @@
+import heapq
+
+from collections.abc import Iterator
+from math import inf
+
+from world import World
+from csr_graph import CsrGraph
+from state import State
+
+
+# The virtual state every goal state leads to for free, so the planner has
+# a single goal whatever keys the explorer ends up holding.
+_GOAL: State = State(-1, 0)
+
+
+class IncrementalPlanner:
+    """
+    Lifelong Planning A* (LPA*) over the ``(node, keys)`` state graph of a
+    world whose connections, doors and keys change between queries.
+
+    The planner keeps every state's cost (``g``) and one-step lookahead cost
+    (``rhs``) between plans. An edit only updates the lookahead of the
+    states whose incoming transitions changed, and the next plan repairs
+    the costs outwards from them, so small edits far from the best route
+    cost far less than searching again.
+
+    The heuristic is the number of connections to the goal with every door
+    open, scaled by the cheapest connection's cost. It ignores doors, so
+    locking, unlocking, removing connections, raising their costs and
+    moving keys never make it inconsistent; adding a connection that does
+    is handled by recomputing it and re-keying the queue.
+
+    Every connection must cost more than 0: a free cycle lets states keep
+    vouching for each other's outdated costs, so repairs never settle.
+    """
+
+    def __init__(self, world: World | CsrGraph, start: str = "S", goal: str = "G", keys: int = 0) -> None:
+
+        self._world: World | CsrGraph = world
+        self._keys: list[str] = list(world.keys)
+        self._key_bits: list[int] = [world.key_bits[node] for node in range(len(world.nodes))]
+
+        # The planner's own copy of the connections, which edits change.
+        # Parallel connections are merged into the cheapest.
+        self._adjacency: list[dict[int, tuple[int, float]]] = [{} for _ in range(len(world.nodes))]
+
+        if world.min_cost <= 0:
+            raise ValueError("Incremental planning needs every connection to cost more than 0.")
+
+        for node in range(len(world.nodes)):
+            for neighbour, lock, cost in world.adjacency[node]:
+                if cost < self._adjacency[node].get(neighbour, (0, inf))[1]:
+                    self._adjacency[node][neighbour] = (lock, cost)
+
+        self._start: int = world.ids[start]
+        self._goal: int = world.ids[goal]
+        self._initial_keys: int = keys
+
+        self._reset()
+
+    def _reset(self) -> None:
+        """
+        Drops every cost, so the next plan searches from scratch.
+        """
+
+        self._initial_state: State = State(self._start, self._initial_keys | self._key_bits[self._start])
+        self._heuristic: list[float] = self._goal_distances()
+
+        self._g: dict[State, float] = {}
+        self._rhs: dict[State, float] = {self._initial_state: 0}
+        self._parents: dict[State, State | None] = {self._initial_state: None}
+
+        # The key masks seen at every node, to find the states an edit touches.
+        self._masks: dict[int, set[int]] = {self._start: {self._initial_state.keys}}
+
+        # A lazy heap: an entry is stale once its key no longer matches.
+        self._heap: list[tuple[tuple[float, float, int], State]] = []
+        self._queued: dict[State, tuple[float, float, int]] = {}
+        self._push(self._initial_state)
+
+    def _goal_distances(self) -> list[float]:
+        """
+        Measures the cost to the goal from every node with every door open.
+
+        Returns
+        -------
+        list[float]
+            The number of connections to the goal times the cheapest
+            connection's cost, ``inf`` if the goal can't be reached.
+        """
+
+        unit: float = min((cost for neighbours in self._adjacency for _, cost in neighbours.values()), default=1)
+
+        distances: list[float] = [inf] * len(self._adjacency)
+        distances[self._goal] = 0
+        layer: list[int] = [self._goal]
+        depth: int = 0
+
+        while layer:
+
+            depth += 1
+            next_layer: list[int] = []
+
+            for node in layer:
+                for neighbour in self._adjacency[node]:
+                    if distances[neighbour] == inf:
+                        distances[neighbour] = depth * unit
+                        next_layer.append(neighbour)
+
+            layer = next_layer
+
+        return distances
+
+    def _key(self, state: State) -> tuple[float, float, int]:
+        """
+        Gets a state's priority in the queue.
+
+        Parameters
+        ----------
+        state : State
+            The state to prioritise.
+
+        Returns
+        -------
+        tuple[float, float, int]
+            The estimated cost of a route through the state, the state's
+            own cost to break ties, and whether it is the virtual goal. The
+            goal's free incoming moves would otherwise tie it with the goal
+            states it depends on, and the search could stop before updating
+            them.
+        """
+
+        cost: float = min(self._g.get(state, inf), self._rhs.get(state, inf))
+
+        if state is _GOAL:
+            return (cost, cost, 1)
+
+        return (cost + self._heuristic[state.node], cost, 0)
+
+    def _push(self, state: State) -> None:
+        """
+        Queues a state, superseding any entry it already has.
+
+        Parameters
+        ----------
+        state : State
+            The state to queue.
+        """
+
+        key: tuple[float, float, int] = self._key(state)
+        self._queued[state] = key
+        heapq.heappush(self._heap, (key, state))
+
+    def _top_key(self) -> tuple[float, float, int]:
+        """
+        Gets the lowest key in the queue, dropping stale entries on the way.
+
+        Returns
+        -------
+        tuple[float, float, int]
+            The lowest key, ``(inf, inf, 1)`` if the queue is empty.
+        """
+
+        heap: list[tuple[tuple[float, float, int], State]] = self._heap
+
+        while heap and self._queued.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+        return heap[0][0] if heap else (inf, inf, 1)
+
+    def _successors(self, state: State) -> Iterator[State]:
+        """
+        Gets the states reachable from a state in one move.
+
+        Parameters
+        ----------
+        state : State
+            The state to move from.
+
+        Yields
+        ------
+        State
+            Every state the explorer can move to, and the virtual goal if
+            the state is at the goal.
+        """
+
+        if state.node == self._goal:
+            yield _GOAL
+
+        for neighbour, (lock, _) in self._adjacency[state.node].items():
+            if not lock & ~state.keys:
+                yield State(neighbour, state.keys | self._key_bits[neighbour])
+
+    def _predecessors(self, state: State) -> Iterator[tuple[State, float]]:
+        """
+        Gets the states a state can be reached from in one move.
+
+        Parameters
+        ----------
+        state : State
+            The state to reach.
+
+        Yields
+        ------
+        tuple[State, float]
+            Every state that moves to ``state``, and the cost of the move.
+        """
+
+        if state is _GOAL:
+            for keys in self._masks.get(self._goal, ()):
+                yield State(self._goal, keys), 0
+            return
+
+        # Entering the node picks up its keys, so the explorer held any
+        # subset of them beforehand, and none if the state lacks one.
+        bits: int = self._key_bits[state.node]
+        if bits & ~state.keys:
+            return
+
+        for neighbour, (lock, cost) in self._adjacency[state.node].items():
+
+            picked: int = bits
+
+            while True:
+
+                keys: int = state.keys & ~picked
+                if not lock & ~keys:
+                    yield State(neighbour, keys), cost
+
+                if not picked:
+                    break
+
+                picked = (picked - 1) & bits
+
+    def _update(self, state: State) -> None:
+        """
+        Recomputes a state's lookahead cost from its predecessors, and
+        queues it if that no longer matches its cost.
+
+        Parameters
+        ----------
+        state : State
+            The state to update.
+        """
+
+        if state != self._initial_state:
+
+            best: float = inf
+            parent: State | None = None
+            g: dict[State, float] = self._g
+
+            for predecessor, cost in self._predecessors(state):
+                if g.get(predecessor, inf) + cost < best:
+                    best = g[predecessor] + cost
+                    parent = predecessor
+
+            self._rhs[state] = best
+            self._parents[state] = parent
+
+            if state is not _GOAL:
+                self._masks.setdefault(state.node, set()).add(state.keys)
+
+        if self._g.get(state, inf) != self._rhs.get(state, inf):
+            self._push(state)
+        else:
+            self._queued.pop(state, None)
+
+    def _compute(self) -> int:
+        """
+        Expands inconsistent states until the goal's cost is settled.
+
+        Returns
+        -------
+        int
+            The number of states expanded.
+        """
+
+        expanded: int = 0
+        g: dict[State, float] = self._g
+        rhs: dict[State, float] = self._rhs
+
+        while self._top_key() < self._key(_GOAL) or rhs.get(_GOAL, inf) != g.get(_GOAL, inf):
+
+            if not self._heap:
+                break
+
+            _, state = heapq.heappop(self._heap)
+            del self._queued[state]
+            expanded += 1
+
+            if g.get(state, inf) > rhs[state]:
+
+                # The state got cheaper, so its successors might too.
+                g[state] = rhs[state]
+
+                for successor in self._successors(state):
+                    self._update(successor)
+
+            else:
+
+                # The state got dearer, so it and its successors are
+                # recomputed from scratch.
+                g[state] = inf
+                self._update(state)
+
+                for successor in self._successors(state):
+                    self._update(successor)
+
+        return expanded
+
+    def plan(self) -> tuple[list[State] | None, float, int]:
+        """
+        Finds the cheapest route for the current world, reusing the costs
+        from the previous plans.
+
+        Returns
+        -------
+        tuple[list[State] | None, float, int]
+            A tuple containing:
+            - The path to the goal (list of states) or None if no path found;
+            - The total cost of the path;
+            - The number of states expanded by this plan.
+        """
+
+        expanded: int = self._compute()
+        cost: float = self._g.get(_GOAL, inf)
+
+        if cost == inf:
+            return None, -1, expanded
+
+        path: list[State] = []
+        state: State | None = self._parents[_GOAL]
+
+        while state is not None:
+            path.append(state)
+            state = self._parents[state]
+
+        path.reverse()
+        return path, cost, expanded
+
+    def _set_connection(self, a: str, b: str, lock: int, cost: float | None) -> None:
+        """
+        Changes a connection in both directions and updates the states it
+        leads to.
+
+        Parameters
+        ----------
+        a : str
+            One end of the connection.
+        b : str
+            The other end of the connection.
+        lock : int
+            The key mask needed to use the connection.
+        cost : float | None
+            The cost of the connection, ``None`` to remove it.
+        """
+
+        ids: list[int] = [self._world.ids[a], self._world.ids[b]]
+
+        for node, neighbour in (ids, ids[::-1]):
+            if cost is None:
+                self._adjacency[node].pop(neighbour, None)
+            else:
+                self._adjacency[node][neighbour] = (lock, cost)
+
+        # A connection that shortcuts the heuristic's distances could make it
+        # overestimate, so it is recomputed and the queue re-keyed.
+        heuristic: list[float] = self._heuristic
+        if cost is not None and heuristic[ids[0]] != heuristic[ids[1]] and abs(heuristic[ids[0]] - heuristic[ids[1]]) > cost:
+
+            self._heuristic = self._goal_distances()
+            self._heap = [(self._key(state), state) for state in self._queued]
+            self._queued = {state: key for key, state in self._heap}
+            heapq.heapify(self._heap)
+
+        for node, neighbour in (ids, ids[::-1]):
+            for keys in list(self._masks.get(node, ())):
+                self._update(State(neighbour, keys | self._key_bits[neighbour]))
+
+    def add_connection(self, a: str, b: str, cost: float = 1) -> None:
+        """
+        Adds a connection, or changes the cost of an existing one.
+
+        Parameters
+        ----------
+        a : str
+            One end of the connection.
+        b : str
+            The other end of the connection.
+        cost : float, optional
+            The cost of the connection.
+        """
+
+        if cost <= 0:
+            raise ValueError(f"The connection {a}-{b} must cost more than 0.")
+
+        lock, _ = self._adjacency[self._world.ids[a]].get(self._world.ids[b], (0, cost))
+        self._set_connection(a, b, lock, cost)
+
+    def remove_connection(self, a: str, b: str) -> None:
+        """
+        Removes a connection, if it exists.
+
+        Parameters
+        ----------
+        a : str
+            One end of the connection.
+        b : str
+            The other end of the connection.
+        """
+
+        self._set_connection(a, b, 0, None)
+
+    def lock(self, a: str, b: str, key: str) -> None:
+        """
+        Locks a connection, so it also needs a key.
+
+        Parameters
+        ----------
+        a : str
+            One end of the connection.
+        b : str
+            The other end of the connection.
+        key : str
+            The node holding the key that opens it.
+        """
+
+        lock, cost = self._adjacency[self._world.ids[a]][self._world.ids[b]]
+        self._set_connection(a, b, lock | (1 << self._keys.index(key)), cost)
+
+    def unlock(self, a: str, b: str) -> None:
+        """
+        Unlocks a connection, so it needs no keys.
+
+        Parameters
+        ----------
+        a : str
+            One end of the connection.
+        b : str
+            The other end of the connection.
+        """
+
+        _, cost = self._adjacency[self._world.ids[a]][self._world.ids[b]]
+        self._set_connection(a, b, 0, cost)
+
+    def move_key(self, key: str, node: str) -> None:
+        """
+        Moves a key to another node.
+
+        Parameters
+        ----------
+        key : str
+            The node holding the key.
+        node : str
+            The node to move it to.
+
+        Notes
+        -----
+        Moving a key into or out of the start changes the initial state,
+        so the next plan searches from scratch.
+        """
+
+        bit: int = 1 << self._keys.index(key)
+        old: int = self._world.ids[key]
+        new: int = self._world.ids[node]
+
+        self._key_bits[old] &= ~bit
+        self._key_bits[new] |= bit
+        self._keys[self._keys.index(key)] = node
+
+        if self._start in (old, new):
+            self._reset()
+            return
+
+        # Only moves into the two nodes changed: the states they lead to now
+        # gain a predecessor, and those they used to lead to lose one.
+        for changed in (old, new):
+            for neighbour in self._adjacency[changed]:
+                for keys in list(self._masks.get(neighbour, ())):
+                    self._update(State(changed, keys | self._key_bits[changed] | bit))
+                    self._update(State(changed, (keys | self._key_bits[changed]) & ~bit))
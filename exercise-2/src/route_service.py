@@ -0,0 +1,326 @@
+import multiprocessing
+import os
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from types import TracebackType
+from typing import NamedTuple
+
+from world import World
+from csr_graph import CsrGraph
+from state import State
+from search_mode import SearchMode
+from simulator import Simulator
+from tree_sink import TreeSink
+
+
+class RouteQuery(NamedTuple):
+    """
+    A route request against the service's world.
+
+    Attributes
+    ----------
+    start : str
+        The node the explorer starts in.
+    goal : str
+        The node the explorer must reach.
+    keys : int
+        The keys the explorer starts with, one bit per key.
+    mode : SearchMode
+        The algorithm to search with.
+    """
+
+    start: str
+    goal: str
+    keys: int = 0
+    mode: SearchMode = SearchMode.UCS
+
+
+class Route(NamedTuple):
+    """
+    The answer to a route query.
+
+    Attributes
+    ----------
+    path : tuple[State, ...] | None
+        The states from the start to the goal, ``None`` if there is no route.
+    cost : float
+        The total cost of the route, ``-1`` if there is none.
+    expanded : int
+        The number of states the search expanded.
+    """
+
+    path: tuple[State, ...] | None
+    cost: float
+    expanded: int
+
+
+# Per-process simulator over the shared world, set once by the pool initialiser.
+_simulator: Simulator | None = None
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    """
+    Picks how worker processes are started: forked where the platform
+    supports it, whatever its default start method, so workers share the
+    parent's copy of the graph. Elsewhere, the graph is pickled into every
+    worker once, when it starts.
+    """
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+
+    return multiprocessing.get_context()
+
+
+def _init_worker(world: World | CsrGraph) -> None:
+    """
+    Stores the world in a worker process. Where workers are forked (see
+    ``_worker_context``), the world is inherited from the parent rather than
+    pickled, so they read the parent's copy of the graph.
+    """
+
+    global _simulator
+    _simulator = Simulator(world)
+
+
+def _solve(simulator: Simulator, query: RouteQuery) -> Route:
+    """
+    Answers a route query without keeping its search tree.
+
+    Parameters
+    ----------
+    simulator : Simulator
+        The simulator over the world to search.
+    query : RouteQuery
+        The query to answer.
+
+    Returns
+    -------
+    Route
+        The query's route.
+    """
+
+    path, cost, tree_info = simulator._build_tree(
+        query.mode, sink=TreeSink(), start=query.start, goal=query.goal, keys=query.keys
+    )
+
+    return Route(tuple(path) if path is not None else None, cost, tree_info["expanded"])
+
+
+def _solve_batch(queries: list[RouteQuery]) -> list[Route]:
+    """
+    Answers a batch of route queries in a worker process.
+    """
+
+    return [_solve(_simulator, query) for query in queries]
+
+
+class RouteService:
+    """
+    Answers many route queries against one preloaded world.
+
+    Routes are memoised in a bounded LRU cache keyed by the world's version
+    and the query, so replacing the world never serves a stale route. Cache
+    misses are split into batches and solved by a pool of worker processes,
+    forked where the platform supports it so they share the parent's graph
+    read-only.
+    """
+
+    def __init__(
+        self,
+        world: World | CsrGraph,
+        cache_size: int = 4096,
+        workers: int | None = None,
+        batch_size: int = 64
+    ) -> None:
+
+        self._world: World | CsrGraph = world
+        self._simulator: Simulator = Simulator(world)
+        self._version: int = 0
+
+        self._cache: OrderedDict[tuple[int, RouteQuery], Route] = OrderedDict()
+        self._cache_size: int = cache_size
+        self._hits: int = 0
+        self._misses: int = 0
+
+        # Zero workers solves every query in this process.
+        self._workers: int = workers if workers is not None else os.cpu_count() or 1
+        self._batch_size: int = batch_size
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def version(self) -> int:
+        """
+        The version of the world, bumped every time it is replaced.
+        """
+
+        return self._version
+
+    @property
+    def hits(self) -> int:
+        """
+        The number of queries answered from the cache.
+        """
+
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        The number of queries that had to be searched.
+        """
+
+        return self._misses
+
+    def set_world(self, world: World | CsrGraph) -> None:
+        """
+        Replaces the world, so later queries are answered against it.
+
+        Parameters
+        ----------
+        world : World | CsrGraph
+            The new world.
+
+        Notes
+        -----
+        The workers hold the old world, so the pool is shut down and forked
+        again on the next miss.
+        """
+
+        self._world = world
+        self._simulator = Simulator(world)
+        self._version += 1
+
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _remember(self, key: tuple[int, RouteQuery], route: Route) -> None:
+        """
+        Caches a route, evicting the least recently used one if full.
+
+        Parameters
+        ----------
+        key : tuple[int, RouteQuery]
+            The world version and the query.
+        route : Route
+            The query's route.
+        """
+
+        self._cache[key] = route
+
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def query(self, start: str, goal: str, keys: int = 0, mode: SearchMode = SearchMode.UCS) -> Route:
+        """
+        Answers a single route query in this process.
+
+        Parameters
+        ----------
+        start : str
+            The node the explorer starts in.
+        goal : str
+            The node the explorer must reach.
+        keys : int, optional
+            The keys the explorer starts with.
+        mode : SearchMode, optional
+            The algorithm to search with.
+
+        Returns
+        -------
+        Route
+            The query's route.
+        """
+
+        return self.query_many([RouteQuery(start, goal, keys, mode)], parallel=False)[0]
+
+    def query_many(self, queries: Iterable[RouteQuery], parallel: bool = True) -> list[Route]:
+        """
+        Answers a batch of route queries.
+
+        Parameters
+        ----------
+        queries : Iterable[RouteQuery]
+            The queries to answer.
+        parallel : bool, optional
+            Whether cache misses are solved by the worker pool.
+
+        Returns
+        -------
+        list[Route]
+            The route of every query, in order.
+        """
+
+        queries = list(queries)
+        routes: dict[RouteQuery, Route | None] = {}
+        missing: list[RouteQuery] = []
+
+        for query in queries:
+
+            if query in routes:
+                continue
+
+            key: tuple[int, RouteQuery] = (self._version, query)
+            route: Route | None = self._cache.get(key)
+
+            if route is None:
+                missing.append(query)
+                routes[query] = None
+                continue
+
+            self._cache.move_to_end(key)
+            routes[query] = route
+
+        self._hits += len(queries) - len(missing)
+        self._misses += len(missing)
+
+        # Solves the misses, handing them to the pool only if there are
+        # enough to outweigh shipping the queries and routes between processes.
+        if parallel and self._workers > 0 and len(missing) > self._batch_size:
+
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=_worker_context(),
+                    initializer=_init_worker,
+                    initargs=(self._world,)
+                )
+
+            batches: list[list[RouteQuery]] = [
+                missing[i:i + self._batch_size] for i in range(0, len(missing), self._batch_size)
+            ]
+            solved: list[Route] = [route for batch in self._pool.map(_solve_batch, batches) for route in batch]
+
+        else:
+            solved = [_solve(self._simulator, query) for query in missing]
+
+        for query, route in zip(missing, solved):
+            routes[query] = route
+            self._remember((self._version, query), route)
+
+        return [routes[query] for query in queries]
+
+    def close(self) -> None:
+        """
+        Shuts the worker pool down.
+        """
+
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "RouteService":
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None
+    ) -> None:
+
+        self.close()
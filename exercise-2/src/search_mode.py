@@ -0,0 +1,29 @@
+from enum import Enum
+
+
+class SearchMode(Enum):
+    """
+    The algorithms the simulator can build its search tree with.
+
+    Attributes
+    ----------
+    UCS
+        Uniform cost search.
+    A_STAR
+        A* guided by distances to the goal with every door open.
+    A_STAR_KEYS
+        A* that also routes through the key of any door the goal is
+        behind.
+    BIDIRECTIONAL
+        Breadth-first search from both the start and the goal, for worlds
+        where every connection costs the same.
+    IDA_STAR
+        Iterative deepening A*, with the key-aware estimate, which only
+        keeps the current path in memory.
+    """
+
+    UCS = "ucs"
+    A_STAR = "a-star"
+    A_STAR_KEYS = "a-star-keys"
+    BIDIRECTIONAL = "bidirectional"
+    IDA_STAR = "ida-star"
@@ -1,14 +1,35 @@
-import heapq
+import sys
+
+from collections import OrderedDict
+from collections.abc import Iterator
+from math import inf
 
 from world import World
+from csr_graph import CsrGraph
 from state import State
+from search_mode import SearchMode
+from distance_heuristic import DistanceHeuristic
+from frontier import Frontier, HeapFrontier, FifoFrontier, ZeroOneFrontier, BucketFrontier
+from tree_sink import TreeSink, ListSink
+
+
+# The largest whole-number cost a bucket queue is used for.
+MAX_BUCKET_COST: int = 64
+
+# The transposition cache the IDA* entry points opt into. The search itself
+# defaults to none, keeping its memory linear in the depth, but then retries
+# every equal-cost path, which doesn't finish on grid-like worlds.
+IDA_CACHE_SIZE: int = 100_000
+
+# The most A* heuristics kept at once. Each holds a few distances per node.
+HEURISTIC_CACHE_SIZE: int = 16
 
 
 class Simulator:
 
-    def __init__(self) -> None:
+    def __init__(self, world: World | CsrGraph | None = None) -> None:
 
-        self._world = World(
+        self._world = world if world is not None else World(
             nodes=["S", "A", "B", "C", "D", "E", "G"],
             connections=[
                 ("S", "A"),
@@ -20,145 +41,690 @@ class Simulator:
                 ("C", "D"),
                 ("D", "E"),
             ],
-            locked_connections=[("C", "G")],
-            key="E",
+            locked_connections={("C", "G"): "E"},
+            keys=["E"],
         )
 
-    def _get_neighbours(self, position: str, has_key: bool) -> list[str]:
+        # The A* heuristics only depend on the world and the goal, so the
+        # most recently used ones are kept in a bounded LRU cache.
+        self._heuristics: OrderedDict[tuple[bool, int], DistanceHeuristic] = OrderedDict()
+
+    def _get_neighbours(self, node: int, keys: int) -> list[int]:
         """
         Gets all the neighbours of the explorer's current node.
 
         Parameters
         ----------
-        position : str
-            The position to get neighbours for.
-        has_key : bool
-            Whether the explorer has picked up the key.
+        node : int
+            The ID of the node to get neighbours for.
+        keys : int
+            The keys the explorer has picked up.
 
         Returns
         -------
-        list[str]
-            A list containing the neighbour nodes.
+        list[int]
+            The IDs of the neighbour nodes, in alphabetical order.
 
         Notes
         -----
-        Neighbours from locked connections are omitted unless ``has_key``
-        is ``True``.
+        Neighbours from locked connections are omitted unless ``keys``
+        holds every key the connection needs.
         """
 
-        neighbors = []
+        return [neighbour for neighbour, lock, _ in self._world.adjacency[node] if not lock & ~keys]
+
+    def _format_state(self, state: State) -> str:
+        """
+        Formats a state for printing.
+
+        Parameters
+        ----------
+        state : State
+            The state to format.
+
+        Returns
+        -------
+        str
+            The state's room name and the keys held, one digit per key.
+        """
 
-        for a, b in self._world.connections:
+        return f"({self._world.nodes[state.node]}, keys={state.keys:0{max(1, len(self._world.keys))}b})"
 
-            if position in (a, b):
+    @staticmethod
+    def _reconstruct_path(parents: dict[State, State | None], state: State) -> list[State]:
+        """
+        Rebuilds the path to a state by following its parents to the root.
 
-                neighbor = b if a == position else a
+        Parameters
+        ----------
+        parents : dict[State, State | None]
+            The state each state was best reached from, ``None`` for the root.
+        state : State
+            The state to rebuild the path to.
 
-                # Checks if the edge is locked (bidirectional).
-                if not has_key and (
-                        (position, neighbor) in self._world.locked_connections or
-                        (neighbor, position) in self._world.locked_connections
-                ):
-                    continue
+        Returns
+        -------
+        list[State]
+            The states from the root to ``state``.
+        """
+
+        path: list[State] = []
+
+        while state is not None:
+            path.append(state)
+            state = parents[state]
+
+        path.reverse()
+        return path
+
+    def _make_frontier(self, mode: SearchMode) -> Frontier:
+        """
+        Picks the cheapest frontier that still expands states in order of
+        cost for the world's connection costs.
+
+        Parameters
+        ----------
+        mode : SearchMode
+            The algorithm the frontier is for.
+
+        Returns
+        -------
+        Frontier
+            A FIFO queue if every connection costs the same, a 0-1 BFS deque
+            if they cost 0 or the same amount, a bucket queue for small
+            whole-number costs, and a binary heap otherwise or for A*.
+        """
+
+        world: World | CsrGraph = self._world
+
+        if mode is not SearchMode.UCS:
+            return HeapFrontier()
+
+        if world.min_cost == world.max_cost:
+            return FifoFrontier()
+
+        if world.binary_costs:
+            return ZeroOneFrontier()
+
+        if world.integer_costs and world.max_cost <= MAX_BUCKET_COST:
+            return BucketFrontier(int(world.max_cost))
+
+        return HeapFrontier()
+
+    def _get_heuristic(self, mode: SearchMode, goal: int) -> DistanceHeuristic:
+        """
+        Gets the A* heuristic for a mode and goal, building it only if it
+        isn't among the most recently used.
+
+        Parameters
+        ----------
+        mode : SearchMode
+            The algorithm the heuristic is for.
+        goal : int
+            The ID of the goal node.
+
+        Returns
+        -------
+        DistanceHeuristic
+            The heuristic, key-aware unless the mode is plain A*.
+        """
 
-                neighbors.append(neighbor)
+        key_aware: bool = mode is not SearchMode.A_STAR
+        heuristic_key: tuple[bool, int] = (key_aware, goal)
+        heuristic: DistanceHeuristic | None = self._heuristics.get(heuristic_key)
 
-        return sorted(neighbors)
+        if heuristic is None:
 
-    def _build_tree(self) -> tuple[list[State] | None, int, dict]:
+            heuristic = DistanceHeuristic(self._world, goal, key_aware=key_aware)
+            self._heuristics[heuristic_key] = heuristic
+
+            if len(self._heuristics) > HEURISTIC_CACHE_SIZE:
+                self._heuristics.popitem(last=False)
+
+        else:
+            self._heuristics.move_to_end(heuristic_key)
+
+        return heuristic
+
+    def _build_tree(
+        self,
+        mode: SearchMode = SearchMode.UCS,
+        frontier: Frontier | None = None,
+        sink: TreeSink | None = None,
+        start: str = "S",
+        goal: str = "G",
+        keys: int = 0,
+        cache_size: int = 0
+    ) -> tuple[list[State] | None, float, dict]:
         """
-        Builds the search tree using Uniform Cost Search.
+        Builds the search tree using Uniform Cost Search, or one of the
+        other search modes.
+
+        Parameters
+        ----------
+        mode : SearchMode, optional
+            The algorithm to search with.
+        frontier : Frontier | None, optional
+            An empty frontier to search with, instead of the one picked for
+            the world's costs.
+        sink : TreeSink | None, optional
+            Where every generated node of the search tree is sent, as it is
+            generated. Defaults to keeping the tree in memory, except for
+            IDA*, whose tree is discarded by default.
+        start : str, optional
+            The node the explorer starts in.
+        goal : str, optional
+            The node the explorer must reach.
+        keys : int, optional
+            The keys the explorer starts with, besides any in ``start``.
+        cache_size : int, optional
+            The number of states IDA* may remember the cheapest cost to
+            within an iteration, to prune repeated paths. None by default,
+            so IDA*'s memory stays linear in the depth.
 
         Returns
         -------
-        tuple[list[State] | None, int, dict]
+        tuple[list[State] | None, float, dict]
             A tuple containing:
             - The path to the goal (list of states) or None if no path found;
             - The total cost of the path;
-            - A dictionary with the search tree information for visualization.
+            - A dictionary with the search tree information for visualization
+              (its nodes are only kept with a ``ListSink``), and the number
+              of states expanded.
+
+        Raises
+        ------
+        ValueError
+            If IDA* is given a ``ListSink``, as keeping every re-generated
+            node would undo its memory bound.
         """
 
-        # Creates a priority queue (cost, state, path).
-        initial_state: State = State(position="S", has_key=False)
-        frontier = [(0, initial_state, [initial_state])]
+        if sink is None:
+            sink = TreeSink() if mode is SearchMode.IDA_STAR else ListSink()
+
+        elif mode is SearchMode.IDA_STAR and isinstance(sink, ListSink):
+            raise ValueError("IDA* cannot keep its search tree in memory; use a streaming sink.")
+
+        if mode is SearchMode.BIDIRECTIONAL:
+            return self._build_tree_bidirectional(sink, start, goal, keys)
+
+        if mode is SearchMode.IDA_STAR:
+            return self._build_tree_ida(sink, start, goal, keys, cache_size)
+
+        key_bits: list[int] = self._world.key_bits
+        initial_state: State = State(self._world.ids[start], keys | key_bits[self._world.ids[start]])
+        goal_node: int = self._world.ids[goal]
+        adjacency: list[tuple[tuple[int, int, float], ...]] = self._world.adjacency
+
+        # A* orders the frontier by cost plus an estimate of the cost left.
+        heuristic: DistanceHeuristic | None = None
+        if mode is not SearchMode.UCS:
+            heuristic = self._get_heuristic(mode, goal_node)
 
-        # This will store the best cost to reach each state.
-        best_cost: dict[State, int] = {initial_state: 0}
+        # Creates the frontier, binding its methods for the hot loop.
+        if frontier is None:
+            frontier = self._make_frontier(mode)
+
+        push = frontier.push
+        pop = frontier.pop
+        push(0, 0, initial_state)
+        expanded: int = 0
+
+        # This will store the best cost to reach each state, and the state it
+        # was reached from on that path.
+        best_cost: dict[State, float] = {initial_state: 0}
+        parents: dict[State, State | None] = {initial_state: None}
 
         # For tree visualisation...
         tree_info = {
-            "nodes": [],  # List of (state, cost, parent_state).
+            "nodes": sink.nodes if isinstance(sink, ListSink) else None,  # List of (state, cost, parent_state).
             "goal_state": None,
             "goal_path": None,
             "goal_cost": None,
+            "expanded": 0,
         }
 
         # Adds the root node to the tree.
-        tree_info["nodes"].append((initial_state, 0, None))
+        add = sink.add
+        add(initial_state, 0, None)
 
         while frontier:
 
-            current_cost, current_state, path = heapq.heappop(frontier)
+            current_cost, current_state = pop()
 
             # Skips this if there's a better path to this state already.
-            if current_cost > best_cost.get(current_state, float("inf")):
+            if current_cost > best_cost.get(current_state, inf):
                 continue
 
+            expanded += 1
+
             # Checks if the adventurer has reached the goal.
-            if current_state.position == "G" and current_state.has_key:
+            if current_state.node == goal_node:
+
+                path = self._reconstruct_path(parents, current_state)
 
                 tree_info["goal_state"] = current_state
                 tree_info["goal_path"] = path
                 tree_info["goal_cost"] = current_cost
+                tree_info["expanded"] = expanded
                 return path, current_cost, tree_info
 
             # Expands the neighbour nodes.
-            neighbors = self._get_neighbours(current_state.position, current_state.has_key)
+            current_keys: int = current_state.keys
 
-            for neighbor in neighbors:
+            for neighbor, lock, edge_cost in adjacency[current_state.node]:
 
-                # Determines if the key can be picked up.
-                new_has_key = current_state.has_key or (neighbor == self._world.key)
+                # Skips connections locked by a key the explorer doesn't have.
+                if lock & ~current_keys:
+                    continue
 
-                # Creates a new state.
-                new_state = State(position=neighbor, has_key=new_has_key)
-                new_cost = current_cost + 1  # Edge cost is always 1.
+                # Picks up any key in the neighbour, creating a new state.
+                new_state = State(neighbor, current_keys | key_bits[neighbor])
+                new_cost = current_cost + edge_cost
 
                 # Only adds this path if it costs less than other existing paths.
-                if new_cost < best_cost.get(new_state, float("inf")):
+                if new_cost < best_cost.get(new_state, inf):
+
+                    priority: float = new_cost
+
+                    if heuristic is not None:
+
+                        estimate: float = heuristic.estimate(neighbor, new_state.keys)
+
+                        # Prunes states the goal can't be reached from.
+                        if estimate < 0:
+                            continue
+
+                        priority += estimate
 
                     best_cost[new_state] = new_cost
-                    new_path = path + [new_state]
-                    heapq.heappush(frontier, (new_cost, new_state, new_path))
+                    parents[new_state] = current_state
+                    push(priority, new_cost, new_state)
 
                     # Adds to the tree for visualisation.
-                    tree_info["nodes"].append((new_state, new_cost, current_state))
+                    add(new_state, new_cost, current_state)
 
         # If there's no path, just returns this.
+        tree_info["expanded"] = expanded
         return None, -1, tree_info
 
-    def run(self):
+    def _build_tree_ida(
+        self,
+        sink: TreeSink,
+        start: str = "S",
+        goal: str = "G",
+        keys: int = 0,
+        cache_size: int = 0
+    ) -> tuple[list[State] | None, float, dict]:
         """
-        Runs the UCS algorithm and prints the results.
+        Builds the search tree using iterative deepening A*: repeated
+        depth-first searches, each bounded by the smallest estimated route
+        cost the previous one exceeded.
+
+        Parameters
+        ----------
+        sink : TreeSink
+            Where every generated node is sent, once per iteration that
+            generates it.
+        start : str, optional
+            The node the explorer starts in.
+        goal : str, optional
+            The node the explorer must reach.
+        keys : int, optional
+            The keys the explorer starts with, besides any in ``start``.
+        cache_size : int, optional
+            The number of states whose cheapest cost is remembered within
+            an iteration. A state reached again at no lower cost has
+            already been searched with at least as much of the bound left,
+            so it is pruned.
+
+        Returns
+        -------
+        tuple[list[State] | None, float, dict]
+            The same result as ``_build_tree``. The expanded count includes
+            every re-expansion, and the number of iterations and the
+            deepest path are also reported.
+
+        Notes
+        -----
+        Besides the heuristic's per-node distances and the cache, memory
+        only grows with the length of the current path. Every distinct
+        route cost can become a bound, so worlds with many different
+        fractional costs need many iterations.
         """
 
-        path, cost, tree_info = self._build_tree()
+        world: World | CsrGraph = self._world
+        key_bits: list[int] = world.key_bits
+        adjacency: list[tuple[tuple[int, int, float], ...]] = world.adjacency
+
+        initial_state: State = State(world.ids[start], keys | key_bits[world.ids[start]])
+        goal_node: int = world.ids[goal]
+        heuristic: DistanceHeuristic = self._get_heuristic(SearchMode.IDA_STAR, goal_node)
+
+        tree_info = {
+            "nodes": sink.nodes if isinstance(sink, ListSink) else None,  # List of (state, cost, parent_state).
+            "goal_state": None,
+            "goal_path": None,
+            "goal_cost": None,
+            "expanded": 0,
+            "iterations": 0,
+            "max_depth": 0,
+        }
+
+        add = sink.add
+        add(initial_state, 0, None)
+
+        bound: float = heuristic.estimate(initial_state.node, initial_state.keys)
+        if bound < 0:
+            return None, -1, tree_info
+
+        expanded: int = 0
+        max_depth: int = 0
+        cache: dict[State, float] = {}
+
+        while True:
+
+            tree_info["iterations"] += 1
+            next_bound: float = inf
+            cache.clear()
+
+            # The current path, its states' costs, and the neighbours each
+            # one has left to try.
+            path: list[State] = [initial_state]
+            on_path: set[State] = {initial_state}
+            costs: list[float] = [0]
+            pending: list[Iterator[tuple[int, int, float]]] = [iter(adjacency[initial_state.node])]
+            expanded += 1
+
+            if initial_state.node == goal_node:
+                pending.clear()
+
+            while pending:
+
+                state: State = path[-1]
+                cost: float = costs[-1]
+
+                for neighbour, lock, edge_cost in pending[-1]:
+
+                    if lock & ~state.keys:
+                        continue
+
+                    new_state = State(neighbour, state.keys | key_bits[neighbour])
+
+                    # Skips cycles, which never lead to a cheaper route.
+                    if new_state in on_path:
+                        continue
+
+                    new_cost: float = cost + edge_cost
+                    estimate: float = heuristic.estimate(neighbour, new_state.keys)
+
+                    if estimate < 0:
+                        continue
+
+                    # Leaves anything past the bound for a later iteration.
+                    if new_cost + estimate > bound:
+                        next_bound = min(next_bound, new_cost + estimate)
+                        continue
+
+                    if cache_size:
+
+                        if cache.get(new_state, inf) <= new_cost:
+                            continue
+
+                        if len(cache) < cache_size or new_state in cache:
+                            cache[new_state] = new_cost
+
+                    add(new_state, new_cost, state)
+                    path.append(new_state)
+                    on_path.add(new_state)
+                    costs.append(new_cost)
+                    pending.append(iter(adjacency[neighbour]))
+                    expanded += 1
+                    break
+
+                else:
+
+                    # Every neighbour was tried, so backtracks.
+                    on_path.discard(path.pop())
+                    costs.pop()
+                    pending.pop()
+                    continue
+
+                max_depth = max(max_depth, len(path) - 1)
+
+                if path[-1].node == goal_node:
+                    break
+
+            if path and path[-1].node == goal_node:
+
+                tree_info["goal_state"] = path[-1]
+                tree_info["goal_path"] = path
+                tree_info["goal_cost"] = costs[-1]
+                tree_info["expanded"] = expanded
+                tree_info["max_depth"] = max_depth
+                return path, costs[-1], tree_info
+
+            # Gives up once no route was cut off by the bound.
+            if next_bound == inf:
+                tree_info["expanded"] = expanded
+                tree_info["max_depth"] = max_depth
+                return None, -1, tree_info
+
+            bound = next_bound
+
+    def _build_tree_bidirectional(
+        self,
+        sink: TreeSink,
+        start: str = "S",
+        goal: str = "G",
+        keys: int = 0
+    ) -> tuple[list[State] | None, float, dict]:
+        """
+        Builds the search tree using breadth-first search from both ends,
+        which is optimal while every connection costs the same.
+
+        Parameters
+        ----------
+        sink : TreeSink
+            Where every node generated by the forward search is sent.
+        start : str, optional
+            The node the explorer starts in.
+        goal : str, optional
+            The node the explorer must reach.
+        keys : int, optional
+            The keys the explorer starts with, besides any in ``start``.
+
+        Returns
+        -------
+        tuple[list[State] | None, float, dict]
+            The same result as ``_build_tree``. The tree only holds the
+            forward search, but the expanded count covers both directions.
+
+        Raises
+        ------
+        ValueError
+            If the connections don't all cost the same.
+
+        Notes
+        -----
+        The backward search runs over ``(node, keys needed)`` states: the
+        keys the explorer must hold on reaching a node to follow the rest of
+        the route. A forward state meets a backward one at the same node if
+        it holds every key the backward state needs.
+        """
+
+        world: World | CsrGraph = self._world
+        key_bits: list[int] = world.key_bits
+        adjacency: list[tuple[tuple[int, int, float], ...]] = world.adjacency
+
+        if world.min_cost != world.max_cost:
+            raise ValueError("Bidirectional search needs every connection to cost the same.")
+
+        # Both sides count connections, which are converted to costs at the end.
+        unit: float = world.min_cost
+
+        initial_state: State = State(world.ids[start], keys | key_bits[world.ids[start]])
+        goal_state: State = State(world.ids[goal], 0)
+
+        # Each side records its states' costs and the state they were reached
+        # from, and indexes its states by node for the meeting test.
+        forward_cost: dict[State, int] = {initial_state: 0}
+        forward_parents: dict[State, State | None] = {initial_state: None}
+        forward_by_node: dict[int, list[State]] = {initial_state.node: [initial_state]}
+        backward_cost: dict[State, int] = {goal_state: 0}
+        backward_next: dict[State, State | None] = {goal_state: None}
+        backward_by_node: dict[int, list[State]] = {goal_state.node: [goal_state]}
+
+        forward_layer: list[State] = [initial_state]
+        backward_layer: list[State] = [goal_state]
+        forward_depth: int = 0
+        backward_depth: int = 0
+
+        tree_info = {
+            "nodes": sink.nodes if isinstance(sink, ListSink) else None,  # List of (state, cost, parent_state).
+            "goal_state": None,
+            "goal_path": None,
+            "goal_cost": None,
+            "expanded": 0,
+        }
+
+        add = sink.add
+        add(initial_state, 0, None)
+
+        best: float = inf
+        meeting: tuple[State, State] | None = None
+
+        # The start might already be the goal.
+        if initial_state.node == goal_state.node:
+            best, meeting = 0, (initial_state, goal_state)
+
+        # Stops once no undiscovered route can be shorter than the best one.
+        while forward_layer and backward_layer and best > forward_depth + backward_depth + 1:
+
+            # Expands a whole layer of the smaller side.
+            if len(forward_layer) <= len(backward_layer):
+
+                next_layer: list[State] = []
+
+                for state in forward_layer:
+                    for neighbour, lock, _ in adjacency[state.node]:
+
+                        if lock & ~state.keys:
+                            continue
+
+                        new_state = State(neighbour, state.keys | key_bits[neighbour])
+                        if new_state in forward_cost:
+                            continue
+
+                        forward_cost[new_state] = forward_depth + 1
+                        forward_parents[new_state] = state
+                        forward_by_node.setdefault(neighbour, []).append(new_state)
+                        add(new_state, (forward_depth + 1) * unit, state)
+                        next_layer.append(new_state)
+
+                        # Meets any backward state needing only keys this one holds.
+                        for other in backward_by_node.get(neighbour, ()):
+                            if not other.keys & ~new_state.keys and forward_depth + 1 + backward_cost[other] < best:
+                                best = forward_depth + 1 + backward_cost[other]
+                                meeting = (new_state, other)
+
+                tree_info["expanded"] += len(forward_layer)
+                forward_layer = next_layer
+                forward_depth += 1
+
+            else:
+
+                next_layer = []
+
+                for state in backward_layer:
+                    for neighbour, lock, _ in adjacency[state.node]:
+
+                        # Arriving from the neighbour, the explorer needs the
+                        # connection's keys, plus any still needed that this
+                        # node doesn't provide.
+                        new_state = State(neighbour, (state.keys & ~key_bits[state.node]) | lock)
+                        if new_state in backward_cost:
+                            continue
+
+                        backward_cost[new_state] = backward_depth + 1
+                        backward_next[new_state] = state
+                        backward_by_node.setdefault(neighbour, []).append(new_state)
+                        next_layer.append(new_state)
+
+                        for other in forward_by_node.get(neighbour, ()):
+                            if not new_state.keys & ~other.keys and forward_cost[other] + backward_depth + 1 < best:
+                                best = forward_cost[other] + backward_depth + 1
+                                meeting = (other, new_state)
+
+                tree_info["expanded"] += len(backward_layer)
+                backward_layer = next_layer
+                backward_depth += 1
+
+        if meeting is None:
+            return None, -1, tree_info
+
+        # Joins the forward path with the backward one, picking up keys on
+        # the way to the goal.
+        state, backward = meeting
+        path: list[State] = self._reconstruct_path(forward_parents, state)
+        backward = backward_next[backward]
+
+        while backward is not None:
+            state = State(backward.node, state.keys | key_bits[backward.node])
+            path.append(state)
+            backward = backward_next[backward]
+
+        cost: float = int(best) * unit
+
+        tree_info["goal_state"] = path[-1]
+        tree_info["goal_path"] = path
+        tree_info["goal_cost"] = cost
+        return path, cost, tree_info
+
+    def run(
+        self,
+        mode: SearchMode = SearchMode.UCS,
+        sink: TreeSink | None = None,
+        cache_size: int = IDA_CACHE_SIZE
+    ):
+        """
+        Runs the search and prints the results.
+
+        Parameters
+        ----------
+        mode : SearchMode, optional
+            The algorithm to search with.
+        sink : TreeSink | None, optional
+            Where the search tree is streamed to, closed once the search
+            ends. Defaults to printing the tree after the path, except for
+            IDA*, whose tree is discarded.
+        cache_size : int, optional
+            The transposition cache size IDA* runs with, traded for memory
+            linear in the depth. 0 for none.
+        """
+
+        if sink is None:
+            sink = TreeSink() if mode is SearchMode.IDA_STAR else ListSink()
+
+        with sink:
+            path, cost, tree_info = self._build_tree(mode, sink=sink, cache_size=cache_size)
 
         if path:
 
             print(
-                f"\nPath: {' -> '.join([f'({s.position}, key={s.has_key})' for s in path])}"
+                f"\nPath: {' -> '.join([self._format_state(s) for s in path])}"
             )
             print(f"Total cost: {cost}")
-
-            print("\n=== Search Tree ===")
-            for state, state_cost, parent in tree_info["nodes"]:
-                parent_str = (
-                    f"({parent.position}, key={parent.has_key})" if parent else "ROOT"
-                )
-                print(
-                    f"State: ({state.position}, key={state.has_key}), Cost: {state_cost}, Parent: {parent_str}"
-                )
+            print(f"States expanded: {tree_info['expanded']}")
+
+            # Writes the tree in one go rather than with a call per line.
+            if tree_info["nodes"] is not None:
+                print("\n=== Search Tree ===")
+                sys.stdout.write("".join(
+                    f"State: {self._format_state(state)}, Cost: {state_cost}, "
+                    f"Parent: {self._format_state(parent) if parent else 'ROOT'}\n"
+                    for state, state_cost, parent in tree_info["nodes"]
+                ))
 
         else:
 
@@ -1,22 +1,23 @@
-from dataclasses import dataclass
+from typing import NamedTuple
 
 
-@dataclass(frozen=True)
-class State:
+class State(NamedTuple):
     """
     Represents a state.
 
     Attributes
     ----------
-    position : str
-        The explorer's current room (S, A, B, C, D, E, or G).
-    has_key : bool
-        Whether the explorer has picked up the key.
-    """
+    node : int
+        The ID of the explorer's current room.
+    keys : int
+        The keys the explorer has picked up, one bit per key.
 
-    position: str
-    has_key: bool
+    Notes
+    -----
+    A named tuple has empty ``__slots__``, and hashes and compares in C
+    without building any intermediate tuple, which matters once the key
+    masks push the state space into the millions.
+    """
 
-    def __lt__(self, other):
-        """For priority queue ordering."""
-        return (self.position, self.has_key) < (other.position, other.has_key)
+    node: int
+    keys: int
@@ -0,0 +1,174 @@
+import struct
+import numpy as np
+
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, TextIO
+from numpy.typing import NDArray
+
+from state import State
+from world import World
+from csr_graph import CsrGraph
+
+
+# File header: magic and format version.
+_MAGIC: bytes = b"UCST"
+_VERSION: int = 1
+_HEADER: struct.Struct = struct.Struct("<4sH")
+
+# Fixed-width record: state, cost and parent state (node -1 for the root).
+_RECORD: struct.Struct = struct.Struct("<iQdiQ")
+
+RECORD_DTYPE: np.dtype = np.dtype([
+    ("node", "<i4"),
+    ("keys", "<u8"),
+    ("cost", "<f8"),
+    ("parent_node", "<i4"),
+    ("parent_keys", "<u8"),
+])
+
+
+class TreeSink:
+    """
+    Receives every node of the search tree as it is generated.
+
+    This base sink discards them, so searching without a tree costs one
+    no-op call per generated node.
+    """
+
+    def add(self, state: State, cost: float, parent: State | None) -> None:
+        """
+        Adds a generated node to the tree.
+
+        Parameters
+        ----------
+        state : State
+            The generated state.
+        cost : float
+            The cost of the path to the state.
+        parent : State | None
+            The state it was generated from, ``None`` for the root.
+        """
+
+    def close(self) -> None:
+        """
+        Finishes the tree.
+        """
+
+    def __enter__(self) -> "TreeSink":
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None
+    ) -> None:
+
+        self.close()
+
+
+class ListSink(TreeSink):
+    """
+    Keeps the whole tree in memory as ``(state, cost, parent_state)`` tuples.
+    """
+
+    def __init__(self) -> None:
+
+        self.nodes: list[tuple[State, float, State | None]] = []
+
+    def add(self, state: State, cost: float, parent: State | None) -> None:
+
+        self.nodes.append((state, cost, parent))
+
+
+class BinaryFileSink(TreeSink):
+    """
+    Streams the tree to a compact binary file through a large buffer, one
+    fixed-width record per node, readable with ``read_tree``.
+    """
+
+    def __init__(self, path: str | Path, buffer_size: int = 1 << 16) -> None:
+
+        self._file: BinaryIO = open(path, "wb", buffering=buffer_size)
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION))
+
+    def add(self, state: State, cost: float, parent: State | None) -> None:
+
+        if parent is None:
+            self._file.write(_RECORD.pack(state.node, state.keys, cost, -1, 0))
+        else:
+            self._file.write(_RECORD.pack(state.node, state.keys, cost, parent.node, parent.keys))
+
+    def close(self) -> None:
+
+        self._file.close()
+
+
+class DotFileSink(TreeSink):
+    """
+    Streams the tree to a Graphviz DOT file through a large buffer, with one
+    edge per generated node, labelled with its cost.
+    """
+
+    def __init__(self, path: str | Path, world: World | CsrGraph, buffer_size: int = 1 << 16) -> None:
+
+        self._world: World | CsrGraph = world
+        self._file: TextIO = open(path, "w", buffering=buffer_size)
+        self._file.write("digraph search_tree {\n")
+
+    def _name(self, state: State) -> str:
+        """
+        Names a state's DOT node.
+
+        Parameters
+        ----------
+        state : State
+            The state to name.
+
+        Returns
+        -------
+        str
+            The quoted room name and key mask.
+        """
+
+        return f'"{self._world.nodes[state.node]}/{state.keys:b}"'
+
+    def add(self, state: State, cost: float, parent: State | None) -> None:
+
+        if parent is None:
+            self._file.write(f"  {self._name(state)};\n")
+        else:
+            self._file.write(f'  {self._name(parent)} -> {self._name(state)} [label="{cost}"];\n')
+
+    def close(self) -> None:
+
+        self._file.write("}\n")
+        self._file.close()
+
+
+def read_tree(path: str | Path) -> NDArray:
+    """
+    Reads a search tree written by ``BinaryFileSink``.
+
+    Parameters
+    ----------
+    path : str | Path
+        The path to the tree file.
+
+    Returns
+    -------
+    NDArray
+        A structured array with one ``RECORD_DTYPE`` entry per node, in the
+        order they were generated.
+    """
+
+    with open(path, "rb") as file:
+
+        magic, version = _HEADER.unpack(file.read(_HEADER.size))
+
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a version {_VERSION} search tree.")
+
+        return np.fromfile(file, dtype=RECORD_DTYPE)
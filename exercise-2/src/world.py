@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass(frozen=True)
@@ -10,15 +10,168 @@ class World:
     ----------
     nodes : list[str]
         A list of available nodes.
-    connections : list[tuple[str, str]]
-        A list of tuples representing the connections between nodes.
-    locked_connections : list[tuple[str, str]]
-        A list of tuples representing which connections are locked.
-    key : str | None
-        The name of the node which contains the key.
+    connections : list[tuple[str, str] | tuple[str, str, float]]
+        A list of tuples representing the connections between nodes, with
+        an optional cost (1 if omitted).
+    locked_connections : dict[tuple[str, str], str]
+        The locked connections, each mapped to the node holding the key
+        that opens it.
+    keys : list[str]
+        The nodes which contain a key. Key ``i`` is bit ``i`` of a state's
+        key mask.
+    ids : dict[str, int]
+        The ID of every node, in the order of ``nodes``.
+    key_bits : list[int]
+        The key mask picked up when entering each node.
+    locks : dict[tuple[str, str], int]
+        The key mask each locked connection needs, keyed by the connection
+        with its nodes in order.
+    adjacency : list[tuple[tuple[int, int, float], ...]]
+        The ``(neighbour, key mask needed, cost)`` triples of every node, in
+        alphabetical neighbour order.
+    min_cost : float
+        The cost of the cheapest connection.
+    max_cost : float
+        The cost of the most expensive connection.
+    integer_costs : bool
+        Whether every cost is a whole number.
+    binary_costs : bool
+        Whether every cost is either 0 or ``max_cost``.
     """
 
     nodes: list[str]
-    connections: list[tuple[str, str]]
-    locked_connections: list[tuple[str, str]]
-    key: str | None
+    connections: list[tuple[str, str] | tuple[str, str, float]]
+    locked_connections: dict[tuple[str, str], str]
+    keys: list[str]
+
+    ids: dict[str, int] = field(init=False, repr=False, compare=False)
+    key_bits: list[int] = field(init=False, repr=False, compare=False)
+    locks: dict[tuple[str, str], int] = field(init=False, repr=False, compare=False)
+    adjacency: list[tuple[tuple[int, int, float], ...]] = field(init=False, repr=False, compare=False)
+    min_cost: float = field(init=False, repr=False, compare=False)
+    max_cost: float = field(init=False, repr=False, compare=False)
+    integer_costs: bool = field(init=False, repr=False, compare=False)
+    binary_costs: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """
+        Interns the node names and builds the adjacency index once, so
+        expanding a node only costs as much as its degree.
+        """
+
+        ids: dict[str, int] = {node: i for i, node in enumerate(self.nodes)}
+
+        key_bits: list[int] = [0] * len(self.nodes)
+        for bit, key in enumerate(self.keys):
+            key_bits[ids[key]] |= 1 << bit
+
+        locks: dict[tuple[str, str], int] = {}
+        for (a, b), key in self.locked_connections.items():
+            pair: tuple[str, str] = World.normalise(a, b)
+            locks[pair] = locks.get(pair, 0) | (1 << self.keys.index(key))
+
+        adjacency: list[list[tuple[int, int, float]]] = [[] for _ in self.nodes]
+        costs: set[float] = set()
+
+        for a, b, *cost in self.connections:
+
+            edge_cost: float = cost[0] if cost else 1
+
+            if edge_cost < 0:
+                raise ValueError(f"The connection {a}-{b} has a negative cost.")
+
+            lock: int = locks.get(World.normalise(a, b), 0)
+            adjacency[ids[a]].append((ids[b], lock, edge_cost))
+            adjacency[ids[b]].append((ids[a], lock, edge_cost))
+            costs.add(edge_cost)
+
+        # The dataclass is frozen, so the derived fields are set directly.
+        object.__setattr__(self, "ids", ids)
+        object.__setattr__(self, "key_bits", key_bits)
+        object.__setattr__(self, "locks", locks)
+        object.__setattr__(self, "adjacency", [
+            tuple(sorted(neighbours, key=lambda neighbour: self.nodes[neighbour[0]])) for neighbours in adjacency
+        ])
+
+        # Summarises the costs, so the search can pick a suitable frontier.
+        max_cost: float = max(costs, default=1)
+        object.__setattr__(self, "min_cost", min(costs, default=1))
+        object.__setattr__(self, "max_cost", max_cost)
+        object.__setattr__(self, "integer_costs", all(float(cost).is_integer() for cost in costs))
+        object.__setattr__(self, "binary_costs", costs <= {0, max_cost})
+
+    @staticmethod
+    def normalise(a: str, b: str) -> tuple[str, str]:
+        """
+        Orders the nodes of a connection, so both directions compare equal.
+
+        Parameters
+        ----------
+        a : str
+            One end of the connection.
+        b : str
+            The other end of the connection.
+
+        Returns
+        -------
+        tuple[str, str]
+            The connection with its nodes in order.
+        """
+
+        return (a, b) if a <= b else (b, a)
+
+    def lock(self, a: str, b: str) -> int:
+        """
+        Gets the keys needed to use a connection, in either direction.
+
+        Parameters
+        ----------
+        a : str
+            One end of the connection.
+        b : str
+            The other end of the connection.
+
+        Returns
+        -------
+        int
+            The key mask needed, ``0`` if the connection is not locked.
+        """
+
+        return self.locks.get(World.normalise(a, b), 0)
+
+    def distances(self, source: int, blocked: int = 0) -> list[int]:
+        """
+        Gets the number of connections from a node to every other node,
+        treating every door as open.
+
+        Parameters
+        ----------
+        source : int
+            The ID of the node to measure from.
+        blocked : int, optional
+            A key mask; connections needing any of these keys are skipped.
+
+        Returns
+        -------
+        list[int]
+            The distance to every node, ``-1`` if it cannot be reached.
+        """
+
+        distances: list[int] = [-1] * len(self.nodes)
+        distances[source] = 0
+        layer: list[int] = [source]
+
+        # Expands one breadth-first layer at a time.
+        while layer:
+
+            next_layer: list[int] = []
+
+            for node in layer:
+                for neighbour, lock, _ in self.adjacency[node]:
+                    if distances[neighbour] < 0 and not lock & blocked:
+                        distances[neighbour] = distances[node] + 1
+                        next_layer.append(neighbour)
+
+            layer = next_layer
+
+        return distances
@@ -0,0 +1,48 @@
+import sys
+
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from world import World
+from csr_graph import CsrGraph
+from simulator import Simulator
+
+
+def test_mixed_cost_columns(tmp_path: Path) -> None:
+
+    path: Path = tmp_path / "dungeon.txt"
+    path.write_text("S A - 5\nA B -\n\n# A comment.\nB C -\nC G -\nS G - 9\n")
+
+    graph: CsrGraph = CsrGraph.from_edge_list(path)
+    world: World = World(
+        nodes=["S", "A", "B", "C", "G"],
+        connections=[("S", "A", 5), ("A", "B"), ("B", "C"), ("C", "G"), ("S", "G", 9)],
+        locked_connections={},
+        keys=[],
+    )
+
+    assert graph.integer_costs
+    assert Simulator(graph)._build_tree()[1] == Simulator(world)._build_tree()[1] == 8
+
+
+@pytest.mark.parametrize("chunk_size", [8, 16, 1 << 24])
+def test_costs_in_some_chunks_only(tmp_path: Path, chunk_size: int) -> None:
+
+    path: Path = tmp_path / "dungeon.txt"
+    path.write_text("S A -\nA G -\nS B - 0.5\nB G - 0.5\n")
+
+    graph: CsrGraph = CsrGraph.from_edge_list(path, chunk_size=chunk_size)
+    assert sorted(graph.costs.tolist()) == [0.5, 0.5, 0.5, 0.5, 1, 1, 1, 1]
+    assert Simulator(graph)._build_tree()[1] == 1
+
+
+def test_rejects_lines_with_too_few_columns(tmp_path: Path) -> None:
+
+    path: Path = tmp_path / "dungeon.txt"
+    path.write_text("S A - 5\nA G\n")
+
+    with pytest.raises(ValueError, match="three or four columns"):
+        CsrGraph.from_edge_list(path)
@@ -0,0 +1,152 @@
+import random
+import sys
+
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from world import World
+from state import State
+from simulator import Simulator
+from generators import random_world
+from incremental_planner import IncrementalPlanner
+
+
+class EditedWorld:
+    """
+    The test's own copy of a world, edited alongside the planner and rebuilt
+    from scratch for plain uniform cost search.
+    """
+
+    def __init__(self, world: World) -> None:
+
+        self.nodes: list[str] = world.nodes
+        self.keys: list[str] = list(world.keys)
+
+        # Parallel connections are merged into the cheapest, as the planner does.
+        self.connections: dict[tuple[str, str], float] = {}
+        for a, b, cost in world.connections:
+            pair: tuple[str, str] = World.normalise(a, b)
+            self.connections[pair] = min(cost, self.connections.get(pair, cost))
+
+        # Each locked connection's key, by index, as keys move between nodes.
+        self.locks: dict[tuple[str, str], int] = {}
+
+    def build(self) -> World:
+        """
+        Builds the edited world.
+        """
+
+        return World(
+            nodes=self.nodes,
+            connections=[(a, b, cost) for (a, b), cost in self.connections.items()],
+            locked_connections={pair: self.keys[key] for pair, key in self.locks.items()},
+            keys=list(self.keys),
+        )
+
+
+def apply_random_edit(rng: random.Random, edited: EditedWorld, planner: IncrementalPlanner) -> None:
+    """
+    Applies one random edit to both the test's world and the planner.
+    """
+
+    edit: str = rng.choice(("add", "remove", "lock", "unlock", "move_key"))
+    unlocked: list[tuple[str, str]] = [pair for pair in edited.connections if pair not in edited.locks]
+
+    if edit == "add" or not edited.connections:
+        pair: tuple[str, str] = World.normalise(*rng.sample(edited.nodes, 2))
+        edited.connections[pair] = rng.randint(1, 9)
+        planner.add_connection(*pair, edited.connections[pair])
+
+    elif edit == "remove":
+        pair = rng.choice(list(edited.connections))
+        del edited.connections[pair]
+        edited.locks.pop(pair, None)
+        planner.remove_connection(*pair)
+
+    # Only unlocked connections are locked, as a world holds one key per door.
+    elif edit == "lock" and unlocked:
+        pair = rng.choice(unlocked)
+        edited.locks[pair] = rng.randrange(len(edited.keys))
+        planner.lock(*pair, edited.keys[edited.locks[pair]])
+
+    elif edit == "unlock" and edited.locks:
+        pair = rng.choice(list(edited.locks))
+        del edited.locks[pair]
+        planner.unlock(*pair)
+
+    # Keys are only moved to nodes without one, so every key stays distinct.
+    elif edit == "move_key":
+        key: int = rng.randrange(len(edited.keys))
+        node: str = rng.choice([node for node in edited.nodes if node not in edited.keys])
+        planner.move_key(edited.keys[key], node)
+        edited.keys[key] = node
+
+
+def assert_route_is_valid(world: World, path: list[State], cost: float) -> None:
+    """
+    Checks that a route walks the world's connections from S to G, only
+    through doors whose keys were already picked up, at the given cost.
+    """
+
+    assert path[0] == State(world.ids["S"], world.key_bits[world.ids["S"]])
+    assert path[-1].node == world.ids["G"]
+
+    total: float = 0
+
+    for state, next_state in zip(path, path[1:]):
+
+        assert next_state.keys == state.keys | world.key_bits[next_state.node]
+
+        usable: list[float] = [
+            edge_cost for neighbour, lock, edge_cost in world.adjacency[state.node]
+            if neighbour == next_state.node and not lock & ~state.keys
+        ]
+        assert usable, f"no open connection from {world.nodes[state.node]} to {world.nodes[next_state.node]}"
+        total += min(usable)
+
+    assert total == cost
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_replanning_matches_uniform_cost_search(seed: int) -> None:
+
+    rng: random.Random = random.Random(seed)
+    world: World = random_world(12, rng.randint(12, 30), 3, "small", seed, lock_fraction=0)
+
+    edited: EditedWorld = EditedWorld(world)
+    planner: IncrementalPlanner = IncrementalPlanner(world)
+
+    _, cost, _ = planner.plan()
+    _, expected, _ = Simulator(world)._build_tree()
+    assert cost == expected
+
+    for edit in range(15):
+
+        apply_random_edit(rng, edited, planner)
+
+        path, cost, _ = planner.plan()
+        edited_world: World = edited.build()
+        _, expected, _ = Simulator(edited_world)._build_tree()
+        assert cost == expected, f"edit {edit}"
+
+        # The planner's route must be usable in the edited world.
+        if path is not None:
+            assert_route_is_valid(edited_world, path, cost)
+
+
+def test_replanning_from_scratch_after_moving_a_key_into_the_start() -> None:
+
+    world: World = World(
+        nodes=["S", "A", "K", "G"],
+        connections=[("S", "A", 1), ("A", "K", 1), ("A", "G", 1)],
+        locked_connections={("A", "G"): "K"},
+        keys=["K"],
+    )
+    planner: IncrementalPlanner = IncrementalPlanner(world)
+    assert planner.plan()[1] == 4
+
+    planner.move_key("K", "S")
+    assert planner.plan()[1] == 2
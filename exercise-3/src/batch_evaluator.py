@@ -0,0 +1,133 @@
+import numpy as np
+
+from numpy.typing import NDArray
+
+from board import Board
+from evaluation import WEIGHTS, centre_cells, lines
+
+
+class BatchEvaluator:
+    """
+    The static evaluation of ``Evaluator`` over whole arrays of boards at
+    once, with NumPy.
+
+    Boards are given as their two bitboards, X's then O's, so they must fit
+    in 64 bits. Every feature is worked out for every board and line in one
+    array operation, which amortises the interpreter's cost over the batch
+    when many leaves are scored together.
+    """
+
+    def __init__(self, board: Board) -> None:
+
+        if board.width * board.stride > 64:
+            raise ValueError("Batched evaluation needs boards of at most 64 bits.")
+
+        found: list[tuple[int, ...]] = lines(board)
+
+        self._lines: NDArray[np.uint64] = np.array([sum(1 << cell for cell in cells) for cells in found], dtype=np.uint64)
+        self._vertical: NDArray[np.bool_] = np.array([cells[1] - cells[0] == 1 for cells in found])
+        self._centre: np.uint64 = np.uint64(sum(1 << cell for cell in centre_cells(board)))
+        self._bottom: np.uint64 = np.uint64(board.bottom)
+        self._cells: np.uint64 = np.uint64(board.cells)
+        self._connect: int = board.connect
+        self._weights: NDArray[np.int64] = np.array(WEIGHTS, dtype=np.int64)
+
+    @staticmethod
+    def pack(boards: list[Board]) -> NDArray[np.uint64]:
+        """
+        Gathers the bitboards of some boards into an array.
+
+        Parameters
+        ----------
+        boards : list[Board]
+            The boards, all of the same size.
+
+        Returns
+        -------
+        NDArray[np.uint64]
+            An array of shape ``(len(boards), 2)`` of every board's X and O
+            bitboards.
+        """
+
+        return np.array([board.pieces for board in boards], dtype=np.uint64).reshape(-1, 2)
+
+    def _threats(self, own: NDArray[np.uint64], opponent: NDArray[np.uint64], playable: NDArray[np.uint64]) -> NDArray[np.bool_]:
+        """
+        Finds the lines each board's player is one playable piece away from.
+
+        Parameters
+        ----------
+        own : NDArray[np.uint64]
+            The player's bitboard of every board, as a column.
+        opponent : NDArray[np.uint64]
+            The opponent's bitboard of every board, as a column.
+        playable : NDArray[np.uint64]
+            The playable cells of every board, as a column.
+
+        Returns
+        -------
+        NDArray[np.bool_]
+            Whether every line of every board is a threat, of shape
+            ``(boards, lines)``.
+        """
+
+        missing: NDArray[np.uint64] = self._lines & ~own
+        return ((missing & opponent) == 0) & ((missing & playable) != 0) & (np.bitwise_count(missing) == 1)
+
+    def features(self, pieces: NDArray[np.uint64], players: NDArray[np.int64] | int) -> NDArray[np.int64]:
+        """
+        Computes θ1 to θ5 of every board.
+
+        Parameters
+        ----------
+        pieces : NDArray[np.uint64]
+            The X and O bitboards of every board, of shape ``(boards, 2)``.
+        players : NDArray[np.int64] | int
+            The player to evaluate every board for, or one player for all.
+
+        Returns
+        -------
+        NDArray[np.int64]
+            The five features of every board, of shape ``(boards, 5)``.
+        """
+
+        rows: NDArray[np.int64] = np.arange(len(pieces))
+        players = np.broadcast_to(np.asarray(players, dtype=np.int64), rows.shape)
+
+        own: NDArray[np.uint64] = pieces[rows, players][:, None]
+        opponent: NDArray[np.uint64] = pieces[rows, 1 - players][:, None]
+        playable: NDArray[np.uint64] = ((own | opponent) + self._bottom) & self._cells
+
+        threats: NDArray[np.bool_] = self._threats(own, opponent, playable)
+        opponent_threats: NDArray[np.bool_] = self._threats(opponent, own, playable)
+
+        won: NDArray[np.bool_] = (np.bitwise_count(own & self._lines) == self._connect).any(axis=1)
+        lost: NDArray[np.bool_] = (np.bitwise_count(opponent & self._lines) == self._connect).any(axis=1)
+
+        return np.stack((
+            np.bitwise_count(own[:, 0] & self._centre).astype(np.int64)
+            - np.bitwise_count(opponent[:, 0] & self._centre).astype(np.int64),
+            threats.sum(axis=1),
+            opponent_threats.sum(axis=1),
+            threats[:, self._vertical].sum(axis=1) - opponent_threats[:, self._vertical].sum(axis=1),
+            np.where(won, 1, np.where(lost, -1, 0)),
+        ), axis=1).astype(np.int64)
+
+    def evaluate(self, pieces: NDArray[np.uint64], players: NDArray[np.int64] | int) -> NDArray[np.int64]:
+        """
+        Computes f(s) of every board.
+
+        Parameters
+        ----------
+        pieces : NDArray[np.uint64]
+            The X and O bitboards of every board, of shape ``(boards, 2)``.
+        players : NDArray[np.int64] | int
+            The player to evaluate every board for, or one player for all.
+
+        Returns
+        -------
+        NDArray[np.int64]
+            The weighted sum of the features of every board.
+        """
+
+        return self.features(pieces, players) @ self._weights
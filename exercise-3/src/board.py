@@ -0,0 +1,211 @@
+import random
+
+from typing import Protocol
+
+
+# Player indices; X always moves first.
+X: int = 0
+O: int = 1
+
+
+class BoardObserver(Protocol):
+    """
+    Anything kept in step with a board's pieces.
+    """
+
+    def dropped(self, bit: int, player: int) -> None:
+        ...
+
+    def undone(self, bit: int, player: int) -> None:
+        ...
+
+
+class Board:
+    """
+    Gravity-aware bitboard of a Connect-style game.
+
+    Cell ``(column, row)`` is bit ``column * (height + 1) + row``, so every
+    column has a spare bit on top. The spare bits keep the shifts that look
+    for lines from wrapping into the next column, and let the next free
+    cell of every column be found with one addition. Each player has a
+    bitboard of their pieces, and the Zobrist hash is updated with every
+    drop and undo. Observers are told of every drop and undo once the
+    board has changed.
+    """
+
+    def __init__(self, width: int = 3, height: int = 3, connect: int = 3, seed: int = 0) -> None:
+
+        self.width: int = width
+        self.height: int = height
+        self.connect: int = connect
+        self.stride: int = height + 1
+
+        self.pieces: list[int] = [0, 0]
+        self.heights: list[int] = [column * self.stride for column in range(width)]
+        self.moves: list[int] = []
+        self.hash: int = 0
+        self.observers: list[BoardObserver] = []
+
+        # The bottom cell of every column, and every cell of the board.
+        self.bottom: int = sum(1 << (column * self.stride) for column in range(width))
+        self.cells: int = self.bottom * ((1 << height) - 1)
+
+        # A random 64-bit key for every player and cell.
+        rng: random.Random = random.Random(seed)
+        self._zobrist: list[list[int]] = [
+            [rng.getrandbits(64) for _ in range(width * self.stride)] for _ in range(2)
+        ]
+
+        # The shifts that move a cell to its neighbour along each line:
+        # vertical, horizontal and both diagonals.
+        self.directions: tuple[int, ...] = (1, self.stride, self.stride - 1, self.stride + 1)
+
+    @property
+    def to_move(self) -> int:
+        """
+        The player whose turn it is.
+        """
+
+        return len(self.moves) & 1
+
+    @property
+    def occupied(self) -> int:
+        """
+        The bitboard of every piece.
+        """
+
+        return self.pieces[X] | self.pieces[O]
+
+    @property
+    def playable(self) -> int:
+        """
+        The bitboard of the next free cell of every column that isn't full.
+        """
+
+        return (self.occupied + self.bottom) & self.cells
+
+    def can_drop(self, column: int) -> bool:
+        """
+        Checks whether a column has room for another piece.
+
+        Parameters
+        ----------
+        column : int
+            The column to check.
+
+        Returns
+        -------
+        bool
+            Whether the column isn't full.
+        """
+
+        return self.heights[column] < column * self.stride + self.height
+
+    def legal_moves(self) -> list[int]:
+        """
+        Gets the columns a piece can be dropped in.
+
+        Returns
+        -------
+        list[int]
+            The columns that aren't full, from left to right.
+        """
+
+        return [column for column in range(self.width) if self.can_drop(column)]
+
+    def drop(self, column: int) -> None:
+        """
+        Drops a piece of the player to move into a column.
+
+        Parameters
+        ----------
+        column : int
+            The column to drop into, which must not be full.
+        """
+
+        bit: int = self.heights[column]
+        player: int = self.to_move
+
+        self.pieces[player] |= 1 << bit
+        self.hash ^= self._zobrist[player][bit]
+        self.heights[column] += 1
+        self.moves.append(column)
+
+        for observer in self.observers:
+            observer.dropped(bit, player)
+
+    def undo(self) -> None:
+        """
+        Takes back the last piece dropped.
+        """
+
+        column: int = self.moves.pop()
+        self.heights[column] -= 1
+
+        bit: int = self.heights[column]
+        player: int = self.to_move
+
+        self.pieces[player] ^= 1 << bit
+        self.hash ^= self._zobrist[player][bit]
+
+        for observer in self.observers:
+            observer.undone(bit, player)
+
+    def has_won(self, player: int) -> bool:
+        """
+        Checks whether a player has ``connect`` pieces in a line.
+
+        Parameters
+        ----------
+        player : int
+            The player to check.
+
+        Returns
+        -------
+        bool
+            Whether the player has a line.
+        """
+
+        pieces: int = self.pieces[player]
+
+        for direction in self.directions:
+
+            # Keeps the pieces that start a line of growing length.
+            line: int = pieces
+            for _ in range(self.connect - 1):
+                line &= line >> direction
+
+            if line:
+                return True
+
+        return False
+
+    def is_full(self) -> bool:
+        """
+        Checks whether every cell is taken.
+
+        Returns
+        -------
+        bool
+            Whether no piece can be dropped.
+        """
+
+        return len(self.moves) == self.width * self.height
+
+    def __str__(self) -> str:
+
+        separator: str = "+---" * self.width + "+"
+        rows: list[str] = [separator]
+
+        for row in reversed(range(self.height)):
+
+            cells: list[str] = []
+
+            for column in range(self.width):
+                bit: int = 1 << (column * self.stride + row)
+                cells.append("X" if self.pieces[X] & bit else "O" if self.pieces[O] & bit else ".")
+
+            rows.append("| " + " | ".join(cells) + " |")
+            rows.append(separator)
+
+        return "\n".join(rows)
@@ -0,0 +1,312 @@
+import time
+
+from math import inf
+from types import TracebackType
+from typing import NamedTuple
+
+from board import Board
+from evaluation import Evaluator, WEIGHTS
+from incremental_evaluator import IncrementalEvaluator
+
+
+# Transposition table bounds: the stored value is exact, at least or at most
+# the position's true value.
+EXACT: int = 0
+LOWER: int = 1
+UPPER: int = 2
+
+# How many nodes are searched between two checks of the clock.
+CLOCK_INTERVAL: int = 1024
+
+
+class SearchResult(NamedTuple):
+    """
+    The outcome of a search, and its statistics.
+    """
+
+    move: int
+    value: float
+    depth: int
+    nodes: int
+    elapsed: float
+    cutoffs: int
+    first_move_cutoffs: int
+    tt_hits: int
+
+    @property
+    def nodes_per_second(self) -> float:
+        """
+        The nodes searched per second.
+        """
+
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def cutoff_rate(self) -> float:
+        """
+        The share of nodes whose search was cut off by a beta cutoff.
+        """
+
+        return self.cutoffs / self.nodes if self.nodes else 0.0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """
+        The share of cutoffs caused by the first move tried, which measures
+        the move ordering.
+        """
+
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+
+class _Timeout(Exception):
+    """
+    Raised inside the search when the time budget runs out.
+    """
+
+
+class Engine:
+    """
+    Negamax alpha-beta search with iterative deepening, a Zobrist-hashed
+    transposition table and centre-first move ordering.
+
+    Values are from the point of view of the player to move. A won or lost
+    position is worth ``±win`` less the number of pieces on the board, so
+    faster wins and slower losses are preferred and the value doesn't
+    depend on where the search started, which keeps the table valid from
+    one move to the next. Every other leaf is scored with
+    ``IncrementalEvaluator``, or ``Evaluator`` if not incremental.
+
+    An incremental engine watches its board until it's closed, so engines
+    that are done with a board should be closed, or used as a context
+    manager.
+    """
+
+    def __init__(self, board: Board, table_size: int = 1 << 20, incremental: bool = True) -> None:
+
+        # The incremental evaluator follows the board's drops and undos, so
+        # leaves don't scan every line.
+        self._board: Board = board
+        self._evaluator: Evaluator | IncrementalEvaluator = IncrementalEvaluator(board) if incremental else Evaluator(board)
+
+        # Each entry is (hash, depth, value, bound, best move), or None.
+        self._table: list[tuple[int, int, float, int, int] | None] = [None] * table_size
+
+        # Columns from the centre outwards, as θ1 rewards the centre.
+        centre: float = (board.width - 1) / 2
+        self._order: list[int] = sorted(range(board.width), key=lambda column: abs(column - centre))
+
+        # A win outweighs any sum of the other features.
+        self.win: int = WEIGHTS[4] * (board.width * board.height + 1)
+
+        self._deadline: float = inf
+        self._nodes: int = 0
+        self._cutoffs: int = 0
+        self._first_move_cutoffs: int = 0
+        self._tt_hits: int = 0
+
+    def _ordered_moves(self, tt_move: int) -> list[int]:
+        """
+        Gets the legal moves, the table's best move first and then from the
+        centre outwards.
+
+        Parameters
+        ----------
+        tt_move : int
+            The best move stored for the position, or -1.
+
+        Returns
+        -------
+        list[int]
+            The columns to try, in order.
+        """
+
+        board: Board = self._board
+        moves: list[int] = [column for column in self._order if board.can_drop(column)]
+
+        if tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+        return moves
+
+    def _negamax(self, depth: int, alpha: float, beta: float) -> float:
+        """
+        Searches a position to a fixed depth.
+
+        Parameters
+        ----------
+        depth : int
+            The remaining depth.
+        alpha : float
+            The value the player to move is already sure of.
+        beta : float
+            The value the opponent is already sure of.
+
+        Returns
+        -------
+        float
+            The value of the position for the player to move.
+
+        Raises
+        ------
+        _Timeout
+            If the time budget runs out.
+        """
+
+        board: Board = self._board
+
+        self._nodes += 1
+        if self._nodes % CLOCK_INTERVAL == 0 and time.perf_counter() > self._deadline:
+            raise _Timeout
+
+        # The previous move is the only one that could have won.
+        if board.has_won(1 - board.to_move):
+            return -(self.win - len(board.moves))
+
+        if board.is_full():
+            return 0
+
+        if depth == 0:
+            return self._evaluator.evaluate(board, board.to_move)
+
+        original_alpha: float = alpha
+        index: int = board.hash % len(self._table)
+        entry: tuple[int, int, float, int, int] | None = self._table[index]
+        tt_move: int = -1
+
+        if entry is not None and entry[0] == board.hash:
+
+            tt_move = entry[4]
+
+            if entry[1] >= depth:
+
+                self._tt_hits += 1
+                value: float = entry[2]
+
+                if entry[3] == EXACT:
+                    return value
+                if entry[3] == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+
+                if alpha >= beta:
+                    return value
+
+        best_value: float = -inf
+        best_move: int = -1
+
+        for i, column in enumerate(self._ordered_moves(tt_move)):
+
+            board.drop(column)
+            value = -self._negamax(depth - 1, -beta, -alpha)
+            board.undo()
+
+            if value > best_value:
+                best_value, best_move = value, column
+
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                self._cutoffs += 1
+                self._first_move_cutoffs += i == 0
+                break
+
+        bound: int = UPPER if best_value <= original_alpha else LOWER if best_value >= beta else EXACT
+        self._table[index] = (board.hash, depth, best_value, bound, best_move)
+
+        return best_value
+
+    def search(self, budget: float | None = None, max_depth: int | None = None) -> SearchResult:
+        """
+        Searches the board deeper and deeper until the time budget runs out
+        or the game is solved.
+
+        Parameters
+        ----------
+        budget : float | None, optional
+            The wall-clock budget, in seconds. None to search without one.
+        max_depth : int | None, optional
+            The deepest search. None to search until every empty cell is
+            filled.
+
+        Returns
+        -------
+        SearchResult
+            The best move of the deepest search that finished, with the
+            statistics of the whole search.
+
+        Raises
+        ------
+        ValueError
+            If the game is already over.
+        """
+
+        board: Board = self._board
+        if board.has_won(0) or board.has_won(1) or board.is_full():
+            raise ValueError("The game is already over.")
+
+        start: float = time.perf_counter()
+        self._deadline = start + budget if budget is not None else inf
+        self._nodes = self._cutoffs = self._first_move_cutoffs = self._tt_hits = 0
+
+        empty: int = board.width * board.height - len(board.moves)
+        last_depth: int = min(empty, max_depth) if max_depth is not None else empty
+        move_count: int = len(board.moves)
+
+        # Falls back on the first ordered move if not even depth 1 finishes.
+        best_move: int = self._ordered_moves(-1)[0]
+        best_value: float = 0.0
+        completed: int = 0
+
+        for depth in range(1, last_depth + 1):
+
+            try:
+                value: float = self._negamax(depth, -inf, inf)
+            except _Timeout:
+
+                # Takes back the moves of the interrupted search.
+                while len(board.moves) > move_count:
+                    board.undo()
+
+                break
+
+            entry: tuple[int, int, float, int, int] | None = self._table[board.hash % len(self._table)]
+            best_move, best_value, completed = entry[4], value, depth
+
+            # A forced win or loss won't change with more depth.
+            if abs(value) >= self.win - board.width * board.height:
+                break
+
+        return SearchResult(
+            move=best_move,
+            value=best_value,
+            depth=completed,
+            nodes=self._nodes,
+            elapsed=time.perf_counter() - start,
+            cutoffs=self._cutoffs,
+            first_move_cutoffs=self._first_move_cutoffs,
+            tt_hits=self._tt_hits,
+        )
+
+    def close(self) -> None:
+        """
+        Stops following the board, so its drops and undos no longer update
+        this engine's evaluator.
+        """
+
+        if isinstance(self._evaluator, IncrementalEvaluator) and self._evaluator in self._board.observers:
+            self._evaluator.detach()
+
+    def __enter__(self) -> "Engine":
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None
+    ) -> None:
+
+        self.close()
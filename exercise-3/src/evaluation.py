@@ -0,0 +1,173 @@
+from board import Board
+
+
+# The weights of θ1 to θ5 in f(s) = 3θ1 + 4θ2 - 4θ3 + 2θ4 + 100θ5.
+WEIGHTS: tuple[int, ...] = (3, 4, -4, 2, 100)
+
+
+def centre_cells(board: Board) -> list[int]:
+    """
+    Gets the cells of the middle column, or both middle columns of a board
+    of even width.
+
+    Parameters
+    ----------
+    board : Board
+        The board.
+
+    Returns
+    -------
+    list[int]
+        The bits of the cells.
+    """
+
+    columns: set[int] = {(board.width - 1) // 2, board.width // 2}
+    return [column * board.stride + row for column in sorted(columns) for row in range(board.height)]
+
+
+def lines(board: Board) -> list[tuple[int, ...]]:
+    """
+    Gets every line of ``connect`` cells a player can win with.
+
+    Parameters
+    ----------
+    board : Board
+        The board.
+
+    Returns
+    -------
+    list[tuple[int, ...]]
+        The bits of every line's cells, from the first cell along its
+        direction, so vertical lines are the ones whose cells are 1 apart.
+    """
+
+    found: list[tuple[int, ...]] = []
+
+    for column in range(board.width):
+        for row in range(board.height):
+            for direction, (dx, dy) in zip(board.directions, ((0, 1), (1, 0), (1, -1), (1, 1))):
+
+                end_column: int = column + dx * (board.connect - 1)
+                end_row: int = row + dy * (board.connect - 1)
+
+                if 0 <= end_column < board.width and 0 <= end_row < board.height:
+                    found.append(tuple(column * board.stride + row + direction * i for i in range(board.connect)))
+
+    return found
+
+
+class Evaluator:
+    """
+    The static evaluation from the README, for boards of one size.
+
+    Every line of ``connect`` cells is precomputed as a bitmask, so the
+    features are counted with a few bitwise operations per line. Every
+    leaf scans every line; ``IncrementalEvaluator`` keeps the counts up to
+    date instead.
+
+    All features are from the point of view of the player evaluated for.
+    θ1 is their pieces in the centre minus the opponent's, θ2 and θ3 count
+    each side's lines holding all but one piece with the last cell
+    playable right now, θ4 is their vertical lines of that kind minus the
+    opponent's, and θ5 is 1 for a win, -1 for a loss and 0 otherwise. Every
+    feature except θ2 and θ3 swaps sign with the player, and those two swap
+    with each other, so ``f`` does too, as negamax needs.
+    """
+
+    def __init__(self, board: Board) -> None:
+
+        # The middle columns' cells, and every line, as bitmasks.
+        self._centre: int = sum(1 << cell for cell in centre_cells(board))
+        self._lines: list[int] = []
+        self._vertical_lines: list[int] = []
+
+        for line in lines(board):
+
+            mask: int = sum(1 << cell for cell in line)
+            self._lines.append(mask)
+
+            if line[1] - line[0] == 1:
+                self._vertical_lines.append(mask)
+
+    def _threats(self, lines: list[int], pieces: int, opponent: int, playable: int) -> int:
+        """
+        Counts the lines a player is one playable piece away from.
+
+        Parameters
+        ----------
+        lines : list[int]
+            The lines to check.
+        pieces : int
+            The player's bitboard.
+        opponent : int
+            The opponent's bitboard.
+        playable : int
+            The bitboard of the cells a piece can be dropped into now.
+
+        Returns
+        -------
+        int
+            The number of threatening lines.
+        """
+
+        count: int = 0
+
+        for line in lines:
+
+            # The missing cell must be the only one left and playable.
+            missing: int = line & ~pieces
+            if not missing & opponent and missing & playable and missing & (missing - 1) == 0:
+                count += 1
+
+        return count
+
+    def features(self, board: Board, player: int) -> tuple[int, int, int, int, int]:
+        """
+        Computes θ1 to θ5.
+
+        Parameters
+        ----------
+        board : Board
+            The board to evaluate.
+        player : int
+            The player to evaluate for.
+
+        Returns
+        -------
+        tuple[int, int, int, int, int]
+            The five features.
+        """
+
+        pieces: int = board.pieces[player]
+        opponent: int = board.pieces[1 - player]
+        playable: int = board.playable
+
+        centre: int = (pieces & self._centre).bit_count() - (opponent & self._centre).bit_count()
+        threats: int = self._threats(self._lines, pieces, opponent, playable)
+        opponent_threats: int = self._threats(self._lines, opponent, pieces, playable)
+        pressure: int = (
+            self._threats(self._vertical_lines, pieces, opponent, playable)
+            - self._threats(self._vertical_lines, opponent, pieces, playable)
+        )
+        terminal: int = 1 if board.has_won(player) else -1 if board.has_won(1 - player) else 0
+
+        return centre, threats, opponent_threats, pressure, terminal
+
+    def evaluate(self, board: Board, player: int) -> int:
+        """
+        Computes f(s).
+
+        Parameters
+        ----------
+        board : Board
+            The board to evaluate.
+        player : int
+            The player to evaluate for.
+
+        Returns
+        -------
+        int
+            The weighted sum of the features.
+        """
+
+        return sum(weight * feature for weight, feature in zip(WEIGHTS, self.features(board, player)))
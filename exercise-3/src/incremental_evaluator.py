@@ -0,0 +1,234 @@
+from board import Board
+from evaluation import WEIGHTS, centre_cells, lines
+
+
+class IncrementalEvaluator:
+    """
+    The static evaluation of ``Evaluator``, kept up to date as pieces are
+    dropped and taken back rather than recomputed at every leaf.
+
+    Every line keeps how many pieces each player has in it and the XOR of
+    its filled cells, which gives its one empty cell once it's one piece
+    short. A drop can only change the lines through its cell, by filling
+    it, and the lines through the cell above, which becomes playable, so
+    only those are checked. Each update and evaluation therefore costs the
+    same whatever the board's size.
+
+    The evaluator watches the board it's built for, so it follows drops
+    and undos made anywhere until it's detached.
+    """
+
+    def __init__(self, board: Board) -> None:
+
+        self._board: Board = board
+        self._lines: list[tuple[int, ...]] = lines(board)
+        self._connect: int = board.connect
+
+        # The lines through every cell, including the spare bits, which
+        # aren't in any.
+        self._cell_lines: list[list[int]] = [[] for _ in range(board.width * board.stride)]
+        for line, cells in enumerate(self._lines):
+            for cell in cells:
+                self._cell_lines[cell].append(line)
+
+        self._centre: list[bool] = [False] * (board.width * board.stride)
+        for cell in centre_cells(board):
+            self._centre[cell] = True
+
+        self._vertical: list[bool] = [cells[1] - cells[0] == 1 for cells in self._lines]
+        self._all_cells: list[int] = [0] * len(self._lines)
+        for line, cells in enumerate(self._lines):
+            for cell in cells:
+                self._all_cells[line] ^= cell
+
+        # Every line's pieces of each player, the XOR of its filled cells,
+        # and the player it's a threat for, or -1.
+        self._counts: list[list[int]] = [[0] * len(self._lines), [0] * len(self._lines)]
+        self._filled: list[int] = [0] * len(self._lines)
+        self._threat: list[int] = [-1] * len(self._lines)
+
+        # The running totals of each player's features.
+        self._centre_pieces: list[int] = [0, 0]
+        self._threats: list[int] = [0, 0]
+        self._vertical_threats: list[int] = [0, 0]
+        self._wins: list[int] = [0, 0]
+
+        # Catches up with any pieces already on the board.
+        for player in range(2):
+            for cell in range(board.width * board.stride):
+                if board.pieces[player] >> cell & 1:
+                    self._fill(cell, player, 1)
+
+        for line in range(len(self._lines)):
+            self._check(line)
+
+        board.observers.append(self)
+
+    def detach(self) -> None:
+        """
+        Stops following the board.
+        """
+
+        self._board.observers.remove(self)
+
+    def _fill(self, cell: int, player: int, change: int) -> None:
+        """
+        Adds a piece to the counters, or takes it away.
+
+        Parameters
+        ----------
+        cell : int
+            The bit of the piece's cell.
+        player : int
+            The player the piece belongs to.
+        change : int
+            1 to add the piece, -1 to take it away.
+        """
+
+        if self._centre[cell]:
+            self._centre_pieces[player] += change
+
+        counts: list[int] = self._counts[player]
+
+        for line in self._cell_lines[cell]:
+
+            # A line is won while it's full, so it's counted on the way in and out.
+            if change < 0 and counts[line] == self._connect:
+                self._wins[player] -= 1
+
+            counts[line] += change
+            self._filled[line] ^= cell
+
+            if change > 0 and counts[line] == self._connect:
+                self._wins[player] += 1
+
+    def _check(self, line: int) -> None:
+        """
+        Works out who a line is a threat for, and updates the totals.
+
+        Parameters
+        ----------
+        line : int
+            The line to check.
+        """
+
+        board: Board = self._board
+        threat: int = -1
+
+        for player in range(2):
+
+            if self._counts[player][line] == self._connect - 1 and self._counts[1 - player][line] == 0:
+
+                # The only empty cell must be the next one of its column.
+                missing: int = self._all_cells[line] ^ self._filled[line]
+                if board.heights[missing // board.stride] == missing:
+                    threat = player
+
+        previous: int = self._threat[line]
+        if threat == previous:
+            return
+
+        if previous >= 0:
+            self._threats[previous] -= 1
+            self._vertical_threats[previous] -= self._vertical[line]
+
+        if threat >= 0:
+            self._threats[threat] += 1
+            self._vertical_threats[threat] += self._vertical[line]
+
+        self._threat[line] = threat
+
+    def _update(self, bit: int, player: int, change: int) -> None:
+        """
+        Follows a drop or undo.
+
+        Parameters
+        ----------
+        bit : int
+            The bit of the cell.
+        player : int
+            The player whose piece it is.
+        change : int
+            1 for a drop, -1 for an undo.
+        """
+
+        self._fill(bit, player, change)
+
+        # The cell above is a spare bit, in no line, if the column is full.
+        for cell in (bit, bit + 1):
+            for line in self._cell_lines[cell]:
+                self._check(line)
+
+    def dropped(self, bit: int, player: int) -> None:
+        """
+        Follows a piece dropped into a cell.
+
+        Parameters
+        ----------
+        bit : int
+            The bit of the cell.
+        player : int
+            The player who dropped it.
+        """
+
+        self._update(bit, player, 1)
+
+    def undone(self, bit: int, player: int) -> None:
+        """
+        Follows a piece taken back from a cell.
+
+        Parameters
+        ----------
+        bit : int
+            The bit of the cell.
+        player : int
+            The player whose piece it was.
+        """
+
+        self._update(bit, player, -1)
+
+    def features(self, board: Board, player: int) -> tuple[int, int, int, int, int]:
+        """
+        Computes θ1 to θ5 from the running totals.
+
+        Parameters
+        ----------
+        board : Board
+            The board the evaluator follows.
+        player : int
+            The player to evaluate for.
+
+        Returns
+        -------
+        tuple[int, int, int, int, int]
+            The five features, as ``Evaluator.features`` computes them.
+        """
+
+        opponent: int = 1 - player
+
+        return (
+            self._centre_pieces[player] - self._centre_pieces[opponent],
+            self._threats[player],
+            self._threats[opponent],
+            self._vertical_threats[player] - self._vertical_threats[opponent],
+            1 if self._wins[player] else -1 if self._wins[opponent] else 0,
+        )
+
+    def evaluate(self, board: Board, player: int) -> int:
+        """
+        Computes f(s) from the running totals.
+
+        Parameters
+        ----------
+        board : Board
+            The board the evaluator follows.
+        player : int
+            The player to evaluate for.
+
+        Returns
+        -------
+        int
+            The weighted sum of the features.
+        """
+
+        return sum(weight * feature for weight, feature in zip(WEIGHTS, self.features(board, player)))
@@ -0,0 +1,43 @@
+import sys
+
+from board import Board, X
+from engine import Engine, SearchResult
+
+
+def main() -> None:
+    """
+    Entry point for a game of the engine against itself.
+
+    Usage: ``python src/main.py [budget] [width] [height] [connect]``, with
+    the budget of every move in seconds.
+    """
+
+    if len(sys.argv) > 5:
+        print("Usage: python src/main.py [budget] [width] [height] [connect]")
+        sys.exit(2)
+
+    budget: float = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    width, height, connect = (int(argument) for argument in (sys.argv[2:] + ["3", "3", "3"][len(sys.argv[2:]):]))
+
+    board: Board = Board(width, height, connect)
+    with Engine(board) as engine:
+
+        while not (board.has_won(0) or board.has_won(1) or board.is_full()):
+
+            player: str = "X" if board.to_move == X else "O"
+            result: SearchResult = engine.search(budget)
+            board.drop(result.move)
+
+            print(f"{player} plays column {result.move} (value {result.value:+g}, depth {result.depth})")
+            print(
+                f"  {result.nodes:,} nodes in {result.elapsed * 1000:.1f} ms ({result.nodes_per_second:,.0f} nodes/s) | "
+                f"cutoffs {result.cutoff_rate:.1%} of nodes, {result.first_move_cutoff_rate:.1%} on the first move | "
+                f"TT hits {result.tt_hits:,}"
+            )
+            print(board)
+
+    print("X wins." if board.has_won(0) else "O wins." if board.has_won(1) else "Draw.")
+
+
+if __name__ == "__main__":
+    main()